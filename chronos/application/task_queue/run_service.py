@@ -1,6 +1,10 @@
-from typing import Any, Dict, Protocol
+from typing import Any, Dict, List, Optional, Protocol
 
 
 class EnqueueRunService(Protocol):
     async def __call__(self, *, payload: Dict[str, Any]) -> None:
         raise NotImplementedError
+
+    async def enqueue_many(self, *, payloads: List[Dict[str, Any]]) -> List[Optional[str]]:
+        """Publish a batch, returning an error message (or None) per payload."""
+        raise NotImplementedError
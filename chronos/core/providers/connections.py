@@ -1,6 +1,7 @@
 from typing import AsyncIterator, Optional
 
 from boto3 import session as boto3_session
+from botocore.config import Config
 from dishka import Provider, Scope, provide
 from loguru import logger
 from mypy_boto3_s3 import S3Client
@@ -26,6 +27,7 @@ class ConnectionsProvider(Provider):
     async def nats_client(self, settings: Settings) -> AsyncIterator[NatsClient]:
         assert settings.nats_url, "NATS URL is not configured"
         nats_client = NatsClient(settings.nats_url)
+        await nats_client.connect()
         yield nats_client
 
         logger.info("Closing NATS client connection")
@@ -41,6 +43,7 @@ class ConnectionsProvider(Provider):
                 aws_secret_access_key=settings.s3_secret_key,
                 region_name=settings.s3_region_name,
                 endpoint_url=settings.s3_endpoint_url,
+                config=Config(max_pool_connections=settings.s3_max_pool_connections),
             )
 
             return client
@@ -55,4 +58,8 @@ class ConnectionsProvider(Provider):
     @provide(scope=Scope.APP)
     async def courier_client(self, settings: Settings) -> CourierClient:
         assert settings.courier_host, "Courier host is not configured"
-        return CourierClient(host=settings.courier_host, api_key=settings.courier_api_key)
+        return CourierClient(
+            host=settings.courier_host,
+            api_key=settings.courier_api_key,
+            page_size=settings.courier_page_size,
+        )
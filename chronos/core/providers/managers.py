@@ -1,18 +1,73 @@
-from typing import Optional
+from typing import AsyncIterator, Iterator, Optional
 
 from dishka import Provider, Scope, provide
+from loguru import logger
 from mypy_boto3_s3 import S3Client
+from redis.asyncio import ConnectionPool
 
 from chronos.core.settings import Settings
+from chronos.infrastructure.browser_pool import BrowserPool
+from chronos.infrastructure.creator_queue import RedisCreatorQueue
+from chronos.infrastructure.jobs import JobTracker
+from chronos.infrastructure.recrawl_scheduler import RecrawlScheduler
+from chronos.infrastructure.retry_queue import CreatorRetryQueue
 from chronos.infrastructure.storage.aws_s3 import S3StorageManager
 from chronos.infrastructure.storage.base import StorageManager
 from chronos.infrastructure.storage.local import LocalStorageManager
+from chronos.infrastructure.storage.manifest import ManifestIndex
+from chronos.infrastructure.storage.tiered import TieredStorageManager
+from chronos.schemas.enums.providers import StorageProvider
 
 
 class ManagersProvider(Provider):
     @provide(scope=Scope.APP)
-    def s3_storage_manager(self, settings: Settings, s3_client: Optional[S3Client] = None) -> StorageManager:
-        if s3_client:
-            return S3StorageManager(settings=settings, s3_client=s3_client)
+    def browser_pool(self, settings: Settings) -> BrowserPool:
+        return BrowserPool(size=settings.browser_pool_size)
 
-        return LocalStorageManager(settings=settings)
+    @provide(scope=Scope.APP)
+    def creator_queue(self, settings: Settings, redis_pool: ConnectionPool) -> RedisCreatorQueue:
+        return RedisCreatorQueue(settings=settings, redis_pool=redis_pool)
+
+    @provide(scope=Scope.APP)
+    def job_tracker(self, settings: Settings, redis_pool: ConnectionPool) -> JobTracker:
+        return JobTracker(settings=settings, redis_pool=redis_pool)
+
+    @provide(scope=Scope.APP)
+    def recrawl_scheduler(self, settings: Settings, redis_pool: ConnectionPool) -> RecrawlScheduler:
+        return RecrawlScheduler(settings=settings, redis_pool=redis_pool)
+
+    @provide(scope=Scope.APP)
+    def retry_queue(self, settings: Settings, redis_pool: ConnectionPool) -> CreatorRetryQueue:
+        return CreatorRetryQueue(settings=settings, redis_pool=redis_pool)
+
+    @provide(scope=Scope.APP)
+    def manifest_index(self, settings: Settings) -> Iterator[Optional[ManifestIndex]]:
+        if not settings.manifest_enabled:
+            yield None
+            return
+
+        manifest = ManifestIndex(settings=settings)
+        yield manifest
+
+        logger.info("Closing manifest index")
+        manifest.close()
+
+    @provide(scope=Scope.APP)
+    async def s3_storage_manager(
+        self,
+        settings: Settings,
+        s3_client: Optional[S3Client] = None,
+        manifest: Optional[ManifestIndex] = None,
+    ) -> AsyncIterator[StorageManager]:
+        storage_manager: StorageManager
+        if s3_client and settings.storage_provider == StorageProvider.TIERED:
+            storage_manager = TieredStorageManager(settings=settings, s3_client=s3_client, manifest=manifest)
+        elif s3_client:
+            storage_manager = S3StorageManager(settings=settings, s3_client=s3_client, manifest=manifest)
+        else:
+            storage_manager = LocalStorageManager(settings=settings, manifest=manifest)
+
+        yield storage_manager
+
+        logger.info("Closing storage manager")
+        await storage_manager.aclose()
@@ -1,4 +1,4 @@
-from typing import Dict
+from typing import Dict, Optional
 
 from dishka import Provider, Scope, provide
 from langchain_core.language_models import BaseLanguageModel
@@ -6,11 +6,15 @@ from redis.asyncio import ConnectionPool
 
 from chronos.application.task_queue.run_service import EnqueueRunService
 from chronos.core.settings import Settings
+from chronos.infrastructure.browser_pool import BrowserPool
 from chronos.infrastructure.clients.captcha import CaptchaClient
 from chronos.infrastructure.clients.courier import CourierClient
 from chronos.infrastructure.storage.base import StorageManager
+from chronos.infrastructure.storage.manifest import ManifestIndex
 from chronos.schemas.enums.providers import LLMProvider
 from chronos.services.browser_use import BrowserUseService
+from chronos.services.exports import ExportService
+from chronos.services.retention import RetentionService
 
 
 class ServicesProvider(Provider):
@@ -23,6 +27,7 @@ class ServicesProvider(Provider):
         courier_client: CourierClient,
         captcha_client: CaptchaClient,
         storage_manager: StorageManager,
+        browser_pool: BrowserPool,
         llm_providers: Dict[LLMProvider, BaseLanguageModel],
     ) -> BrowserUseService:
         return BrowserUseService(
@@ -32,5 +37,19 @@ class ServicesProvider(Provider):
             courier_client=courier_client,
             captcha_client=captcha_client,
             storage_manager=storage_manager,
+            browser_pool=browser_pool,
             llm_providers=llm_providers,
         )
+
+    @provide(scope=Scope.APP)
+    def export_service(self, settings: Settings, storage_manager: StorageManager) -> ExportService:
+        return ExportService(settings=settings, storage_manager=storage_manager)
+
+    @provide(scope=Scope.APP)
+    def retention_service(
+        self,
+        settings: Settings,
+        storage_manager: StorageManager,
+        manifest: Optional[ManifestIndex] = None,
+    ) -> RetentionService:
+        return RetentionService(settings=settings, storage_manager=storage_manager, manifest=manifest)
@@ -1,6 +1,11 @@
 from dishka import Provider, Scope, provide
+from redis.asyncio import ConnectionPool
 
 from chronos.application.task_queue.run_service import EnqueueRunService
+from chronos.core.settings import Settings
+from chronos.infrastructure.nats_client import NatsClient
+from chronos.infrastructure.task_queue.handlers import HandlerRegistry
+from chronos.infrastructure.task_queue.monitor import QueueMonitor
 from chronos.infrastructure.task_queue.run_service import EnqueueRunServiceWithNats
 
 
@@ -8,3 +13,11 @@ class TaskQueueAdaptersProvider(Provider):
     scope = Scope.APP
 
     run_service = provide(EnqueueRunServiceWithNats, provides=EnqueueRunService)
+
+    @provide
+    def handler_registry(self, settings: Settings) -> HandlerRegistry:
+        return HandlerRegistry(allowlist=settings.worker_allowed_handlers)
+
+    @provide
+    def queue_monitor(self, settings: Settings, nats_client: NatsClient, redis_pool: ConnectionPool) -> QueueMonitor:
+        return QueueMonitor(settings=settings, nats_client=nats_client, redis_pool=redis_pool)
@@ -1,5 +1,5 @@
 from functools import lru_cache
-from typing import Optional, Tuple, Type
+from typing import Dict, List, Optional, Tuple, Type
 
 from pydantic_settings import (
     BaseSettings,
@@ -10,6 +10,10 @@ from pydantic_settings import (
 )
 
 from chronos.schemas.enums.providers import LLMProvider, StorageProvider
+from chronos.schemas.enums.storage import SnapshotLayout
+from chronos.schemas.enums.tasks import CreatorSource, RetryReason, TaskPriority
+from chronos.schemas.rate_limits import RateBudget
+from chronos.schemas.retention import RetentionPolicy
 
 
 class Settings(BaseSettings):
@@ -25,22 +29,156 @@ class Settings(BaseSettings):
     s3_bucket: Optional[str] = None
     s3_region_name: Optional[str] = None
     s3_endpoint_url: Optional[str] = None
+    s3_multipart_threshold: int = 16 * 1024 * 1024
+    s3_multipart_chunksize: int = 8 * 1024 * 1024
+    s3_max_concurrency: int = 10
+    s3_max_pool_connections: int = 50
+    s3_object_acl: str = "public-read"  # ACL of every uploaded object, "private" keeps crawled data out of reach
+    s3_public_prefixes: List[str] = []  # Keys under these stay public-read even with a private s3_object_acl
+    storage_max_workers: int = 8
+    storage_max_pending: int = 64
+    storage_spool_max_size: int = 8 * 1024 * 1024
+    storage_compression_prefixes: List[str] = []
+    storage_compression_level: int = 3
+    storage_cache_max_bytes: int = 1024 * 1024 * 1024
+    storage_upload_batch_size: int = 64
+    storage_upload_interval: float = 1.0
+    storage_upload_max_attempts: int = 10
+    storage_flush_timeout: float = 30.0
 
     local_storage_dir: str = "storage"
     local_trace_dir: str = "traces"
     cookies_filename: str = "cookie.json"
     trace_path: Optional[str] = f"{local_storage_dir}/{local_trace_dir}"
     cookies_file: Optional[str] = f"{local_storage_dir}/{cookies_filename}"
+    storage_cache_dir: str = f"{local_storage_dir}/.cache"
+
+    # Snapshot settings
+    creator_storage_remote: bool = False  # creator snapshots are saved locally unless sent through storage_provider
+    snapshot_layout: SnapshotLayout = SnapshotLayout.FILES
+    segment_max_bytes: int = 64 * 1024 * 1024
+    segment_max_age: int = 60 * 60
+    segment_upload_retry_interval: int = 60
+    snapshot_base_interval: int = 10
+    raw_blob_dedup: bool = False
+    raw_blob_digest_cache_size: int = 100_000
+    raw_blob_gc_enabled: bool = False  # sweep unreferenced blobs on full retention runs
+    raw_blob_gc_grace: int = 24 * 60 * 60  # blobs younger than this are kept, a ref may still be on its way
+    manifest_enabled: bool = False
+    manifest_prefix: str = "chronos:manifest"  # shared by every node through redis_url
+
+    # Export settings
+    parquet_export_enabled: bool = False
+    parquet_row_group_size: int = 10_000
+    parquet_max_rows_per_file: int = 500_000
+    parquet_max_file_age: int = 60 * 60
+
+    # Retention settings
+    retention_policies: List[RetentionPolicy] = [
+        RetentionPolicy(prefix="traces/", max_age_days=7, max_bytes=5 * 1024 * 1024 * 1024, local=True),
+        RetentionPolicy(prefix="tiktok/affiliate/timeout/", pattern="*.png", max_age_days=7, local=True),
+    ]
+    retention_delete_batch_size: int = 1000
 
     # Redis settings
     redis_url: str = "redis://redis:6379/0"
 
+    # Creator queue settings
+    creator_source: CreatorSource = CreatorSource.COURIER
+    creator_queue_stream: str = "chronos:creators"
+    creator_queue_group: str = "crawlers"
+    creator_queue_block_ms: int = 5000
+    creator_queue_visibility_timeout: int = 10 * 60
+    creator_queue_max_deliveries: int = 5
+
+    # Recrawl scheduler settings (intervals in seconds)
+    recrawl_prefix: str = "chronos:recrawl"
+    recrawl_initial_interval: int = 24 * 60 * 60
+    recrawl_min_interval: int = 6 * 60 * 60
+    recrawl_max_interval: int = 14 * 24 * 60 * 60
+    recrawl_backoff_factor: float = 1.5  # applied when a creator's data did not change
+    recrawl_speedup_factor: float = 0.5  # applied when it did
+    recrawl_lease: int = 30 * 60
+    recrawl_rate_per_minute: float = 2.0
+    recrawl_poll_interval: int = 60
+
+    # Retry queue settings (delays in seconds)
+    retry_prefix: str = "chronos:retry"
+    retry_base_delay: int = 60
+    retry_max_delay: int = 6 * 60 * 60
+    retry_lease: int = 30 * 60
+    retry_max_attempts: Dict[RetryReason, int] = {
+        RetryReason.TIMEOUT: 5,
+        RetryReason.CAPTCHA: 3,
+        RetryReason.ERROR: 2,
+    }
+
+    # Rate limit settings
+    rate_limit_enabled: bool = False
+    rate_limit_prefix: str = "chronos:ratelimit"
+    rate_limit_budgets: Dict[str, RateBudget] = {
+        "affiliate_search": RateBudget(rate_per_minute=4, burst=2),  # per account
+        "affiliate_detail": RateBudget(rate_per_minute=4, burst=2),  # per account
+        "oembed": RateBudget(rate_per_minute=120, burst=10),  # per host
+    }
+
+    # Admission control settings for the enqueue API. Off by default: crawler tasks run until cancelled and hold
+    # their worker slot, so on core NATS the load never drains and every enqueue would end up refused.
+    admission_enabled: bool = False
+    admission_max_depth: int = 1000  # JetStream backlog
+    admission_max_load: float = 1.0  # core NATS, tasks held by workers per slot
+    admission_require_workers: bool = False  # needs workers publishing heartbeats
+    admission_fail_open: bool = True  # admit tasks when the queue stats can't be read, otherwise answer 503
+    admission_retry_after: int = 30
+    admission_stats_ttl: float = 2.0
+
+    # Job tracking settings
+    job_prefix: str = "chronos:jobs"
+    job_ttl: int = 7 * 24 * 60 * 60
+    job_events_keepalive: float = 15.0
+
+    # Bulk enqueue settings
+    bulk_enqueue_batch_size: int = 500
+    bulk_enqueue_max_items: int = 10_000
+
     # NATS Settings
     nats_url: str = "nats://nats:4222"
 
+    # Worker settings
+    worker_max_concurrency: int = 4
+    worker_priority_weights: Dict[TaskPriority, int] = {
+        TaskPriority.HIGH: 6,
+        TaskPriority.NORMAL: 3,
+        TaskPriority.LOW: 1,
+    }
+    worker_heartbeat_prefix: str = "chronos:workers"
+    worker_heartbeat_interval: int = 10
+    worker_heartbeat_ttl: int = 30
+    # e.g. ["tiktok.affiliate", "default"], empty means ["default"]. The API refuses tasks for other keys,
+    # so there it lists every key the worker pool serves.
+    worker_routing_keys: List[str] = []
+    browser_pool_size: int = 2
+    # `service.func` handlers the worker may run, e.g. "browser_use.BrowserUse.run_crawler"; `*` matches any func
+    worker_allowed_handlers: List[str] = [
+        "browser_use.BrowserUse.run_crawler",
+        "exports.Export.export_parquet",
+        "retention.Retention.apply",
+    ]
+
+    # JetStream settings
+    jetstream_enabled: bool = False
+    jetstream_stream: str = "CHRONOS"
+    jetstream_durable: str = "chronos_workers"
+    jetstream_ack_wait: int = 5 * 60
+    jetstream_heartbeat_interval: int = 60
+    jetstream_max_deliver: int = 5
+    jetstream_retry_delay: int = 30
+    jetstream_dlq_subject: str = "run_service_dead"
+
     # Courier Settings
     courier_host: Optional[str] = None
     courier_api_key: Optional[str] = None
+    courier_page_size: int = 100
 
     # Captcha settings
     captcha_host: Optional[str] = None
@@ -0,0 +1,78 @@
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Deque, Set
+
+from loguru import logger
+
+
+@dataclass
+class _Waiter:
+    task_id: str
+    future: asyncio.Future
+
+
+class BrowserPool:
+    """Bounds how many browsers run at once; waiting tasks are served strictly in arrival order."""
+
+    def __init__(self, size: int) -> None:
+        self._size = size
+        self._leases: Set[str] = set()
+        self._waiters: Deque[_Waiter] = deque()
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def in_use(self) -> int:
+        return len(self._leases)
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    @asynccontextmanager
+    async def lease(self, task_id: str) -> AsyncIterator[None]:
+        await self._acquire(task_id=task_id)
+        try:
+            yield
+        finally:
+            self._release(task_id=task_id)
+
+    async def _acquire(self, task_id: str) -> None:
+        if task_id in self._leases or any(waiter.task_id == task_id for waiter in self._waiters):
+            msg = f"Task {task_id} already holds or waits for a browser lease"
+            raise RuntimeError(msg)
+
+        if len(self._leases) < self._size and not self._waiters:
+            self._leases.add(task_id)
+        else:
+            waiter = _Waiter(task_id=task_id, future=asyncio.get_running_loop().create_future())
+            self._waiters.append(waiter)
+            logger.info(f"⏳ Task `{task_id}` is waiting for a browser slot ({len(self._waiters)} queued)")
+            try:
+                await waiter.future
+            except asyncio.CancelledError:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                # The slot may have been handed over right before the cancellation landed
+                self._release(task_id=task_id)
+                raise
+
+        logger.info(f"🟢 Task `{task_id}` leased a browser slot ({len(self._leases)}/{self._size})")
+
+    def _release(self, task_id: str) -> None:
+        if task_id not in self._leases:
+            return
+
+        self._leases.discard(task_id)
+
+        while self._waiters and len(self._leases) < self._size:
+            waiter = self._waiters.popleft()
+            if waiter.future.done():
+                continue
+
+            self._leases.add(waiter.task_id)
+            waiter.future.set_result(None)
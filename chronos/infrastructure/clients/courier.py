@@ -1,18 +1,24 @@
-from typing import Any, Dict, List, Optional
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 import aiohttp
 from loguru import logger
 from pydantic import TypeAdapter
 
 from chronos.infrastructure.clients.base import BaseClient
+from chronos.infrastructure.exceptions import ExternalClientError
 from chronos.presentation.api.base_response import ResponseBase
 from chronos.schemas.creators.creators import CreatorSchema
 from chronos.schemas.credentials import CredentialsSchema, OTPCodeSchema
 
+CREATORS_ADAPTER = TypeAdapter(List[CreatorSchema])
+CLAIRVOY_PAGE_RETRIES = 3
+
 
 class CourierClient(BaseClient):
-    def __init__(self, *arg: Any, **kwargs: Any) -> None:
+    def __init__(self, *arg: Any, page_size: int = 100, **kwargs: Any) -> None:
         super().__init__(*arg, **kwargs)
+        self._page_size = page_size
         self._api_version = "api/v1"
         self._versioned_url = f"{self._host}/{self._api_version}"
 
@@ -89,13 +95,93 @@ class CourierClient(BaseClient):
                 resp_data: ResponseBase = ResponseBase.model_validate(resp)
 
             logger.info(f"✅ Fetched {len(resp_data.data['items'])} creators from Clairvoy")  # type: ignore
-            creators = TypeAdapter(List[CreatorSchema]).validate_python(resp_data.data["items"])  # type: ignore
+            creators = CREATORS_ADAPTER.validate_python(resp_data.data["items"])  # type: ignore
             return creators
 
         except Exception as e:
             logger.error(f"🛑 Failed to fetch Clairvoy creators: {e}")
             return []
 
+    async def iter_clairvoy_creators(
+        self,
+        endpoint: str = "clairvoy/creators",
+        limit: Optional[int] = None,
+        page_size: Optional[int] = None,
+    ) -> AsyncIterator[CreatorSchema]:
+        logger.info("📊 Streaming creators...")
+
+        page_size = page_size or self._page_size
+        remaining = limit
+        async with aiohttp.ClientSession() as session:
+            # The next page is fetched in the background while the current one is being consumed
+            next_page: Optional[asyncio.Task] = asyncio.create_task(
+                self._fetch_clairvoy_page(session=session, endpoint=endpoint, page_size=page_size)
+            )
+            try:
+                while next_page:
+                    creators, cursor = await next_page
+                    next_page = None
+
+                    if remaining is not None:
+                        creators = creators[:remaining]
+                        remaining -= len(creators)
+
+                    if cursor and creators and (remaining is None or remaining > 0):
+                        next_page = asyncio.create_task(
+                            self._fetch_clairvoy_page(
+                                session=session,
+                                endpoint=endpoint,
+                                page_size=page_size if remaining is None else min(page_size, remaining),
+                                cursor=cursor,
+                            )
+                        )
+
+                    for creator in creators:
+                        yield creator
+
+            finally:
+                if next_page:
+                    next_page.cancel()
+
+    async def _fetch_clairvoy_page(
+        self,
+        session: aiohttp.ClientSession,
+        endpoint: str,
+        page_size: int,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[CreatorSchema], Optional[str]]:
+        payload = {
+            "endpoint": "crawler/creators",
+            "query": {
+                "limit": page_size,
+                **({"cursor": cursor} if cursor else {}),
+            },
+        }
+
+        for attempt in range(1, CLAIRVOY_PAGE_RETRIES + 1):
+            try:
+                resp = await self.fetch_data(
+                    session=session,
+                    method="POST",
+                    url=f"{self._versioned_url}/{endpoint}",
+                    payload=payload,
+                )
+                resp_data: ResponseBase = ResponseBase.model_validate(resp)
+
+                creators = CREATORS_ADAPTER.validate_python(resp_data.data["items"])  # type: ignore
+                next_cursor = resp_data.data.get("next_cursor")  # type: ignore
+                logger.info(f"✅ Fetched a page of {len(creators)} creators from Clairvoy")
+                return creators, next_cursor
+
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to fetch Clairvoy creators page (attempt {attempt}): {e}")
+                if attempt < CLAIRVOY_PAGE_RETRIES:
+                    await asyncio.sleep(2**attempt)
+
+        # An empty page would look like the end of the list, so the stream fails loudly instead
+        msg = f"Failed to fetch Clairvoy creators page after {CLAIRVOY_PAGE_RETRIES} attempts"
+        raise ExternalClientError(detail=msg)
+
     async def send_crawl_result(self, payload: Any, endpoint: str = "clairvoy") -> None:
         logger.info("📤 Sending crawl result...")
         try:
@@ -0,0 +1,128 @@
+import os
+import socket
+from typing import Iterable, List, Optional, Tuple, Union
+from uuid import uuid4
+
+from loguru import logger
+from redis.asyncio import ConnectionPool, Redis
+from redis.exceptions import ResponseError
+
+from chronos.core.settings import Settings
+from chronos.schemas.creators.creators import CreatorSchema
+
+
+class RedisCreatorQueue:
+    """Creator backlog on a Redis stream, shared by crawler processes through a consumer group."""
+
+    def __init__(self, settings: Settings, redis_pool: ConnectionPool, consumer: Optional[str] = None) -> None:
+        self._settings = settings
+        self._redis = Redis(connection_pool=redis_pool)
+        self._stream = self._settings.creator_queue_stream
+        self._group = self._settings.creator_queue_group
+        self._consumer = consumer or f"{socket.gethostname()}-{os.getpid()}-{uuid4().hex[:6]}"
+        self._group_ready = False
+
+    @property
+    def consumer(self) -> str:
+        return self._consumer
+
+    async def push(self, creators: Iterable[CreatorSchema]) -> int:
+        pushed = 0
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for creator in creators:
+                pipe.xadd(self._stream, {"unique_id": creator.unique_id})
+                pushed += 1
+            await pipe.execute()
+
+        logger.info(f"📥 Pushed {pushed} creators to `{self._stream}`")
+        return pushed
+
+    async def claim(self, count: int = 1, block_ms: Optional[int] = None) -> List[Tuple[str, CreatorSchema]]:
+        await self._ensure_group()
+
+        # Entries whose consumer died (or stalled past the visibility timeout) come back first
+        entries = await self._reclaim(count=count)
+        if len(entries) < count:
+            block_ms = self._settings.creator_queue_block_ms if block_ms is None else block_ms
+            resp = await self._redis.xreadgroup(
+                groupname=self._group,
+                consumername=self._consumer,
+                streams={self._stream: ">"},
+                count=count - len(entries),
+                block=block_ms or None,
+            )
+            for _, stream_entries in resp or []:
+                entries.extend(stream_entries)
+
+        return [
+            (_decode(entry_id), CreatorSchema(unique_id=_decode(fields.get(b"unique_id", fields.get("unique_id")))))
+            for entry_id, fields in entries
+            if fields
+        ]
+
+    async def ack(self, entry_id: str) -> None:
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.xack(self._stream, self._group, entry_id)
+            pipe.xdel(self._stream, entry_id)
+            await pipe.execute()
+
+    async def size(self) -> int:
+        return await self._redis.xlen(self._stream)
+
+    async def pending(self) -> int:
+        await self._ensure_group()
+        summary = await self._redis.xpending(self._stream, self._group)
+        return summary["pending"] if summary else 0
+
+    async def _reclaim(self, count: int) -> List[Tuple[str, dict]]:
+        visibility_timeout_ms = self._settings.creator_queue_visibility_timeout * 1000
+        stale = await self._redis.xpending_range(
+            self._stream,
+            self._group,
+            min="-",
+            max="+",
+            count=count,
+            idle=visibility_timeout_ms,
+        )
+        if not stale:
+            return []
+
+        claimable, exhausted = [], []
+        for entry in stale:
+            entry_id = _decode(entry["message_id"])
+            if entry["times_delivered"] >= self._settings.creator_queue_max_deliveries:
+                exhausted.append(entry_id)
+            else:
+                claimable.append(entry_id)
+
+        for entry_id in exhausted:
+            logger.warning(f"⚠️ Dropping creator entry `{entry_id}` after too many deliveries")
+            await self.ack(entry_id=entry_id)
+
+        if not claimable:
+            return []
+
+        # XCLAIM re-checks the idle time, so two crawlers can't both take over the same entry
+        return await self._redis.xclaim(
+            self._stream,
+            self._group,
+            self._consumer,
+            min_idle_time=visibility_timeout_ms,
+            message_ids=claimable,
+        )
+
+    async def _ensure_group(self) -> None:
+        if self._group_ready:
+            return
+
+        try:
+            await self._redis.xgroup_create(name=self._stream, groupname=self._group, id="0", mkstream=True)
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+        self._group_ready = True
+
+
+def _decode(value: Union[bytes, str]) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
@@ -0,0 +1,122 @@
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from loguru import logger
+from redis.asyncio import ConnectionPool, Redis
+
+from chronos.core.settings import Settings
+from chronos.schemas.enums.tasks import JobStatus
+from chronos.schemas.jobs import JobSchema
+
+
+class JobTracker:
+    """Job state and progress counters in a Redis hash, with every change published for live followers."""
+
+    def __init__(self, settings: Settings, redis_pool: ConnectionPool) -> None:
+        self._settings = settings
+        self._redis = Redis(connection_pool=redis_pool)
+
+    async def create(self, jobs: List[Tuple[str, str, str]]) -> List[bool]:
+        """Register `(job_id, service, func)` jobs as queued; returns whether each id was still free."""
+        now = time.time()
+        try:
+            # HSETNX claims every id first, so a job registered earlier is never overwritten
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for job_id, _, _ in jobs:
+                    pipe.hsetnx(self._key(job_id=job_id), "created_at", now)
+                created = [bool(is_new) for is_new in await pipe.execute()]
+
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for (job_id, service, func), is_new in zip(jobs, created, strict=True):
+                    if is_new:
+                        pipe.hset(
+                            self._key(job_id=job_id),
+                            mapping={"status": JobStatus.QUEUED, "service": service, "func": func},
+                        )
+                        pipe.expire(self._key(job_id=job_id), self._settings.job_ttl)
+                await pipe.execute()
+            return created
+        except Exception as e:
+            # Like every other update, a tracking outage must not block the jobs from being enqueued
+            logger.warning(f"⚠️ Failed to register {len(jobs)} jobs: {e}")
+            return [True] * len(jobs)
+
+    async def start(self, job_id: str) -> None:
+        await self._update(job_id=job_id, fields={"status": JobStatus.RUNNING, "started_at": time.time()})
+
+    async def retry(self, job_id: str, error: str) -> None:
+        """Record a failed attempt that will be delivered again, so the job is not final yet."""
+        await self._update(job_id=job_id, fields={"status": JobStatus.RETRYING, "error": error})
+
+    async def finish(self, job_id: str, status: JobStatus, error: Optional[str] = None) -> None:
+        fields: Dict[str, Any] = {"status": status, "finished_at": time.time()}
+        if error:
+            fields["error"] = error
+        await self._update(job_id=job_id, fields=fields)
+
+    async def incr(self, job_id: str, counter: str, amount: int = 1) -> None:
+        await self._update(job_id=job_id, counter=(counter, amount))
+
+    async def get(self, job_id: str) -> Optional[JobSchema]:
+        raw_job = await self._redis.hgetall(self._key(job_id=job_id))
+        return _to_job(job_id=job_id, raw_job=raw_job) if raw_job else None
+
+    async def follow(self, job_id: str) -> AsyncIterator[Optional[JobSchema]]:
+        """Yield the current job, then every change until it finishes; `None` marks an idle keepalive."""
+        async with self._redis.pubsub() as pubsub:
+            # Subscribe before reading the snapshot so no update falls in between
+            await pubsub.subscribe(self._channel(job_id=job_id))
+
+            job = await self.get(job_id=job_id)
+            if job:
+                yield job
+            while not job or not job.is_final:
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True,
+                    timeout=self._settings.job_events_keepalive,
+                )
+                if not message:
+                    yield None
+                    continue
+
+                job = JobSchema.model_validate_json(message["data"])
+                yield job
+
+    async def _update(
+        self,
+        job_id: str,
+        fields: Optional[Dict[str, Any]] = None,
+        counter: Optional[Tuple[str, int]] = None,
+    ) -> None:
+        key = self._key(job_id=job_id)
+        try:
+            async with self._redis.pipeline(transaction=True) as pipe:
+                if fields:
+                    pipe.hset(key, mapping=fields)
+                if counter:
+                    pipe.hincrby(key, *counter)
+                pipe.expire(key, self._settings.job_ttl)
+                pipe.hgetall(key)
+                *_, raw_job = await pipe.execute()
+
+            job = _to_job(job_id=job_id, raw_job=raw_job)
+            await self._redis.publish(self._channel(job_id=job_id), job.model_dump_json())
+        except Exception as e:
+            # Tracking is best effort and must never fail the job itself
+            logger.warning(f"⚠️ Failed to update job `{job_id}`: {e}")
+
+    def _key(self, job_id: str) -> str:
+        return f"{self._settings.job_prefix}:{job_id}"
+
+    def _channel(self, job_id: str) -> str:
+        return f"{self._settings.job_prefix}:{job_id}:events"
+
+
+def _to_job(job_id: str, raw_job: Dict[Any, Any]) -> JobSchema:
+    decoded = {
+        (key.decode("utf-8") if isinstance(key, bytes) else key): (
+            value.decode("utf-8") if isinstance(value, bytes) else value
+        )
+        for key, value in raw_job.items()
+    }
+    return JobSchema.model_validate({**decoded, "job_id": job_id})
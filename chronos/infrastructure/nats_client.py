@@ -1,33 +1,75 @@
+import asyncio
 import json
+from typing import Dict, List, Optional
 
 from nats.aio.client import Client as NATS  # noqa: N814
+from nats.js.api import ConsumerInfo
 
 
 class NatsClient:
     def __init__(self, url: str):
         self._url = url
         self._client = NATS()
+        self._connect_lock = asyncio.Lock()
+
+    @property
+    def is_connected(self) -> bool:
+        return self._client.is_connected
 
     async def connect(self) -> None:
-        await self._client.connect(
-            servers=[self._url],
-            max_reconnect_attempts=60,
-            connect_timeout=30,
-            reconnect_time_wait=2,
-            max_outstanding_pings=2,
-        )
-
-    async def publish(self, subject: str, message: dict, drain: bool = True) -> None:
-        await self.connect()
-        if self._client.is_connected:
-            json_message = json.dumps(message)
-            await self._client.publish(subject, json_message.encode())
+        async with self._connect_lock:
+            # The client reconnects on its own once connected, so a single connect per process is enough
+            if self._client.is_connected or self._client.is_reconnecting:
+                return
+
+            await self._client.connect(
+                servers=[self._url],
+                max_reconnect_attempts=-1,
+                connect_timeout=30,
+                reconnect_time_wait=2,
+                max_outstanding_pings=2,
+            )
+
+    async def publish(
+        self,
+        subject: str,
+        message: dict,
+        headers: Optional[Dict[str, str]] = None,
+        flush: bool = False,
+    ) -> None:
+        if not self._client.is_connected and not self._client.is_reconnecting:
+            await self.connect()
+
+        # Publishes are buffered and written by the client's background flusher
+        json_message = json.dumps(message)
+        await self._client.publish(subject, json_message.encode(), headers=headers)
+        if flush:
             await self._client.flush()
-            if drain:
-                await self._client.drain()
+
+    async def flush(self) -> None:
+        await self._client.flush()
+
+    async def publish_durable(
+        self,
+        subject: str,
+        message: dict,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> None:
+        if not self._client.is_connected and not self._client.is_reconnecting:
+            await self.connect()
+
+        # Waits for the stream's acknowledgement, so the message is persisted once this returns
+        json_message = json.dumps(message)
+        await self._client.jetstream().publish(subject, json_message.encode(), headers=headers)
+
+    async def consumers_info(self, stream: str) -> List[ConsumerInfo]:
+        if not self._client.is_connected and not self._client.is_reconnecting:
+            await self.connect()
+
+        return await self._client.jsm().consumers_info(stream)
 
     async def close(self) -> None:
         if self._client.is_connected:
-            await self._client.flush()
             await self._client.drain()
+        elif self._client.is_reconnecting:
             await self._client.close()
@@ -0,0 +1,74 @@
+import asyncio
+import random
+import time
+from typing import Optional
+
+from loguru import logger
+from redis.asyncio import ConnectionPool, Redis
+
+from chronos.core.settings import Settings
+
+# Refills the bucket from the Redis clock so every crawler host sees the same time, then either takes the
+# requested tokens and returns 0 or returns how many milliseconds to wait before they are available.
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+local wait = 0
+if tokens >= requested then
+    tokens = tokens - requested
+else
+    wait = math.ceil((requested - tokens) / rate)
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate) + 1000)
+return wait
+"""
+
+
+class RedisRateLimiter:
+    """Token buckets shared by the whole fleet, one per budget name and key (account, host, ...)."""
+
+    def __init__(self, settings: Settings, redis_pool: ConnectionPool) -> None:
+        self._settings = settings
+        self._redis = Redis(connection_pool=redis_pool)
+        self._script = self._redis.register_script(TOKEN_BUCKET_SCRIPT)
+
+    async def try_acquire(self, budget: str, key: str = "global", tokens: int = 1) -> float:
+        """Take tokens if available, otherwise return the seconds to wait before retrying."""
+        rate_budget = self._settings.rate_limit_budgets.get(budget)
+        if not self._settings.rate_limit_enabled or not rate_budget:
+            return 0.0
+
+        if tokens > rate_budget.burst:
+            msg = f"Cannot acquire {tokens} tokens from budget `{budget}` with burst {rate_budget.burst}"
+            raise ValueError(msg)
+
+        wait_ms = await self._script(
+            keys=[f"{self._settings.rate_limit_prefix}:{budget}:{key}"],
+            args=[rate_budget.rate_per_minute / 60_000, rate_budget.burst, tokens],
+        )
+        return int(wait_ms) / 1000
+
+    async def acquire(self, budget: str, key: str = "global", tokens: int = 1, timeout: Optional[float] = None) -> bool:
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while wait := await self.try_acquire(budget=budget, key=key, tokens=tokens):
+            if deadline and time.monotonic() + wait > deadline:
+                logger.warning(f"⚠️ Rate budget `{budget}:{key}` not available within {timeout}s")
+                return False
+
+            logger.debug(f"⏳ Rate budget `{budget}:{key}` exhausted, waiting {wait:.2f}s")
+            # A little jitter keeps crawlers sharing a bucket from retrying in lockstep
+            await asyncio.sleep(wait + random.uniform(0, 0.1))
+
+        return True
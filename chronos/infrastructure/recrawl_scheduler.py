@@ -0,0 +1,90 @@
+import hashlib
+import json
+import random
+import time
+from typing import Any, List, Optional
+
+from loguru import logger
+from redis.asyncio import ConnectionPool, Redis
+
+from chronos.core.settings import Settings
+from chronos.infrastructure.storage.blobs import canonicalize
+from chronos.schemas.creators.creators import CreatorSchema
+
+# Takes the due creators and pushes them one lease ahead in the same step, so concurrent crawlers never
+# claim the same creator and a crashed crawler's creators become due again once the lease runs out.
+CLAIM_DUE_SCRIPT = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+for _, member in ipairs(due) do
+    redis.call('ZADD', KEYS[1], ARGV[3], member)
+end
+return due
+"""
+
+
+class RecrawlScheduler:
+    """Creators ordered by next-due time; creators whose data keeps changing are refreshed more often."""
+
+    def __init__(self, settings: Settings, redis_pool: ConnectionPool) -> None:
+        self._settings = settings
+        self._redis = Redis(connection_pool=redis_pool)
+        self._due_key = f"{self._settings.recrawl_prefix}:due"
+        self._state_key = f"{self._settings.recrawl_prefix}:state"
+        self._claim_script = self._redis.register_script(CLAIM_DUE_SCRIPT)
+
+    async def schedule(self, creators: List[CreatorSchema], due_at: Optional[float] = None) -> int:
+        if not creators:
+            return 0
+
+        due_at = time.time() if due_at is None else due_at
+        # NX keeps the learned schedule of creators that are already known
+        added = await self._redis.zadd(self._due_key, dict.fromkeys((c.unique_id for c in creators), due_at), nx=True)
+        logger.info(f"🗓️ Scheduled {added} new creators for recrawl ({len(creators) - added} already known)")
+        return added
+
+    async def claim_due(self, count: int = 1) -> List[CreatorSchema]:
+        now = time.time()
+        members = await self._claim_script(
+            keys=[self._due_key],
+            args=[now, count, now + self._settings.recrawl_lease],
+        )
+        return [CreatorSchema(unique_id=_decode(member)) for member in members]
+
+    async def next_due_in(self) -> Optional[float]:
+        head = await self._redis.zrange(self._due_key, 0, 0, withscores=True)
+        return max(0.0, head[0][1] - time.time()) if head else None
+
+    async def record(self, unique_id: str, document: Any) -> float:
+        digest = hashlib.sha256(canonicalize(document)).hexdigest()
+        raw_state = await self._redis.hget(self._state_key, unique_id)
+        state = json.loads(raw_state) if raw_state else {}
+
+        interval = state.get("interval", self._settings.recrawl_initial_interval)
+        if state.get("digest") == digest:
+            interval *= self._settings.recrawl_backoff_factor
+        elif state:
+            interval *= self._settings.recrawl_speedup_factor
+        interval = min(max(interval, self._settings.recrawl_min_interval), self._settings.recrawl_max_interval)
+
+        # Jitter spreads creators first scheduled together so they don't stay due in one burst forever
+        next_due = time.time() + interval * random.uniform(0.9, 1.1)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.hset(self._state_key, unique_id, json.dumps({"interval": interval, "digest": digest}))
+            pipe.zadd(self._due_key, {unique_id: next_due})
+            await pipe.execute()
+
+        logger.debug(f"🗓️ Next recrawl of `{unique_id}` in {interval / 3600:.1f}h")
+        return next_due
+
+    async def forget(self, unique_id: str) -> None:
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.zrem(self._due_key, unique_id)
+            pipe.hdel(self._state_key, unique_id)
+            await pipe.execute()
+
+    async def size(self) -> int:
+        return await self._redis.zcard(self._due_key)
+
+
+def _decode(value: Any) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
@@ -0,0 +1,111 @@
+import json
+import random
+import time
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+from redis.asyncio import ConnectionPool, Redis
+
+from chronos.core.settings import Settings
+from chronos.infrastructure.recrawl_scheduler import CLAIM_DUE_SCRIPT
+from chronos.schemas.creators.creators import CreatorSchema
+from chronos.schemas.enums.tasks import RetryReason
+
+# Moves dead letters back to the due set in one step, so a crash can't drop records between the two
+REQUEUE_DEAD_SCRIPT = """
+local requeued = 0
+for _ = 1, tonumber(ARGV[1]) do
+    local record = redis.call('RPOP', KEYS[1])
+    if not record then
+        break
+    end
+    redis.call('ZADD', KEYS[2], ARGV[2], cjson.decode(record)['unique_id'])
+    requeued = requeued + 1
+end
+return requeued
+"""
+
+
+class CreatorRetryQueue:
+    """Delayed retries for creators that failed mid-flow, dead-lettered once their reason's attempts run out."""
+
+    def __init__(self, settings: Settings, redis_pool: ConnectionPool) -> None:
+        self._settings = settings
+        self._redis = Redis(connection_pool=redis_pool)
+        self._due_key = f"{self._settings.retry_prefix}:due"
+        self._state_key = f"{self._settings.retry_prefix}:state"
+        self._dead_key = f"{self._settings.retry_prefix}:dead"
+        self._claim_script = self._redis.register_script(CLAIM_DUE_SCRIPT)
+        self._requeue_script = self._redis.register_script(REQUEUE_DEAD_SCRIPT)
+
+    async def fail(
+        self,
+        unique_id: str,
+        reason: RetryReason,
+        error: str,
+        artifacts: Optional[List[str]] = None,
+    ) -> bool:
+        """Schedule another attempt, or dead-letter the creator; returns whether a retry was scheduled."""
+        raw_state = await self._redis.hget(self._state_key, unique_id)
+        state = json.loads(raw_state) if raw_state else {}
+
+        attempts = state.get("attempts", {})
+        attempts[reason] = attempts.get(reason, 0) + 1
+        record = {
+            "unique_id": unique_id,
+            "reason": reason,
+            "attempts": attempts,
+            "error": error,
+            "artifacts": state.get("artifacts", []) + (artifacts or []),
+            "failed_at": time.time(),
+        }
+
+        max_attempts = self._settings.retry_max_attempts.get(reason, 1)
+        if attempts[reason] >= max_attempts:
+            async with self._redis.pipeline(transaction=True) as pipe:
+                pipe.lpush(self._dead_key, json.dumps(record))
+                pipe.zrem(self._due_key, unique_id)
+                pipe.hdel(self._state_key, unique_id)
+                await pipe.execute()
+
+            logger.warning(f"🪦 Creator `{unique_id}` dead-lettered after {attempts[reason]} {reason} failures")
+            return False
+
+        delay = min(self._settings.retry_base_delay * 2 ** (attempts[reason] - 1), self._settings.retry_max_delay)
+        delay *= random.uniform(0.8, 1.2)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.hset(self._state_key, unique_id, json.dumps(record))
+            pipe.zadd(self._due_key, {unique_id: time.time() + delay})
+            await pipe.execute()
+
+        logger.info(f"🔁 Retrying creator `{unique_id}` in {delay:.0f}s ({reason}, attempt {attempts[reason]})")
+        return True
+
+    async def claim_due(self, count: int = 1) -> List[CreatorSchema]:
+        now = time.time()
+        members = await self._claim_script(
+            keys=[self._due_key],
+            args=[now, count, now + self._settings.retry_lease],
+        )
+        return [CreatorSchema(unique_id=_decode(member)) for member in members]
+
+    async def succeed(self, unique_id: str) -> None:
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.zrem(self._due_key, unique_id)
+            pipe.hdel(self._state_key, unique_id)
+            await pipe.execute()
+
+    async def dead_letters(self, limit: int = 100) -> List[Dict[str, Any]]:
+        return [json.loads(record) for record in await self._redis.lrange(self._dead_key, 0, limit - 1)]
+
+    async def requeue_dead_letters(self, limit: int = 100) -> int:
+        requeued = await self._requeue_script(keys=[self._dead_key, self._due_key], args=[limit, time.time()])
+        logger.info(f"🔁 Requeued {requeued} dead-lettered creators")
+        return requeued
+
+    async def size(self) -> int:
+        return await self._redis.zcard(self._due_key)
+
+
+def _decode(value: Any) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
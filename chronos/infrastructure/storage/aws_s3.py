@@ -1,26 +1,52 @@
+import io
 import json
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from json import JSONDecodeError
-from typing import Any, Optional
+from typing import IO, Any, Iterator, List, Optional, Tuple, Union
 
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import ClientError
 from loguru import logger
 from mypy_boto3_s3 import S3Client
+from mypy_boto3_s3.type_defs import GetObjectOutputTypeDef
 
 from chronos.core.settings import Settings
-from chronos.infrastructure.storage.base import StorageManager
+from chronos.infrastructure.storage.base import StorageManager, StoredFile
+from chronos.infrastructure.storage.compression import (
+    ZSTD_CONTENT_ENCODING,
+    compress_into,
+    compressed_key,
+    decompress_reader,
+    is_compressed,
+    iter_decompressed,
+)
+from chronos.infrastructure.storage.manifest import ManifestIndex
+
+S3_DELETE_BATCH_SIZE = 1000
 
 
 class S3StorageManager(StorageManager):
-    def __init__(self, settings: Settings, s3_client: S3Client) -> None:
-        self._settings = settings
+    def __init__(self, settings: Settings, s3_client: S3Client, manifest: Optional[ManifestIndex] = None) -> None:
+        super().__init__(settings=settings, manifest=manifest)
         self._s3_client = s3_client
+        self._transfer_config = TransferConfig(
+            multipart_threshold=self._settings.s3_multipart_threshold,
+            multipart_chunksize=self._settings.s3_multipart_chunksize,
+            max_concurrency=self._settings.s3_max_concurrency,
+        )
 
     def read_file(self, file_key: str, file_type: Optional[str] = None) -> Any:
         assert self._settings.s3_bucket, "Storage bucket is not configured"
         try:
-            resp = self._s3_client.get_object(Bucket=self._settings.s3_bucket, Key=file_key)
-            data = resp["Body"].read().decode("utf-8")
-            return json.loads(data) if file_type == "json" else data
+            file_key, resp = self._get_object(file_key=file_key)
+            body = resp["Body"]
+            if is_compressed(file_key=file_key, content_encoding=resp.get("ContentEncoding")):
+                body = decompress_reader(body)  # type: ignore
+
+            if file_type == "json":
+                return json.load(body)
+            return body.read().decode("utf-8")
         except (JSONDecodeError, TypeError) as e:
             logger.error(f"Error decoding JSON from S3: {e}")
             return {}
@@ -28,24 +54,102 @@ class S3StorageManager(StorageManager):
             logger.error(f"Error reading file from S3: {e}")
             return None
 
-    def upload_file(self, file_path: str, file_key: str, content_type: str = "application/octet-stream") -> None:
+    def read_range(self, file_key: str, offset: int, length: int) -> bytes:
+        assert self._settings.s3_bucket, "Storage bucket is not configured"
+        resp = self._s3_client.get_object(
+            Bucket=self._settings.s3_bucket,
+            Key=file_key,
+            Range=f"bytes={offset}-{offset + length - 1}",
+        )
+        return resp["Body"].read()
+
+    def iter_file(self, file_key: str, chunk_size: int = 1024 * 1024) -> Iterator[bytes]:
+        assert self._settings.s3_bucket, "Storage bucket is not configured"
+        file_key, resp = self._get_object(file_key=file_key)
+        if is_compressed(file_key=file_key, content_encoding=resp.get("ContentEncoding")):
+            yield from iter_decompressed(resp["Body"], chunk_size=chunk_size)  # type: ignore
+            return
+
+        yield from resp["Body"].iter_chunks(chunk_size=chunk_size)
+
+    def upload_file(
+        self,
+        file_path: str,
+        file_key: str,
+        content_type: str = "application/octet-stream",
+        compress: Optional[bool] = None,
+    ) -> str:
         assert self._settings.s3_bucket, "Storage bucket is not configured"
         with open(file_path, "rb") as file_content:
-            self._s3_client.put_object(
+            return self.upload_bytes(data=file_content, file_key=file_key, content_type=content_type, compress=compress)
+
+    def _write_bytes(
+        self,
+        data: Union[bytes, IO[bytes]],
+        file_key: str,
+        content_type: str,
+        compress: Optional[bool],
+    ) -> str:
+        compress = self._should_compress(file_key=file_key) if compress is None else compress
+        acl = "public-read" if self._is_public(file_key=file_key) else self._settings.s3_object_acl
+        if not compress:
+            self._put_object(body=data, file_key=file_key, content_type=content_type, acl=acl)
+            return file_key
+
+        with tempfile.SpooledTemporaryFile(max_size=self._settings.storage_spool_max_size) as buffer:
+            compress_into(data=data, dest=buffer, level=self._settings.storage_compression_level)  # type: ignore
+            buffer.seek(0)
+
+            file_key = compressed_key(file_key)
+            self._put_object(
+                body=buffer,  # type: ignore
+                file_key=file_key,
+                content_type=content_type,
+                acl=acl,
+                content_encoding=ZSTD_CONTENT_ENCODING,
+            )
+
+        return file_key
+
+    def delete_files(self, file_keys: List[str]) -> None:
+        assert self._settings.s3_bucket, "Storage bucket is not configured"
+        # DeleteObjects accepts at most 1000 keys per request
+        batches = [
+            file_keys[index : index + S3_DELETE_BATCH_SIZE] for index in range(0, len(file_keys), S3_DELETE_BATCH_SIZE)
+        ]
+        if len(batches) <= 1:
+            for batch in batches:
+                self._delete_batch(file_keys=batch)
+            return
+
+        with ThreadPoolExecutor(max_workers=min(len(batches), self._settings.s3_max_concurrency)) as executor:
+            list(executor.map(lambda batch: self._delete_batch(file_keys=batch), batches))
+
+    def download_file(self, file_key: str, file_path: str) -> None:
+        assert self._settings.s3_bucket, "Storage bucket is not configured"
+        file_key, content_encoding = self._resolve_key(file_key=file_key)
+        if not is_compressed(file_key=file_key, content_encoding=content_encoding):
+            # Large objects are fetched as concurrent ranged GETs
+            self._s3_client.download_file(
                 Bucket=self._settings.s3_bucket,
                 Key=file_key,
-                Body=file_content,
-                ACL="public-read",
-                ContentType=content_type,
-                CacheControl="max-age=31536000, public",
+                Filename=file_path,
+                Config=self._transfer_config,
             )
+            return
 
-    def delete_files(self, file_keys: list[str]) -> None:
-        assert self._settings.s3_bucket, "Storage bucket is not configured"
-        self._s3_client.delete_objects(
-            Bucket=self._settings.s3_bucket,
-            Delete={"Objects": [{"Key": key} for key in file_keys]},
-        )
+        # Compressed objects take the same ranged GETs into a spool, then are inflated into the target file
+        with tempfile.SpooledTemporaryFile(max_size=self._settings.storage_spool_max_size) as buffer:
+            self._s3_client.download_fileobj(
+                Bucket=self._settings.s3_bucket,
+                Key=file_key,
+                Fileobj=buffer,
+                Config=self._transfer_config,
+            )
+            buffer.seek(0)
+            with open(file_path, "wb") as file:
+                for chunk in iter_decompressed(buffer):  # type: ignore
+                    file.write(chunk)
 
     def get_file_size(self, file_key: str) -> int:
         assert self._settings.s3_bucket, "Storage bucket is not configured"
@@ -56,3 +160,84 @@ class S3StorageManager(StorageManager):
         except ClientError as e:
             logger.error(f"Error retrieving file size from s3: {e}")
             return 0
+
+    def file_exists(self, file_key: str) -> bool:
+        return self._head_stored(file_key=file_key) is not None
+
+    def list_files(self, prefix: str = "") -> Iterator[StoredFile]:
+        assert self._settings.s3_bucket, "Storage bucket is not configured"
+        paginator = self._s3_client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self._settings.s3_bucket, Prefix=prefix):
+            for obj in page.get("Contents", []):
+                yield StoredFile(key=obj["Key"], size=obj["Size"], last_modified=obj["LastModified"])
+
+    def _is_public(self, file_key: str) -> bool:
+        return any(file_key.startswith(prefix) for prefix in self._settings.s3_public_prefixes)
+
+    def _resolve_key(self, file_key: str) -> Tuple[str, Optional[str]]:
+        # Callers may keep using the plain key for artifacts that were stored compressed
+        stored = self._head_stored(file_key=file_key)
+        return stored or (file_key, None)
+
+    def _head_stored(self, file_key: str) -> Optional[Tuple[str, Optional[str]]]:
+        assert self._settings.s3_bucket, "Storage bucket is not configured"
+        candidates = [file_key] if is_compressed(file_key=file_key) else [file_key, compressed_key(file_key)]
+        for candidate in candidates:
+            try:
+                resp = self._s3_client.head_object(Bucket=self._settings.s3_bucket, Key=candidate)
+                return candidate, resp.get("ContentEncoding")
+            except ClientError as e:
+                if e.response.get("Error", {}).get("Code") not in ("404", "NoSuchKey"):
+                    raise
+
+        return None
+
+    def _get_object(self, file_key: str) -> Tuple[str, GetObjectOutputTypeDef]:
+        assert self._settings.s3_bucket, "Storage bucket is not configured"
+        try:
+            return file_key, self._s3_client.get_object(Bucket=self._settings.s3_bucket, Key=file_key)
+        except ClientError as e:
+            # Callers may keep using the plain key for artifacts that were stored compressed
+            if e.response.get("Error", {}).get("Code") != "NoSuchKey" or is_compressed(file_key=file_key):
+                raise
+
+        file_key = compressed_key(file_key)
+        return file_key, self._s3_client.get_object(Bucket=self._settings.s3_bucket, Key=file_key)
+
+    def _delete_batch(self, file_keys: List[str]) -> None:
+        assert self._settings.s3_bucket, "Storage bucket is not configured"
+        resp = self._s3_client.delete_objects(
+            Bucket=self._settings.s3_bucket,
+            Delete={"Objects": [{"Key": key} for key in file_keys], "Quiet": True},
+        )
+        for error in resp.get("Errors", []):
+            logger.error(f"Error deleting file {error.get('Key')} from S3: {error.get('Message')}")
+
+    def _put_object(
+        self,
+        body: Union[bytes, IO[bytes]],
+        file_key: str,
+        content_type: str,
+        acl: str,
+        content_encoding: Optional[str] = None,
+    ) -> None:
+        assert self._settings.s3_bucket, "Storage bucket is not configured"
+        extra_args = {
+            "ACL": acl,
+            "ContentType": content_type,
+            "CacheControl": f"max-age=31536000, {'public' if acl == 'public-read' else 'private'}",
+            **({"ContentEncoding": content_encoding} if content_encoding else {}),
+        }
+
+        if isinstance(body, bytes) and len(body) < self._settings.s3_multipart_threshold:
+            self._s3_client.put_object(Bucket=self._settings.s3_bucket, Key=file_key, Body=body, **extra_args)
+            return
+
+        # Switches to concurrent multipart uploads above the threshold
+        self._s3_client.upload_fileobj(
+            Fileobj=io.BytesIO(body) if isinstance(body, bytes) else body,
+            Bucket=self._settings.s3_bucket,
+            Key=file_key,
+            ExtraArgs=extra_args,
+            Config=self._transfer_config,
+        )
@@ -1,14 +1,86 @@
+import asyncio
+import tempfile
 from abc import ABC, abstractmethod
-from typing import Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from functools import partial
+from typing import IO, Any, AsyncIterator, Callable, Iterator, List, Optional, TypeVar, Union
+
+from chronos.core.settings import Settings
+from chronos.infrastructure.storage.compression import should_compress
+from chronos.infrastructure.storage.manifest import ManifestIndex, SnapshotRef, fingerprint, parse_snapshot_key
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class StoredFile:
+    key: str
+    size: int
+    last_modified: datetime
 
 
 class StorageManager(ABC):
+    def __init__(self, settings: Settings, manifest: Optional[ManifestIndex] = None) -> None:
+        self._settings = settings
+        self._manifest = manifest
+
+        # Lazily created so short-lived managers (e.g. per captcha solver) don't spawn threads
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def manifest(self) -> Optional[ManifestIndex]:
+        return self._manifest
+
     @abstractmethod
     def read_file(self, file_key: str, file_type: Optional[str] = None) -> Any:
         pass
 
     @abstractmethod
-    def upload_file(self, file_path: str, file_key: str, content_type: str = "application/octet-stream") -> None:
+    def read_range(self, file_key: str, offset: int, length: int) -> bytes:
+        pass
+
+    @abstractmethod
+    def iter_file(self, file_key: str, chunk_size: int = 1024 * 1024) -> Iterator[bytes]:
+        pass
+
+    @abstractmethod
+    def upload_file(
+        self,
+        file_path: str,
+        file_key: str,
+        content_type: str = "application/octet-stream",
+        compress: Optional[bool] = None,
+    ) -> str:
+        pass
+
+    def upload_bytes(
+        self,
+        data: Union[bytes, IO[bytes]],
+        file_key: str,
+        content_type: str = "application/octet-stream",
+        compress: Optional[bool] = None,
+    ) -> str:
+        snapshot_ref = parse_snapshot_key(file_key=file_key) if self._manifest else None
+        if not snapshot_ref:
+            return self._write_bytes(data=data, file_key=file_key, content_type=content_type, compress=compress)
+
+        size, content_hash = fingerprint(data=data)
+        stored_key = self._write_bytes(data=data, file_key=file_key, content_type=content_type, compress=compress)
+        self._record_snapshot(snapshot_ref=snapshot_ref, stored_key=stored_key, size=size, content_hash=content_hash)
+        return stored_key
+
+    @abstractmethod
+    def _write_bytes(
+        self,
+        data: Union[bytes, IO[bytes]],
+        file_key: str,
+        content_type: str,
+        compress: Optional[bool],
+    ) -> str:
         pass
 
     @abstractmethod
@@ -18,3 +90,144 @@ class StorageManager(ABC):
     @abstractmethod
     def get_file_size(self, file_key: str) -> int:
         pass
+
+    @abstractmethod
+    def file_exists(self, file_key: str) -> bool:
+        pass
+
+    @abstractmethod
+    def list_files(self, prefix: str = "") -> Iterator[StoredFile]:
+        pass
+
+    def download_file(self, file_key: str, file_path: str) -> None:
+        with open(file_path, "wb") as file:
+            for chunk in self.iter_file(file_key=file_key):
+                file.write(chunk)
+
+    async def aread_file(self, file_key: str, file_type: Optional[str] = None) -> Any:
+        return await self._run_in_executor(self.read_file, file_key=file_key, file_type=file_type)
+
+    async def aread_range(self, file_key: str, offset: int, length: int) -> bytes:
+        return await self._run_in_executor(self.read_range, file_key=file_key, offset=offset, length=length)
+
+    async def adownload_file(self, file_key: str, file_path: str) -> None:
+        await self._run_in_executor(self.download_file, file_key=file_key, file_path=file_path)
+
+    async def aiter_file(self, file_key: str, chunk_size: int = 1024 * 1024) -> AsyncIterator[bytes]:
+        chunks = self.iter_file(file_key=file_key, chunk_size=chunk_size)
+        try:
+            while chunk := await self._run_in_executor(next, chunks, b""):
+                yield chunk
+        finally:
+            close = getattr(chunks, "close", None)
+            if close:
+                close()
+
+    async def aupload_file(
+        self,
+        file_path: str,
+        file_key: str,
+        content_type: str = "application/octet-stream",
+        compress: Optional[bool] = None,
+    ) -> str:
+        return await self._run_in_executor(
+            self.upload_file,
+            file_path=file_path,
+            file_key=file_key,
+            content_type=content_type,
+            compress=compress,
+        )
+
+    async def aupload_bytes(
+        self,
+        data: Union[bytes, IO[bytes]],
+        file_key: str,
+        content_type: str = "application/octet-stream",
+        compress: Optional[bool] = None,
+    ) -> str:
+        return await self._run_in_executor(
+            self.upload_bytes,
+            data=data,
+            file_key=file_key,
+            content_type=content_type,
+            compress=compress,
+        )
+
+    async def aupload_stream(
+        self,
+        stream: AsyncIterator[bytes],
+        file_key: str,
+        content_type: str = "application/octet-stream",
+        compress: Optional[bool] = None,
+    ) -> str:
+        # Small payloads stay in memory, larger ones spill to disk before being handed to the backend
+        with tempfile.SpooledTemporaryFile(max_size=self._settings.storage_spool_max_size) as buffer:
+            async for chunk in stream:
+                # Once spilled, writes hit the disk, so they run in the executor like every other file operation
+                await self._run_in_executor(buffer.write, chunk)
+
+            buffer.seek(0)
+            return await self.aupload_bytes(
+                data=buffer,  # type: ignore
+                file_key=file_key,
+                content_type=content_type,
+                compress=compress,
+            )
+
+    async def adelete_files(self, file_keys: List[str]) -> None:
+        await self._run_in_executor(self.delete_files, file_keys=file_keys)
+
+    async def aget_file_size(self, file_key: str) -> int:
+        return await self._run_in_executor(self.get_file_size, file_key=file_key)
+
+    async def afile_exists(self, file_key: str) -> bool:
+        return await self._run_in_executor(self.file_exists, file_key=file_key)
+
+    async def alist_files(self, prefix: str = "") -> AsyncIterator[StoredFile]:
+        files = self.list_files(prefix=prefix)
+        while stored_file := await self._run_in_executor(next, files, None):
+            yield stored_file
+
+    def _should_compress(self, file_key: str) -> bool:
+        return should_compress(file_key=file_key, prefixes=self._settings.storage_compression_prefixes)
+
+    def _record_snapshot(self, snapshot_ref: SnapshotRef, stored_key: str, size: int, content_hash: str) -> None:
+        assert self._manifest, "Manifest index is not configured"
+        try:
+            self._manifest.record(ref=snapshot_ref, key=stored_key, size=size, content_hash=content_hash)
+        except Exception:
+            # An object the manifest doesn't know about would never be found again, so undo the write
+            self.delete_files(file_keys=[stored_key])
+            raise
+
+    def close(self) -> None:
+        if self._executor:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    async def aclose(self) -> None:
+        # Closing waits for in-flight (and, when tiered, pending) uploads, which must not stall the event loop
+        await asyncio.to_thread(self.close)
+
+    async def _run_in_executor(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        # The semaphore bounds queued + running operations, so callers wait instead of piling up work
+        async with self._get_semaphore():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), partial(func, *args, **kwargs))
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._settings.storage_max_workers,
+                thread_name_prefix=self.__class__.__name__,
+            )
+
+        return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self._settings.storage_max_pending)
+            self._semaphore_loop = loop
+
+        return self._semaphore
@@ -0,0 +1,73 @@
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any
+
+from loguru import logger
+
+from chronos.core.settings import Settings
+from chronos.infrastructure.storage.base import StorageManager
+from chronos.infrastructure.storage.compression import ZSTD_EXTENSION
+
+BLOB_PREFIX = "blobs/sha256"
+REF_FILE_TYPE = "ref.json"
+
+
+def canonicalize(document: Any) -> bytes:
+    return json.dumps(document, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def blob_key(digest: str) -> str:
+    return f"{BLOB_PREFIX}/{digest[:2]}/{digest[2:4]}/{digest}.json"
+
+
+def is_ref_key(file_key: str) -> bool:
+    return file_key.removesuffix(ZSTD_EXTENSION).endswith(f".{REF_FILE_TYPE}")
+
+
+def blob_digest(file_key: str) -> str:
+    return file_key.rsplit("/", 1)[-1].removesuffix(ZSTD_EXTENSION).removesuffix(".json")
+
+
+class BlobStore:
+    def __init__(self, settings: Settings, storage_manager: StorageManager) -> None:
+        self._settings = settings
+        self._storage_manager = storage_manager
+
+        # Digests recently known to be stored (LRU), so repeated payloads skip the existence check too.
+        # Entries go stale well within the GC grace period, so a swept blob is never assumed to still exist.
+        self._known_digests: OrderedDict[str, float] = OrderedDict()
+        self._known_digest_ttl = self._settings.raw_blob_gc_grace / 2
+
+    async def save(self, file_key: str, document: Any) -> str:
+        data = canonicalize(document)
+        digest = hashlib.sha256(data).hexdigest()
+        key = blob_key(digest)
+
+        known_at = self._known_digests.get(digest)
+        if known_at is not None and time.monotonic() - known_at < self._known_digest_ttl:
+            self._known_digests.move_to_end(digest)
+        else:
+            if await self._storage_manager.afile_exists(file_key=key):
+                logger.debug(f"♻️ Blob `{digest[:12]}` already stored, writing reference only")
+            else:
+                await self._storage_manager.aupload_bytes(data=data, file_key=key, content_type="application/json")
+            self._known_digests[digest] = time.monotonic()
+            self._known_digests.move_to_end(digest)
+            if len(self._known_digests) > self._settings.raw_blob_digest_cache_size:
+                self._known_digests.popitem(last=False)
+
+        ref = {"blob": key, "sha256": digest, "size": len(data)}
+        return await self._storage_manager.aupload_bytes(
+            data=json.dumps(ref).encode("utf-8"),
+            file_key=f"{file_key.removesuffix('.json')}.{REF_FILE_TYPE}",
+            content_type="application/json",
+        )
+
+    async def read(self, file_key: str) -> Any:
+        if not is_ref_key(file_key):
+            return await self._storage_manager.aread_file(file_key=file_key, file_type="json")
+
+        ref = await self._storage_manager.aread_file(file_key=file_key, file_type="json")
+        return await self._storage_manager.aread_file(file_key=ref["blob"], file_type="json")
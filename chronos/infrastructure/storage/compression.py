@@ -0,0 +1,47 @@
+import io
+from typing import IO, Iterator, List, Optional, Union
+
+import zstandard
+
+ZSTD_EXTENSION = ".zst"
+ZSTD_CONTENT_ENCODING = "zstd"
+
+
+def should_compress(file_key: str, prefixes: List[str]) -> bool:
+    if file_key.endswith(ZSTD_EXTENSION):
+        return False
+
+    return any(file_key.startswith(prefix) for prefix in prefixes)
+
+
+def is_compressed(file_key: str, content_encoding: Optional[str] = None) -> bool:
+    return file_key.endswith(ZSTD_EXTENSION) or content_encoding == ZSTD_CONTENT_ENCODING
+
+
+def compressed_key(file_key: str) -> str:
+    return f"{file_key}{ZSTD_EXTENSION}"
+
+
+def compress_into(data: Union[bytes, IO[bytes]], dest: IO[bytes], level: int = 3) -> None:
+    compressor = zstandard.ZstdCompressor(level=level)
+    if isinstance(data, bytes):
+        dest.write(compressor.compress(data))
+    else:
+        compressor.copy_stream(data, dest)
+
+
+def make_compressor(level: int = 3) -> "zstandard.ZstdCompressionObj":
+    return zstandard.ZstdCompressor(level=level).compressobj()
+
+
+def compress_writer(dest: IO[bytes], level: int = 3) -> IO[bytes]:
+    return zstandard.ZstdCompressor(level=level).stream_writer(dest, closefd=False)  # type: ignore
+
+
+def decompress_reader(source: IO[bytes]) -> IO[bytes]:
+    reader = zstandard.ZstdDecompressor().stream_reader(source, closefd=False)
+    return io.BufferedReader(reader)  # type: ignore
+
+
+def iter_decompressed(source: IO[bytes], chunk_size: int = 1024 * 1024) -> Iterator[bytes]:
+    yield from zstandard.ZstdDecompressor().read_to_iter(source, read_size=chunk_size, write_size=chunk_size)
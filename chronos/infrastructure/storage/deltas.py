@@ -0,0 +1,167 @@
+import asyncio
+import copy
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from chronos.core.settings import Settings
+from chronos.infrastructure.storage.base import StorageManager
+from chronos.infrastructure.storage.compression import ZSTD_EXTENSION
+from chronos.infrastructure.storage.manifest import SNAPSHOT_LAYOUT_DELTA, SNAPSHOT_LAYOUT_FILE, parse_snapshot_key
+from chronos.utils.constants import SNAPSHOT_KEY_PATTERN
+
+DELTA_FILE_TYPE = "delta.json"
+
+_MISSING = object()
+
+
+def diff_documents(old: Any, new: Any, path: Tuple[str, ...] = ()) -> Dict[str, List[Any]]:
+    """Structural diff of two JSON documents; lists and scalars are replaced as a whole."""
+    delta: Dict[str, List[Any]] = {"set": [], "unset": []}
+    if not isinstance(old, dict) or not isinstance(new, dict):
+        if old != new:
+            delta["set"].append([list(path), new])
+        return delta
+
+    for key, value in new.items():
+        old_value = old.get(key, _MISSING)
+        if old_value is _MISSING:
+            delta["set"].append([[*path, key], value])
+            continue
+
+        child = diff_documents(old=old_value, new=value, path=(*path, key))
+        delta["set"].extend(child["set"])
+        delta["unset"].extend(child["unset"])
+
+    delta["unset"].extend([*path, key] for key in old if key not in new)
+    return delta
+
+
+def apply_delta(document: Any, delta: Dict[str, List[Any]]) -> Any:
+    document = copy.deepcopy(document)
+    for path in delta.get("unset", []):
+        parent = _walk(document, path[:-1])
+        if isinstance(parent, dict):
+            parent.pop(path[-1], None)
+
+    for path, value in delta.get("set", []):
+        if not path:
+            document = copy.deepcopy(value)
+            continue
+
+        parent = _walk(document, path[:-1], create=True)
+        parent[path[-1]] = copy.deepcopy(value)
+
+    return document
+
+
+def is_delta_key(file_key: str) -> bool:
+    return file_key.removesuffix(ZSTD_EXTENSION).endswith(f".{DELTA_FILE_TYPE}")
+
+
+def _walk(document: Any, path: List[str], create: bool = False) -> Any:
+    node = document
+    for key in path:
+        if create and not isinstance(node.get(key), dict):
+            node[key] = {}
+        node = node.get(key) if isinstance(node, dict) else None
+
+    return node
+
+
+class DeltaSnapshotStore:
+    def __init__(
+        self,
+        settings: Settings,
+        storage_manager: StorageManager,
+        base_interval: Optional[int] = None,
+    ) -> None:
+        self._settings = settings
+        self._storage_manager = storage_manager
+        self._base_interval = base_interval or self._settings.snapshot_base_interval
+
+        self._lock = asyncio.Lock()
+        # Last written version per series (creator directory + raw flag): key, document, chain depth
+        self._heads: Dict[str, Tuple[str, Any, int]] = {}
+
+    async def save(self, file_key: str, document: Any) -> str:
+        match = SNAPSHOT_KEY_PATTERN.match(file_key)
+        if not match:
+            msg = f"File key {file_key} is not a snapshot key"
+            raise ValueError(msg)
+
+        series = f"{file_key.rsplit('/', 1)[0]}/{match['raw'] or ''}"
+        async with self._lock:
+            head = self._heads.get(series) or await self._find_head(file_key=file_key, raw=bool(match["raw"]))
+
+            if head and head[2] + 1 < self._base_interval:
+                parent_key, parent_document, depth = head
+                delta = diff_documents(old=parent_document, new=document)
+                body: Dict[str, Any] = {"parent": parent_key, "depth": depth + 1, **delta}
+                file_key = f"{file_key.removesuffix('.json')}.{DELTA_FILE_TYPE}"
+            else:
+                body, depth = document, -1
+
+            stored_key = await self._storage_manager.aupload_bytes(
+                data=json.dumps(body, ensure_ascii=False, indent=4).encode("utf-8"),
+                file_key=file_key,
+                content_type="application/json",
+            )
+            self._heads[series] = (stored_key, copy.deepcopy(document), depth + 1)
+
+        return stored_key
+
+    async def read(self, file_key: str) -> Any:
+        deltas: List[Dict[str, Any]] = []
+        while is_delta_key(file_key):
+            delta = await self._storage_manager.aread_file(file_key=file_key, file_type="json")
+            deltas.append(delta)
+            file_key = delta["parent"]
+
+        document = await self._storage_manager.aread_file(file_key=file_key, file_type="json")
+        for delta in reversed(deltas):
+            document = apply_delta(document=document, delta=delta)
+
+        return document
+
+    async def _find_head(self, file_key: str, raw: bool) -> Optional[Tuple[str, Any, int]]:
+        head_key = await self._manifest_head(file_key=file_key) or await self._listed_head(file_key=file_key, raw=raw)
+        if not head_key:
+            return None
+
+        depth = 0
+        if is_delta_key(head_key):
+            depth = (await self._storage_manager.aread_file(file_key=head_key, file_type="json")).get("depth", 0)
+
+        return head_key, await self.read(file_key=head_key), depth
+
+    async def _manifest_head(self, file_key: str) -> Optional[str]:
+        manifest = self._storage_manager.manifest
+        ref = parse_snapshot_key(file_key=file_key) if manifest else None
+        if not manifest or not ref:
+            return None
+
+        entry = await manifest.alatest(
+            creator_id=ref.creator_id,
+            platform=ref.platform,
+            action=ref.action,
+            subdir=ref.subdir,
+            kind=ref.kind,
+            layouts=(SNAPSHOT_LAYOUT_FILE, SNAPSHOT_LAYOUT_DELTA),
+        )
+        return entry.key if entry else None
+
+    async def _listed_head(self, file_key: str, raw: bool) -> Optional[str]:
+        # Fallback for series written before the manifest was enabled
+        latest: Optional[Tuple[str, str]] = None
+        async for stored_file in self._storage_manager.alist_files(prefix=f"{file_key.rsplit('/', 1)[0]}/"):
+            match = SNAPSHOT_KEY_PATTERN.match(stored_file.key)
+            if not match or bool(match["raw"]) != raw:
+                continue
+
+            if match["file_type"].removesuffix(ZSTD_EXTENSION) not in ("json", DELTA_FILE_TYPE):
+                continue
+
+            if not latest or match["timestamp"] > latest[0]:
+                latest = (match["timestamp"], stored_file.key)
+
+        return latest[1] if latest else None
@@ -1,27 +1,42 @@
+import hashlib
 import json
 import os
 import shutil
-from typing import Any, List, Optional
+from datetime import datetime, timezone
+from typing import IO, Any, AsyncIterator, Iterator, List, Optional, Union
 
 from loguru import logger
 
 from chronos.core.settings import Settings
-from chronos.infrastructure.storage.base import StorageManager
+from chronos.infrastructure.storage.base import StorageManager, StoredFile
+from chronos.infrastructure.storage.compression import (
+    compress_into,
+    compressed_key,
+    decompress_reader,
+    is_compressed,
+    iter_decompressed,
+    make_compressor,
+)
+from chronos.infrastructure.storage.manifest import ManifestIndex, parse_snapshot_key
 
 
 class LocalStorageManager(StorageManager):
-    def __init__(self, settings: Settings) -> None:
-        self._settings = settings
+    def __init__(self, settings: Settings, manifest: Optional[ManifestIndex] = None) -> None:
+        super().__init__(settings=settings, manifest=manifest)
         os.makedirs(self._settings.local_storage_dir, exist_ok=True)
 
     def read_file(self, file_key: str, file_type: Optional[str] = None) -> Any:
+        file_key = self._resolve_key(file_key=file_key)
         file_path = os.path.join(self._settings.local_storage_dir, file_key)
-        mode = "r" if file_type == "text" else "rb"
 
         try:
-            with open(file=file_path, mode=mode) as file:
-                data = file.read()
-            return json.loads(data) if file_type == "json" else data
+            with open(file=file_path, mode="rb") as file:
+                reader = decompress_reader(file) if is_compressed(file_key=file_key) else file
+                if file_type == "json":
+                    return json.load(reader)
+
+                data = reader.read()
+            return data.decode("utf-8") if file_type == "text" else data
         except (json.JSONDecodeError, TypeError) as e:
             logger.error(f"Error decoding JSON from local storage: {e}")
             return {}
@@ -29,23 +44,121 @@ class LocalStorageManager(StorageManager):
             msg = f"File {file_key} does not exist"
             raise FileNotFoundError(msg)
 
-    def upload_file(self, file_path: str, file_key: str, content_type: str = "application/octet-stream") -> None:
-        dest_path = os.path.join(self._settings.local_storage_dir, file_key)
-        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+    def read_range(self, file_key: str, offset: int, length: int) -> bytes:
+        file_path = os.path.join(self._settings.local_storage_dir, file_key)
+        with open(file_path, "rb") as file:
+            file.seek(offset)
+            return file.read(length)
+
+    def iter_file(self, file_key: str, chunk_size: int = 1024 * 1024) -> Iterator[bytes]:
+        file_key = self._resolve_key(file_key=file_key)
+        file_path = os.path.join(self._settings.local_storage_dir, file_key)
+        with open(file_path, "rb") as file:
+            if is_compressed(file_key=file_key):
+                yield from iter_decompressed(file, chunk_size=chunk_size)
+                return
+
+            while chunk := file.read(chunk_size):
+                yield chunk
+
+    def upload_file(
+        self,
+        file_path: str,
+        file_key: str,
+        content_type: str = "application/octet-stream",
+        compress: Optional[bool] = None,
+    ) -> str:
         try:
-            shutil.copy2(file_path, dest_path)
+            with open(file_path, "rb") as file:
+                return self.upload_bytes(data=file, file_key=file_key, content_type=content_type, compress=compress)
         except FileNotFoundError as e:
             logger.error(f"Error uploading file: {e}")
+            return file_key
+
+    def _write_bytes(
+        self,
+        data: Union[bytes, IO[bytes]],
+        file_key: str,
+        content_type: str,
+        compress: Optional[bool],
+    ) -> str:
+        compress = self._should_compress(file_key=file_key) if compress is None else compress
+        file_key = compressed_key(file_key) if compress else file_key
+
+        dest_path = os.path.join(self._settings.local_storage_dir, file_key)
+        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+        with open(dest_path, "wb") as dest:
+            if compress:
+                compress_into(data=data, dest=dest, level=self._settings.storage_compression_level)
+            elif isinstance(data, bytes):
+                dest.write(data)
+            else:
+                shutil.copyfileobj(data, dest)
+
+        return file_key
+
+    async def aupload_stream(
+        self,
+        stream: AsyncIterator[bytes],
+        file_key: str,
+        content_type: str = "application/octet-stream",
+        compress: Optional[bool] = None,
+    ) -> str:
+        snapshot_ref = parse_snapshot_key(file_key=file_key) if self._manifest else None
+        compress = self._should_compress(file_key=file_key) if compress is None else compress
+        file_key = compressed_key(file_key) if compress else file_key
+        compressor = make_compressor(level=self._settings.storage_compression_level) if compress else None
+        digest, size = hashlib.sha256(), 0
+
+        dest_path = os.path.join(self._settings.local_storage_dir, file_key)
+        await self._run_in_executor(os.makedirs, os.path.dirname(dest_path), exist_ok=True)
+
+        dest = await self._run_in_executor(open, dest_path, "wb")
+        try:
+            async for chunk in stream:
+                digest.update(chunk)
+                size += len(chunk)
+                await self._run_in_executor(dest.write, compressor.compress(chunk) if compressor else chunk)
+
+            if compressor:
+                await self._run_in_executor(dest.write, compressor.flush())
+        finally:
+            await self._run_in_executor(dest.close)
+
+        if snapshot_ref:
+            await self._run_in_executor(
+                self._record_snapshot,
+                snapshot_ref=snapshot_ref,
+                stored_key=file_key,
+                size=size,
+                content_hash=digest.hexdigest(),
+            )
+
+        return file_key
 
     def delete_files(self, file_keys: List[str]) -> None:
+        parent_dirs = set()
         for file_key in file_keys:
+            file_path = os.path.join(self._settings.local_storage_dir, file_key)
             try:
-                os.remove(os.path.join(self._settings.local_storage_dir, file_key))
+                os.remove(file_path)
+                parent_dirs.add(os.path.dirname(file_path))
             except FileNotFoundError:
                 logger.warning(f"File {file_key} does not exist")
             except OSError as e:
                 logger.error(f"Error deleting file {file_key}: {e}")
 
+        # Drop directories left empty so walks over the tree don't slow down as creators churn
+        root_dir = os.path.abspath(self._settings.local_storage_dir)
+        for parent_dir in sorted(parent_dirs, key=len, reverse=True):
+            parent_dir = os.path.abspath(parent_dir)
+            while parent_dir.startswith(root_dir + os.sep):
+                try:
+                    os.rmdir(parent_dir)
+                except OSError:
+                    break
+                parent_dir = os.path.dirname(parent_dir)
+
     def get_file_size(self, file_key: str) -> int:
         file_path = os.path.join(self._settings.local_storage_dir, file_key)
         try:
@@ -53,3 +166,34 @@ class LocalStorageManager(StorageManager):
         except FileNotFoundError:
             logger.error(f"File {file_key} not found")
             return 0
+
+    def file_exists(self, file_key: str) -> bool:
+        return os.path.exists(os.path.join(self._settings.local_storage_dir, self._resolve_key(file_key=file_key)))
+
+    def list_files(self, prefix: str = "") -> Iterator[StoredFile]:
+        root_dir = os.path.join(self._settings.local_storage_dir, prefix)
+        for root, dirnames, filenames in os.walk(root_dir):
+            # Skip internal staging directories such as `.segments`
+            dirnames[:] = sorted(dirname for dirname in dirnames if not dirname.startswith("."))
+            for filename in sorted(filenames):
+                file_path = os.path.join(root, filename)
+                try:
+                    stat = os.stat(file_path)
+                except FileNotFoundError:
+                    continue
+
+                yield StoredFile(
+                    key=os.path.relpath(file_path, self._settings.local_storage_dir).replace(os.sep, "/"),
+                    size=stat.st_size,
+                    last_modified=datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc),
+                )
+
+    def _resolve_key(self, file_key: str) -> str:
+        # Callers may keep using the plain key for artifacts that were stored compressed
+        if is_compressed(file_key=file_key) or os.path.exists(os.path.join(self._settings.local_storage_dir, file_key)):
+            return file_key
+
+        if os.path.exists(os.path.join(self._settings.local_storage_dir, compressed_key(file_key))):
+            return compressed_key(file_key)
+
+        return file_key
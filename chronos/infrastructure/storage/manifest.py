@@ -0,0 +1,299 @@
+import asyncio
+import hashlib
+import json
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import IO, Collection, Dict, List, Optional, Tuple, Union
+
+from redis import Redis
+
+from chronos.core.settings import Settings
+from chronos.infrastructure.storage.compression import ZSTD_EXTENSION
+from chronos.utils.constants import SNAPSHOT_KEY_PATTERN
+
+SNAPSHOT_KIND_RAW = "raw"
+SNAPSHOT_KIND_EXTRACTED = "extracted"
+
+SNAPSHOT_LAYOUT_FILE = "file"
+SNAPSHOT_LAYOUT_DELTA = "delta"
+SNAPSHOT_LAYOUT_REF = "ref"
+SNAPSHOT_LAYOUT_SEGMENT = "segment"
+
+_LAYOUTS_BY_FILE_TYPE = {
+    "json": SNAPSHOT_LAYOUT_FILE,
+    "delta.json": SNAPSHOT_LAYOUT_DELTA,
+    "ref.json": SNAPSHOT_LAYOUT_REF,
+}
+_PAGE_SIZE = 100
+
+
+@dataclass(frozen=True)
+class SnapshotRef:
+    creator_id: str
+    platform: str
+    action: str
+    subdir: str
+    kind: str
+    layout: str
+
+
+@dataclass(frozen=True)
+class ManifestEntry:
+    creator_id: str
+    platform: str
+    action: str
+    subdir: str
+    kind: str
+    layout: str
+    key: str
+    size: int
+    content_hash: str
+    created_at: datetime
+    # Byte range of the record when the snapshot lives inside a segment object
+    offset: Optional[int] = None
+    length: Optional[int] = None
+
+    @property
+    def entry_id(self) -> str:
+        return self.key if self.offset is None else f"{self.key}#{self.offset}"
+
+
+def parse_snapshot_key(file_key: str, layout: Optional[str] = None) -> Optional[SnapshotRef]:
+    match = SNAPSHOT_KEY_PATTERN.match(file_key)
+    if not match:
+        return None
+
+    layout = layout or _LAYOUTS_BY_FILE_TYPE.get(match["file_type"].removesuffix(ZSTD_EXTENSION))
+    if not layout:
+        return None
+
+    return SnapshotRef(
+        creator_id=match["identifier"].lower(),
+        platform=match["platform"].lower(),
+        action=match["action"].lower(),
+        subdir=match["subdir"].lower(),
+        kind=SNAPSHOT_KIND_RAW if match["raw"] else SNAPSHOT_KIND_EXTRACTED,
+        layout=layout,
+    )
+
+
+def make_entry(
+    ref: SnapshotRef,
+    key: str,
+    size: int,
+    content_hash: str,
+    offset: Optional[int] = None,
+    length: Optional[int] = None,
+) -> ManifestEntry:
+    return ManifestEntry(
+        creator_id=ref.creator_id,
+        platform=ref.platform,
+        action=ref.action,
+        subdir=ref.subdir,
+        kind=ref.kind,
+        layout=ref.layout,
+        key=key,
+        size=size,
+        content_hash=content_hash,
+        created_at=datetime.now(tz=timezone.utc),
+        offset=offset,
+        length=length,
+    )
+
+
+def fingerprint(data: Union[bytes, IO[bytes]], chunk_size: int = 1024 * 1024) -> Tuple[int, str]:
+    if isinstance(data, bytes):
+        return len(data), hashlib.sha256(data).hexdigest()
+
+    # Streams are rewound so the backend still uploads the full payload
+    position = data.tell()
+    digest, size = hashlib.sha256(), 0
+    while chunk := data.read(chunk_size):
+        digest.update(chunk)
+        size += len(chunk)
+    data.seek(position)
+
+    return size, digest.hexdigest()
+
+
+class ManifestIndex:
+    """
+    Index of every stored snapshot version (plain files, deltas, blob refs and segment records) kept in Redis,
+    so all nodes see the same history and lookups don't need prefix listings.
+
+    Entries live in one hash keyed by entry id, with a time-ordered set per creator series and one global
+    timeline. Methods are synchronous because storage managers record from their executor threads.
+    """
+
+    def __init__(self, settings: Settings, redis: Optional[Redis] = None) -> None:
+        self._prefix = settings.manifest_prefix
+        self._redis = redis or Redis.from_url(settings.redis_url, decode_responses=True)
+
+    def record(
+        self,
+        ref: SnapshotRef,
+        key: str,
+        size: int,
+        content_hash: str,
+        offset: Optional[int] = None,
+        length: Optional[int] = None,
+    ) -> ManifestEntry:
+        entry = make_entry(ref=ref, key=key, size=size, content_hash=content_hash, offset=offset, length=length)
+        self.record_many(entries=[entry])
+        return entry
+
+    def record_many(self, entries: List[ManifestEntry]) -> None:
+        # Re-recording an entry id overwrites it, so retried uploads don't duplicate history
+        pipe = self._redis.pipeline(transaction=True)
+        for entry in entries:
+            score = entry.created_at.timestamp()
+            pipe.hset(self._entries_key, entry.entry_id, _dump_entry(entry))
+            pipe.zadd(
+                self._series_key(entry.platform, entry.action, entry.subdir, entry.creator_id, entry.kind),
+                {entry.entry_id: score},
+            )
+            pipe.zadd(self._timeline_key, {entry.entry_id: score})
+            pipe.zadd(self._members_key, {entry.entry_id: 0})
+        pipe.execute()
+
+    def latest(
+        self,
+        creator_id: str,
+        platform: str,
+        action: str,
+        subdir: str,
+        kind: str = SNAPSHOT_KIND_EXTRACTED,
+        layouts: Optional[Collection[str]] = None,
+    ) -> Optional[ManifestEntry]:
+        series_key = self._series_key(platform, action, subdir, creator_id, kind)
+        start = 0
+        while entry_ids := self._redis.zrevrange(series_key, start, start + _PAGE_SIZE - 1):
+            for entry in self._load(entry_ids):
+                if not layouts or entry.layout in layouts:
+                    return entry
+            start += _PAGE_SIZE
+
+        return None
+
+    def history(
+        self,
+        creator_id: str,
+        platform: str,
+        action: str,
+        subdir: str,
+        kind: str = SNAPSHOT_KIND_EXTRACTED,
+    ) -> List[ManifestEntry]:
+        return self._load(self._redis.zrange(self._series_key(platform, action, subdir, creator_id, kind), 0, -1))
+
+    def between(
+        self,
+        start: datetime,
+        end: datetime,
+        platform: Optional[str] = None,
+        action: Optional[str] = None,
+        kind: Optional[str] = None,
+    ) -> List[ManifestEntry]:
+        entry_ids = self._redis.zrangebyscore(self._timeline_key, _to_timestamp(start), f"({_to_timestamp(end)}")
+        return [
+            entry
+            for entry in self._load(entry_ids)
+            if (not platform or entry.platform == platform.lower())
+            and (not action or entry.action == action.lower())
+            and (not kind or entry.kind == kind)
+        ]
+
+    def creators_between(
+        self,
+        start: datetime,
+        end: datetime,
+        platform: Optional[str] = None,
+        action: Optional[str] = None,
+    ) -> List[str]:
+        entries = self.between(start=start, end=end, platform=platform, action=action)
+        return list(dict.fromkeys(entry.creator_id for entry in entries))
+
+    def forget(self, keys: List[str]) -> None:
+        entry_ids = set(keys)
+        for key in keys:
+            # Segment records are indexed as "<segment key>#<offset>"
+            entry_ids.update(self._redis.zrangebylex(self._members_key, f"[{key}#", f"[{key}#\xff"))
+
+        entries = self._load(list(entry_ids))
+        pipe = self._redis.pipeline(transaction=True)
+        for entry in entries:
+            pipe.zrem(
+                self._series_key(entry.platform, entry.action, entry.subdir, entry.creator_id, entry.kind),
+                entry.entry_id,
+            )
+        if entry_ids:
+            pipe.hdel(self._entries_key, *entry_ids)
+            pipe.zrem(self._timeline_key, *entry_ids)
+            pipe.zrem(self._members_key, *entry_ids)
+        pipe.execute()
+
+    async def alatest(
+        self,
+        creator_id: str,
+        platform: str,
+        action: str,
+        subdir: str,
+        kind: str = SNAPSHOT_KIND_EXTRACTED,
+        layouts: Optional[Collection[str]] = None,
+    ) -> Optional[ManifestEntry]:
+        return await asyncio.to_thread(
+            self.latest,
+            creator_id=creator_id,
+            platform=platform,
+            action=action,
+            subdir=subdir,
+            kind=kind,
+            layouts=layouts,
+        )
+
+    async def abetween(
+        self,
+        start: datetime,
+        end: datetime,
+        platform: Optional[str] = None,
+        action: Optional[str] = None,
+        kind: Optional[str] = None,
+    ) -> List[ManifestEntry]:
+        return await asyncio.to_thread(self.between, start=start, end=end, platform=platform, action=action, kind=kind)
+
+    def close(self) -> None:
+        self._redis.close()
+
+    @property
+    def _entries_key(self) -> str:
+        return f"{self._prefix}:entries"
+
+    @property
+    def _timeline_key(self) -> str:
+        return f"{self._prefix}:timeline"
+
+    @property
+    def _members_key(self) -> str:
+        return f"{self._prefix}:members"
+
+    def _series_key(self, platform: str, action: str, subdir: str, creator_id: str, kind: str) -> str:
+        return f"{self._prefix}:series:{platform.lower()}/{action.lower()}/{subdir.lower()}/{creator_id.lower()}:{kind}"
+
+    def _load(self, entry_ids: List[str]) -> List[ManifestEntry]:
+        if not entry_ids:
+            return []
+
+        # Ids removed concurrently by retention come back empty and are skipped
+        return [_load_entry(raw) for raw in self._redis.hmget(self._entries_key, entry_ids) if raw]
+
+
+def _dump_entry(entry: ManifestEntry) -> str:
+    return json.dumps({**asdict(entry), "created_at": entry.created_at.timestamp()})
+
+
+def _load_entry(raw: str) -> ManifestEntry:
+    data: Dict = json.loads(raw)
+    return ManifestEntry(**{**data, "created_at": datetime.fromtimestamp(data["created_at"], tz=timezone.utc)})
+
+
+def _to_timestamp(value: datetime) -> float:
+    return (value if value.tzinfo else value.replace(tzinfo=timezone.utc)).timestamp()
@@ -0,0 +1,279 @@
+import asyncio
+import io
+import json
+import os
+import struct
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from loguru import logger
+
+from chronos.core.settings import Settings
+from chronos.infrastructure.storage.base import StorageManager
+from chronos.utils.constants import SNAPSHOT_TIMESTAMP_FORMAT
+from chronos.utils.helpers import flatten_keys
+
+PARQUET_TYPES = {
+    "bool": pa.bool_(),
+    "int64": pa.int64(),
+    "float64": pa.float64(),
+    "string": pa.string(),
+}
+_COLUMN_TYPES = {str(parquet_type): column_type for column_type, parquet_type in PARQUET_TYPES.items()}
+
+PARQUET_EXTENSION = ".parquet"
+SCHEMA_FILE = "_schema.json"
+PARQUET_MAGIC = b"PAR1"
+
+
+def infer_column_type(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, int):
+        return "int64"
+    if isinstance(value, float):
+        return "float64"
+
+    return "string"
+
+
+def coerce_value(value: Any, column_type: str) -> Any:
+    if value is None:
+        return None
+
+    match column_type:
+        case "string":
+            return value if isinstance(value, str) else json.dumps(value, ensure_ascii=False, default=str)
+        case "bool":
+            return value if isinstance(value, bool) else None
+        case "int64":
+            if isinstance(value, bool):
+                return None
+            if isinstance(value, int):
+                return value
+            return int(value) if isinstance(value, float) and value.is_integer() else None
+        case "float64":
+            return float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+    return None
+
+
+def merge_column_types(left: str, right: str) -> str:
+    if left == right:
+        return left
+    if {left, right} == {"int64", "float64"}:
+        return "float64"
+
+    # Any other conflict can only be represented as text, which is how `coerce_value` stores it
+    return "string"
+
+
+def unify_columns(schemas: List[List[Tuple[str, str]]]) -> List[Tuple[str, str]]:
+    merged: Dict[str, str] = {}
+    for columns in schemas:
+        for name, column_type in columns:
+            merged[name] = merge_column_types(merged[name], column_type) if name in merged else column_type
+
+    return list(merged.items())
+
+
+class _PartitionWriter:
+    def __init__(self, partition_key: str, columns: List[Tuple[str, str]]) -> None:
+        self.partition_key = partition_key
+        self.columns = list(columns)
+        self.rows: List[Dict[str, Any]] = []
+        self.rows_written = 0
+        self.opened_at = time.monotonic()
+
+        self._schema = pa.schema([(name, PARQUET_TYPES[column_type]) for name, column_type in self.columns])
+        fd, self.file_path = tempfile.mkstemp(suffix=".parquet")
+        os.close(fd)
+        self._writer = pq.ParquetWriter(where=self.file_path, schema=self._schema, compression="zstd")
+
+    def write_row_group(self) -> None:
+        if not self.rows:
+            return
+
+        arrays: List[pa.Array] = []
+        dropped: Counter[str] = Counter()
+        for name, column_type in self.columns:
+            values = []
+            for row in self.rows:
+                value = coerce_value(row.get(name), column_type)
+                if value is None and row.get(name) is not None:
+                    dropped[name] += 1
+                values.append(value)
+            arrays.append(pa.array(values, type=PARQUET_TYPES[column_type]))
+
+        # Columns never narrow back, so a value of another type can't be stored and would otherwise vanish silently
+        for name, count in dropped.items():
+            logger.warning(f"⚠️ Dropped {count} values of `{name}` that don't fit its column in `{self.partition_key}`")
+
+        self._writer.write_table(pa.Table.from_arrays(arrays, schema=self._schema))
+        self.rows_written += len(self.rows)
+        self.rows = []
+
+    def close(self) -> None:
+        self.write_row_group()
+        self._writer.close()
+
+
+class ParquetSink:
+    def __init__(
+        self,
+        settings: Settings,
+        storage_manager: StorageManager,
+        prefix: str = "exports/parquet",
+        row_group_size: Optional[int] = None,
+        max_rows_per_file: Optional[int] = None,
+    ) -> None:
+        self._settings = settings
+        self._storage_manager = storage_manager
+        self._prefix = prefix.strip("/")
+        self._row_group_size = row_group_size or self._settings.parquet_row_group_size
+        self._max_rows_per_file = max_rows_per_file or self._settings.parquet_max_rows_per_file
+        self._max_file_age = self._settings.parquet_max_file_age
+
+        self._lock = asyncio.Lock()
+        self._schemas: Dict[str, List[Tuple[str, str]]] = {}
+        self._writers: Dict[str, _PartitionWriter] = {}
+
+    async def add(
+        self,
+        platform: str,
+        action: str,
+        record: Dict[str, Any],
+        crawled_at: Optional[datetime] = None,
+    ) -> None:
+        crawled_at = crawled_at or datetime.now()
+        row = {"crawled_at": crawled_at.isoformat(), **flatten_keys(obj=record)}
+
+        dataset_key = f"{self._prefix}/platform={platform.lower()}/action={action.lower()}"
+        partition_key = f"{dataset_key}/date={crawled_at.strftime('%Y-%m-%d')}"
+
+        async with self._lock:
+            columns = await self._get_schema(dataset_key=dataset_key)
+            known_columns = {name for name, _ in columns}
+            new_columns = [
+                (name, column_type)
+                for name, value in row.items()
+                if name not in known_columns and (column_type := infer_column_type(value))
+            ]
+
+            # Columns are only ever appended or widened (int64 -> float64), so earlier files stay compatible
+            widened_columns = {
+                name
+                for name, column_type in columns
+                if column_type == "int64" and isinstance(row.get(name), float) and not row[name].is_integer()
+            }
+            # Only this sink's view changes: every file carries its own schema, unified at export
+            if new_columns or widened_columns:
+                columns[:] = [
+                    (name, "float64" if name in widened_columns else column_type) for name, column_type in columns
+                ]
+                columns.extend(new_columns)
+
+            writer = self._writers.get(partition_key)
+            if writer and writer.columns != columns:
+                await self._finish(writer=writer)
+                writer = None
+
+            if not writer:
+                writer = _PartitionWriter(partition_key=partition_key, columns=columns)
+                self._writers[partition_key] = writer
+
+            writer.rows.append(row)
+            if len(writer.rows) >= self._row_group_size:
+                await asyncio.to_thread(writer.write_row_group)
+
+            if writer.rows_written + len(writer.rows) >= self._max_rows_per_file:
+                await self._finish(writer=writer)
+
+            # Files are also rolled by age, so slow crawls and past date partitions still reach storage
+            for writer in list(self._writers.values()):
+                if time.monotonic() - writer.opened_at >= self._max_file_age:
+                    await self._finish(writer=writer)
+
+    async def close(self) -> None:
+        async with self._lock:
+            for writer in list(self._writers.values()):
+                await self._finish(writer=writer)
+
+    async def unify_schema(self, platform: str, action: str) -> List[Tuple[str, str]]:
+        dataset_key = f"{self._prefix}/platform={platform.lower()}/action={action.lower()}"
+        schemas = [
+            await self._read_file_columns(file_key=stored_file.key)
+            async for stored_file in self._storage_manager.alist_files(prefix=f"{dataset_key}/")
+            if stored_file.key.endswith(PARQUET_EXTENSION)
+        ]
+        columns = unify_columns(schemas=schemas)
+
+        # Derived from the files alone, so concurrent exports of the same dataset write the same result
+        schema = {"columns": [{"name": name, "type": column_type} for name, column_type in columns]}
+        await self._storage_manager.aupload_bytes(
+            data=json.dumps(schema, indent=4).encode("utf-8"),
+            file_key=f"{dataset_key}/{SCHEMA_FILE}",
+            content_type="application/json",
+        )
+        logger.info(f"📊 Unified the schema of {len(schemas)} files under `{dataset_key}`")
+
+        async with self._lock:
+            self._schemas[dataset_key] = list(columns)
+        return columns
+
+    async def _read_file_columns(self, file_key: str) -> List[Tuple[str, str]]:
+        # Only the footer is fetched: its length and the magic bytes close the file
+        size = await self._storage_manager.aget_file_size(file_key=file_key)
+        tail = await self._storage_manager.aread_range(file_key=file_key, offset=size - 8, length=8)
+        footer_length = struct.unpack("<I", tail[:4])[0]
+        footer = await self._storage_manager.aread_range(
+            file_key=file_key,
+            offset=size - footer_length - 8,
+            length=footer_length + 8,
+        )
+
+        schema = pq.read_schema(io.BytesIO(PARQUET_MAGIC + footer))
+        return [(field.name, _COLUMN_TYPES.get(str(field.type), "string")) for field in schema]
+
+    async def _finish(self, writer: _PartitionWriter) -> None:
+        self._writers.pop(writer.partition_key, None)
+        try:
+            await asyncio.to_thread(writer.close)
+            timestamp_str = datetime.now().strftime(SNAPSHOT_TIMESTAMP_FORMAT)
+            file_key = f"{writer.partition_key}/part-{timestamp_str}-{uuid4().hex[:8]}{PARQUET_EXTENSION}"
+            await self._storage_manager.aupload_file(
+                file_path=writer.file_path,
+                file_key=file_key,
+                content_type="application/vnd.apache.parquet",
+                compress=False,  # Parquet pages are already zstd-compressed
+            )
+            logger.info(f"📊 Exported {writer.rows_written} rows to `{file_key}`")
+
+        except Exception as e:
+            logger.error(f"🛑 Failed to export parquet partition `{writer.partition_key}`: {e}")
+
+        finally:
+            if os.path.exists(writer.file_path):
+                os.remove(writer.file_path)
+
+    async def _get_schema(self, dataset_key: str) -> List[Tuple[str, str]]:
+        if dataset_key not in self._schemas:
+            try:
+                # Seeded from the last export's unified schema, so new files start with its column types
+                schema_key = f"{dataset_key}/{SCHEMA_FILE}"
+                schema = await self._storage_manager.aread_file(file_key=schema_key, file_type="json")
+            except FileNotFoundError:
+                schema = None
+
+            columns = (schema or {}).get("columns", []) if isinstance(schema, dict) else []
+            self._schemas[dataset_key] = [(column["name"], column["type"]) for column in columns]
+
+        return self._schemas[dataset_key]
@@ -0,0 +1,364 @@
+import asyncio
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import socket
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import IO, Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+from uuid import uuid4
+
+from loguru import logger
+
+from chronos.core.settings import Settings
+from chronos.infrastructure.storage.base import StorageManager
+from chronos.infrastructure.storage.manifest import (
+    SNAPSHOT_LAYOUT_SEGMENT,
+    ManifestEntry,
+    ManifestIndex,
+    make_entry,
+    parse_snapshot_key,
+)
+
+SEGMENT_EXTENSION = ".jsonl"
+INDEX_EXTENSION = ".idx.jsonl"
+LOCK_EXTENSION = ".lock"
+SEGMENT_CONTENT_TYPE = "application/x-ndjson"
+
+
+@dataclass(frozen=True)
+class SegmentPointer:
+    segment_key: str
+    offset: int
+    length: int
+
+
+class SegmentStore:
+    def __init__(
+        self,
+        settings: Settings,
+        storage_manager: StorageManager,
+        prefix: str,
+        max_bytes: Optional[int] = None,
+        max_age: Optional[int] = None,
+    ) -> None:
+        self._settings = settings
+        self._storage_manager = storage_manager
+        self._prefix = prefix.strip("/")
+        self._max_bytes = max_bytes or self._settings.segment_max_bytes
+        self._max_age = max_age or self._settings.segment_max_age
+
+        # Every store stages into its own owner dir, guarded by a flock held for the store's lifetime,
+        # so only segments whose owner is gone are ever recovered
+        self._staging_root = os.path.join(
+            self._settings.local_storage_dir,
+            ".segments",
+            socket.gethostname(),
+            self._prefix,
+        )
+        self._staging_dir = os.path.join(self._staging_root, f"{os.getpid()}-{uuid4().hex[:8]}")
+        self._owner_locks: Dict[str, int] = {}
+
+        self._lock = asyncio.Lock()
+        self._recovered = False
+        self._segment_name: Optional[str] = None
+        self._segment_file: Optional[IO[bytes]] = None
+        self._index_file: Optional[IO[bytes]] = None
+        self._segment_size = 0
+        self._opened_at = 0.0
+
+        # Sealed segments whose upload failed, as (staging dir, segment name)
+        self._failed_uploads: Set[Tuple[str, str]] = set()
+        self._retry_at = 0.0
+
+        self._flush_task: Optional[asyncio.Task] = None
+        self._stopped = asyncio.Event()
+
+    async def append(self, record_key: str, record: Dict[str, Any]) -> SegmentPointer:
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+
+        async with self._lock:
+            if not self._recovered:
+                await self._recover()
+
+            if not self._flush_task:
+                self._stopped.clear()
+                self._flush_task = asyncio.create_task(self._flush_forever())
+
+            if self._failed_uploads and time.monotonic() >= self._retry_at:
+                await self._retry_uploads()
+
+            if self._segment_name and self._should_rotate():
+                await self._seal()
+
+            if not self._segment_name:
+                await asyncio.to_thread(self._open)
+
+            offset = self._segment_size
+            index_entry = {"key": record_key, "offset": offset, "length": len(line)}
+            await asyncio.to_thread(self._write, line, json.dumps(index_entry).encode("utf-8") + b"\n")
+            self._segment_size += len(line)
+
+            assert self._segment_name
+            return SegmentPointer(segment_key=self._segment_key(self._segment_name), offset=offset, length=len(line))
+
+    async def rotate(self) -> None:
+        async with self._lock:
+            if self._segment_name:
+                await self._seal()
+
+    async def close(self) -> None:
+        # The flush loop is stopped rather than cancelled, so an upload it is running always completes
+        if self._flush_task:
+            self._stopped.set()
+            await self._flush_task
+            self._flush_task = None
+
+        async with self._lock:
+            if self._segment_name:
+                await self._seal()
+
+            if self._failed_uploads:
+                await self._retry_uploads()
+
+            # Owner dirs still holding failed uploads are left on disk for the next recovery
+            for staging_dir in list(self._owner_locks):
+                self._release_owner(staging_dir=staging_dir, remove=not self._has_failed_uploads(staging_dir))
+            self._recovered = False
+
+    async def _flush_forever(self) -> None:
+        # Age rotation and upload retries otherwise only happen on append, which an idle crawler never calls
+        interval = min(self._max_age, self._settings.segment_upload_retry_interval)
+        while not self._stopped.is_set():
+            try:
+                await asyncio.wait_for(self._stopped.wait(), timeout=interval)
+                return
+            except asyncio.TimeoutError:
+                pass
+
+            try:
+                async with self._lock:
+                    if self._segment_name and self._should_rotate():
+                        await self._seal()
+
+                    if self._failed_uploads and time.monotonic() >= self._retry_at:
+                        await self._retry_uploads()
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to flush segments of `{self._prefix}`: {e}")
+
+    async def iter_segment(self, segment_key: str) -> AsyncIterator[Dict[str, Any]]:
+        async for line in self._iter_lines(file_key=segment_key):
+            yield json.loads(line)
+
+    async def read_index(self, segment_key: str) -> List[Dict[str, Any]]:
+        return [json.loads(line) async for line in self._iter_lines(file_key=self._index_key(segment_key))]
+
+    async def read_record(self, pointer: SegmentPointer) -> Dict[str, Any]:
+        data = await self._storage_manager.aread_range(
+            file_key=pointer.segment_key,
+            offset=pointer.offset,
+            length=pointer.length,
+        )
+        return json.loads(data)
+
+    async def _iter_lines(self, file_key: str) -> AsyncIterator[bytes]:
+        buffer = b""
+        async for chunk in self._storage_manager.aiter_file(file_key=file_key):
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if line:
+                    yield line
+
+        if buffer.strip():
+            yield buffer
+
+    def _should_rotate(self) -> bool:
+        return self._segment_size >= self._max_bytes or time.monotonic() - self._opened_at >= self._max_age
+
+    def _open(self) -> None:
+        now = datetime.now()
+        self._segment_name = f"{now.strftime('%Y%m%d')}/{now.strftime('%y%m%d_%H%M%S')}_{uuid4().hex[:8]}"
+
+        segment_path = self._staging_path(self._staging_dir, self._segment_name, SEGMENT_EXTENSION)
+        os.makedirs(os.path.dirname(segment_path), exist_ok=True)
+
+        self._segment_file = open(segment_path, "ab")
+        self._index_file = open(self._staging_path(self._staging_dir, self._segment_name, INDEX_EXTENSION), "ab")
+        self._segment_size = 0
+        self._opened_at = time.monotonic()
+        logger.debug(f"🗂️ Opened segment `{self._segment_key(self._segment_name)}`")
+
+    def _write(self, line: bytes, index_line: bytes) -> None:
+        assert self._segment_file and self._index_file
+        self._segment_file.write(line)
+        self._segment_file.flush()
+        self._index_file.write(index_line)
+        self._index_file.flush()
+
+    async def _seal(self) -> None:
+        assert self._segment_name and self._segment_file and self._index_file
+        self._segment_file.close()
+        self._index_file.close()
+
+        segment_name = self._segment_name
+        self._segment_name, self._segment_file, self._index_file = None, None, None
+        self._segment_size = 0
+
+        await self._upload(staging_dir=self._staging_dir, segment_name=segment_name)
+
+    async def _upload(self, staging_dir: str, segment_name: str) -> bool:
+        segment_path = self._staging_path(staging_dir, segment_name, SEGMENT_EXTENSION)
+        index_path = self._staging_path(staging_dir, segment_name, INDEX_EXTENSION)
+        segment_key = self._segment_key(segment_name)
+
+        try:
+            # The index goes last, so a visible index always points into a complete segment
+            await self._storage_manager.aupload_file(
+                file_path=segment_path,
+                file_key=segment_key,
+                content_type=SEGMENT_CONTENT_TYPE,
+                compress=False,  # Records are addressed by byte offset
+            )
+            if os.path.exists(index_path):
+                await self._storage_manager.aupload_file(
+                    file_path=index_path,
+                    file_key=self._index_key(segment_key),
+                    content_type=SEGMENT_CONTENT_TYPE,
+                    compress=False,
+                )
+
+            # Recording is idempotent per record, so a failure here just retries the whole upload
+            manifest = self._storage_manager.manifest
+            if manifest and os.path.exists(index_path):
+                await asyncio.to_thread(self._record_manifest, manifest, segment_path, index_path, segment_key)
+
+        except Exception as e:
+            logger.error(f"🛑 Failed to upload segment `{segment_key}`, it will be retried: {e}")
+            self._failed_uploads.add((staging_dir, segment_name))
+            self._retry_at = time.monotonic() + self._settings.segment_upload_retry_interval
+            return False
+
+        self._failed_uploads.discard((staging_dir, segment_name))
+        for path in (segment_path, index_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+        logger.info(f"📦 Sealed segment `{segment_key}`")
+        return True
+
+    async def _retry_uploads(self) -> None:
+        for staging_dir, segment_name in sorted(self._failed_uploads):
+            if not await self._upload(staging_dir=staging_dir, segment_name=segment_name):
+                break
+
+        # Adopted owner dirs are released once all of their segments made it to storage
+        for staging_dir in list(self._owner_locks):
+            if staging_dir != self._staging_dir and not self._has_failed_uploads(staging_dir):
+                self._release_owner(staging_dir=staging_dir, remove=True)
+
+    def _has_failed_uploads(self, staging_dir: str) -> bool:
+        return any(failed_dir == staging_dir for failed_dir, _ in self._failed_uploads)
+
+    async def _recover(self) -> None:
+        # Segments left behind by dead stores on this host are sealed as-is, live owners keep their flock
+        self._recovered = True
+        os.makedirs(self._staging_root, exist_ok=True)
+        self._acquire_owner(staging_dir=self._staging_dir)
+
+        for entry in os.scandir(self._staging_root):
+            if not entry.is_dir() or entry.path == self._staging_dir:
+                continue
+            if not self._acquire_owner(staging_dir=entry.path):
+                continue
+
+            uploaded = True
+            for segment_name in self._list_segments(staging_dir=entry.path):
+                logger.warning(f"⚠️ Recovering unsealed segment `{segment_name}`")
+                for extension in (SEGMENT_EXTENSION, INDEX_EXTENSION):
+                    staged_path = self._staging_path(entry.path, segment_name, extension)
+                    if os.path.exists(staged_path):
+                        await asyncio.to_thread(self._truncate_partial_record, staged_path)
+                uploaded = await self._upload(staging_dir=entry.path, segment_name=segment_name) and uploaded
+
+            if uploaded:
+                self._release_owner(staging_dir=entry.path, remove=True)
+
+    def _acquire_owner(self, staging_dir: str) -> bool:
+        fd = os.open(f"{staging_dir}{LOCK_EXTENSION}", os.O_CREAT | os.O_RDWR)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+
+        self._owner_locks[staging_dir] = fd
+        return True
+
+    def _release_owner(self, staging_dir: str, remove: bool = False) -> None:
+        fd = self._owner_locks.pop(staging_dir)
+        if remove:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            os.remove(f"{staging_dir}{LOCK_EXTENSION}")
+        os.close(fd)
+
+    @staticmethod
+    def _list_segments(staging_dir: str) -> List[str]:
+        segment_names = []
+        for root, _, filenames in os.walk(staging_dir):
+            for filename in filenames:
+                if filename.endswith(SEGMENT_EXTENSION) and not filename.endswith(INDEX_EXTENSION):
+                    segment_path = os.path.join(root, filename)
+                    segment_names.append(os.path.relpath(segment_path, staging_dir)[: -len(SEGMENT_EXTENSION)])
+        return sorted(segment_names)
+
+    @staticmethod
+    def _record_manifest(manifest: ManifestIndex, segment_path: str, index_path: str, segment_key: str) -> None:
+        entries: List[ManifestEntry] = []
+        with open(segment_path, "rb") as segment_file, open(index_path, "rb") as index_file:
+            for index_line in index_file:
+                if not index_line.endswith(b"\n"):
+                    break
+
+                index_entry = json.loads(index_line)
+                ref = parse_snapshot_key(file_key=index_entry["key"], layout=SNAPSHOT_LAYOUT_SEGMENT)
+                if not ref:
+                    continue
+
+                segment_file.seek(index_entry["offset"])
+                record = segment_file.read(index_entry["length"])
+                entries.append(
+                    make_entry(
+                        ref=ref,
+                        key=segment_key,
+                        size=len(record),
+                        content_hash=hashlib.sha256(record).hexdigest(),
+                        offset=index_entry["offset"],
+                        length=index_entry["length"],
+                    )
+                )
+
+        if entries:
+            manifest.record_many(entries=entries)
+
+    @staticmethod
+    def _truncate_partial_record(path: str) -> None:
+        # Drops a line cut short by a crash, from either the segment or its index
+        with open(path, "rb+") as staged_file:
+            data = staged_file.read()
+            if data and not data.endswith(b"\n"):
+                staged_file.truncate(data.rfind(b"\n") + 1)
+
+    @staticmethod
+    def _staging_path(staging_dir: str, segment_name: str, extension: str) -> str:
+        return os.path.join(staging_dir, f"{segment_name}{extension}")
+
+    def _segment_key(self, segment_name: str) -> str:
+        return f"{self._prefix}/segments/{segment_name}{SEGMENT_EXTENSION}"
+
+    @staticmethod
+    def _index_key(segment_key: str) -> str:
+        return f"{segment_key.removesuffix(SEGMENT_EXTENSION)}{INDEX_EXTENSION}"
@@ -0,0 +1,372 @@
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, Any, Iterator, List, Optional, Set, Tuple, Union
+
+from loguru import logger
+from mypy_boto3_s3 import S3Client
+
+from chronos.core.settings import Settings
+from chronos.infrastructure.storage.aws_s3 import S3StorageManager
+from chronos.infrastructure.storage.base import StorageManager, StoredFile
+from chronos.infrastructure.storage.compression import compressed_key
+from chronos.infrastructure.storage.local import LocalStorageManager
+from chronos.infrastructure.storage.manifest import ManifestIndex
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    content_type TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    uploaded INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    generation INTEGER NOT NULL DEFAULT 0,
+    dead INTEGER NOT NULL DEFAULT 0,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_entries_pending ON entries (uploaded, last_access);
+"""
+
+# Entries that ran out of upload attempts are moved here, outside the bounded cache, until they go up
+DEAD_LETTER_DIR = ".dead"
+
+
+class _CacheJournal:
+    """Durable record of cached keys and whether they have reached the remote tier yet."""
+
+    def __init__(self, db_path: str) -> None:
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(entries)")}
+        if "generation" not in columns:
+            self._conn.execute("ALTER TABLE entries ADD COLUMN generation INTEGER NOT NULL DEFAULT 0")
+        if "dead" not in columns:
+            self._conn.execute("ALTER TABLE entries ADD COLUMN dead INTEGER NOT NULL DEFAULT 0")
+
+        # Uploads that gave up in a previous run, dead letters included, get a fresh set of attempts
+        self._conn.execute("UPDATE entries SET attempts = 0 WHERE uploaded = 0")
+
+    def add(self, key: str, content_type: str, size: int) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO entries (key, content_type, size, uploaded, attempts, generation, last_access) "
+                "VALUES (?, ?, ?, 0, 0, 0, ?) "
+                "ON CONFLICT(key) DO UPDATE SET content_type = excluded.content_type, size = excluded.size, "
+                "uploaded = 0, attempts = 0, generation = generation + 1, dead = 0, last_access = excluded.last_access",
+                (key, content_type, size, time.time()),
+            )
+
+    def pending(self, limit: int, max_attempts: int) -> List[Tuple[str, str, int, bool]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, content_type, generation, dead FROM entries WHERE uploaded = 0 AND attempts < ? "
+                "ORDER BY attempts, last_access LIMIT ?",
+                (max_attempts, limit),
+            ).fetchall()
+        return [(row[0], row[1], row[2], bool(row[3])) for row in rows]
+
+    def pending_keys(self, prefix: str, dead: bool = False) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key FROM entries WHERE uploaded = 0 AND dead = ? AND substr(key, 1, ?) = ?",
+                (int(dead), len(prefix), prefix),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def mark_uploaded(self, key: str, generation: int) -> None:
+        # A rewrite during the upload bumps the generation, and that newer content still has to go up
+        with self._lock:
+            self._conn.execute(
+                "UPDATE entries SET uploaded = 1, dead = 0 WHERE key = ? AND generation = ?",
+                (key, generation),
+            )
+
+    def mark_failed(self, key: str, generation: int) -> int:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE entries SET attempts = attempts + 1 WHERE key = ? AND generation = ?",
+                (key, generation),
+            )
+            row = self._conn.execute("SELECT attempts FROM entries WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else 0
+
+    def mark_dead(self, key: str, generation: int) -> bool:
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE entries SET dead = 1 WHERE key = ? AND generation = ? AND uploaded = 0 AND dead = 0",
+                (key, generation),
+            )
+        return cursor.rowcount > 0
+
+    def touch(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+
+    def remove(self, keys: List[str]) -> None:
+        with self._lock:
+            self._conn.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key in keys])
+
+    def eviction_candidates(self, max_bytes: int) -> List[str]:
+        with self._lock:
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries WHERE dead = 0").fetchone()[0]
+            if total <= max_bytes:
+                return []
+
+            # Only entries that already reached the remote tier may leave the cache, least recently used first
+            rows = self._conn.execute(
+                "SELECT key, size FROM entries WHERE uploaded = 1 AND dead = 0 ORDER BY last_access",
+            ).fetchall()
+
+        candidates = []
+        for key, size in rows:
+            if total <= max_bytes:
+                break
+            candidates.append(key)
+            total -= size
+        return candidates
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class TieredStorageManager(StorageManager):
+    """Writes land in a local cache and are uploaded to S3 by a background thread (write-behind)."""
+
+    def __init__(self, settings: Settings, s3_client: S3Client, manifest: Optional[ManifestIndex] = None) -> None:
+        super().__init__(settings=settings, manifest=manifest)
+
+        cache_settings = settings.model_copy(update={"local_storage_dir": settings.storage_cache_dir})
+        self._local = LocalStorageManager(settings=cache_settings)
+        self._remote = S3StorageManager(settings=settings, s3_client=s3_client)
+        self._journal = _CacheJournal(db_path=os.path.join(settings.storage_cache_dir, ".journal", "journal.sqlite3"))
+
+        # Serializes moves into the dead-letter dir with journal updates from writers
+        self._dead_letter_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._uploader = threading.Thread(target=self._upload_loop, name="TieredStorageUploader", daemon=True)
+        self._uploader.start()
+
+    def read_file(self, file_key: str, file_type: Optional[str] = None) -> Any:
+        cached_key = self._cached_key(file_key=file_key)
+        if cached_key:
+            self._journal.touch(key=self._journal_key(cached_key))
+            return self._local.read_file(file_key=cached_key, file_type=file_type)
+
+        return self._remote.read_file(file_key=file_key, file_type=file_type)
+
+    def read_range(self, file_key: str, offset: int, length: int) -> bytes:
+        cached_key = self._cached_key(file_key=file_key)
+        if cached_key and self._journal_key(cached_key) == file_key:
+            return self._local.read_range(file_key=cached_key, offset=offset, length=length)
+
+        return self._remote.read_range(file_key=file_key, offset=offset, length=length)
+
+    def iter_file(self, file_key: str, chunk_size: int = 1024 * 1024) -> Iterator[bytes]:
+        cached_key = self._cached_key(file_key=file_key)
+        if cached_key:
+            return self._local.iter_file(file_key=cached_key, chunk_size=chunk_size)
+
+        return self._remote.iter_file(file_key=file_key, chunk_size=chunk_size)
+
+    def upload_file(
+        self,
+        file_path: str,
+        file_key: str,
+        content_type: str = "application/octet-stream",
+        compress: Optional[bool] = None,
+    ) -> str:
+        with open(file_path, "rb") as file:
+            return self.upload_bytes(data=file, file_key=file_key, content_type=content_type, compress=compress)
+
+    def _write_bytes(
+        self,
+        data: Union[bytes, IO[bytes]],
+        file_key: str,
+        content_type: str,
+        compress: Optional[bool],
+    ) -> str:
+        stored_key = self._local.upload_bytes(
+            data=data,
+            file_key=file_key,
+            content_type=content_type,
+            compress=compress,
+        )
+        with self._dead_letter_lock:
+            dead_path = self._dead_letter_path(key=stored_key)
+            if os.path.exists(dead_path):
+                if os.path.exists(self._cache_path(key=stored_key)):
+                    os.remove(dead_path)
+                else:
+                    # The previous version was dead-lettered while this one was being written
+                    os.replace(dead_path, self._cache_path(key=stored_key))
+
+            self._journal.add(key=stored_key, content_type=content_type, size=self._local.get_file_size(stored_key))
+
+        self._wakeup.set()
+        return stored_key
+
+    def delete_files(self, file_keys: List[str]) -> None:
+        cached_keys = [cached_key for file_key in file_keys if (cached_key := self._cached_key(file_key=file_key))]
+        self._journal.remove(keys=[self._journal_key(cached_key) for cached_key in cached_keys])
+        self._local.delete_files(file_keys=cached_keys)
+        self._remote.delete_files(file_keys=file_keys)
+
+    def get_file_size(self, file_key: str) -> int:
+        cached_key = self._cached_key(file_key=file_key)
+        if cached_key:
+            return self._local.get_file_size(file_key=cached_key)
+
+        return self._remote.get_file_size(file_key=file_key)
+
+    def file_exists(self, file_key: str) -> bool:
+        return bool(self._cached_key(file_key=file_key)) or self._remote.file_exists(file_key=file_key)
+
+    def list_files(self, prefix: str = "") -> Iterator[StoredFile]:
+        seen: Set[str] = set()
+        for stored_file in self._remote.list_files(prefix=prefix):
+            seen.add(stored_file.key)
+            yield stored_file
+
+        # Keys still waiting for upload only exist in the cache so far
+        pending_keys = set(self._journal.pending_keys(prefix=prefix)) - seen
+        for stored_file in self._local.list_files(prefix=prefix):
+            if stored_file.key in pending_keys:
+                yield stored_file
+
+        dead_keys = set(self._journal.pending_keys(prefix=prefix, dead=True)) - seen
+        for stored_file in self._local.list_files(prefix=f"{DEAD_LETTER_DIR}/{prefix}"):
+            key = self._journal_key(stored_file.key)
+            if key in dead_keys:
+                yield StoredFile(key=key, size=stored_file.size, last_modified=stored_file.last_modified)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        deadline = time.monotonic() + timeout if timeout else None
+        while self._journal.pending(limit=1, max_attempts=self._settings.storage_upload_max_attempts):
+            if deadline and time.monotonic() > deadline:
+                return False
+
+            self._wakeup.set()
+            time.sleep(0.1)
+
+        return True
+
+    def close(self) -> None:
+        if not self.flush(timeout=self._settings.storage_flush_timeout):
+            logger.warning("⚠️ Storage cache still has pending uploads, they will be retried on next start")
+
+        self._stopping.set()
+        self._wakeup.set()
+        self._uploader.join()
+
+        self._journal.close()
+        self._local.close()
+        self._remote.close()
+        super().close()
+
+    def _cached_key(self, file_key: str) -> Optional[str]:
+        # Key relative to the cache dir, dead letters included
+        for key in (file_key, compressed_key(file_key)):
+            for cached_key in (key, f"{DEAD_LETTER_DIR}/{key}"):
+                if os.path.exists(os.path.join(self._settings.storage_cache_dir, cached_key)):
+                    return cached_key
+
+        return None
+
+    @staticmethod
+    def _journal_key(cached_key: str) -> str:
+        return cached_key.removeprefix(f"{DEAD_LETTER_DIR}/")
+
+    def _cache_path(self, key: str) -> str:
+        return os.path.join(self._settings.storage_cache_dir, key)
+
+    def _dead_letter_path(self, key: str) -> str:
+        return os.path.join(self._settings.storage_cache_dir, DEAD_LETTER_DIR, key)
+
+    def _upload_loop(self) -> None:
+        with ThreadPoolExecutor(
+            max_workers=self._settings.storage_max_workers,
+            thread_name_prefix="TieredStorageUpload",
+        ) as executor:
+            while not self._stopping.is_set():
+                self._wakeup.wait(timeout=self._settings.storage_upload_interval)
+                self._wakeup.clear()
+
+                try:
+                    while batch := self._journal.pending(
+                        limit=self._settings.storage_upload_batch_size,
+                        max_attempts=self._settings.storage_upload_max_attempts,
+                    ):
+                        results = list(executor.map(self._upload_entry, batch))
+                        if not any(results):
+                            # Every upload in the batch failed, back off until the next interval
+                            break
+
+                    self._evict()
+                except Exception as e:
+                    logger.error(f"🛑 Storage cache uploader failed: {e}")
+
+    def _upload_entry(self, entry: Tuple[str, str, int, bool]) -> bool:
+        key, content_type, generation, dead = entry
+        file_path = self._dead_letter_path(key=key) if dead else self._cache_path(key=key)
+        try:
+            with open(file_path, "rb") as file:
+                # Cached files are already in their final (possibly compressed) form
+                self._remote.upload_bytes(data=file, file_key=key, content_type=content_type, compress=False)
+            if dead:
+                self._revive(key=key)
+            self._journal.mark_uploaded(key=key, generation=generation)
+            return True
+        except FileNotFoundError:
+            logger.warning(f"⚠️ Cached file `{key}` disappeared before upload")
+            self._journal.remove(keys=[key])
+            return True
+        except Exception as e:
+            logger.error(f"🛑 Failed to upload cached file `{key}`: {e}")
+            attempts = self._journal.mark_failed(key=key, generation=generation)
+            if not dead and attempts >= self._settings.storage_upload_max_attempts:
+                self._dead_letter(key=key, generation=generation)
+            return False
+
+    def _dead_letter(self, key: str, generation: int) -> None:
+        # Moved out of the cache so it no longer counts against its bound, retried on the next start
+        with self._dead_letter_lock:
+            if not self._journal.mark_dead(key=key, generation=generation):
+                return
+
+            dead_path = self._dead_letter_path(key=key)
+            os.makedirs(os.path.dirname(dead_path), exist_ok=True)
+            if os.path.exists(self._cache_path(key=key)):
+                os.replace(self._cache_path(key=key), dead_path)
+
+        logger.error(f"🛑 Giving up on cached file `{key}` until the next start, moved to `{DEAD_LETTER_DIR}`")
+
+    def _revive(self, key: str) -> None:
+        # Back in the cache once uploaded, where it is evicted like any other entry
+        with self._dead_letter_lock:
+            dead_path = self._dead_letter_path(key=key)
+            if not os.path.exists(dead_path):
+                return
+
+            if os.path.exists(self._cache_path(key=key)):
+                os.remove(dead_path)
+            else:
+                os.replace(dead_path, self._cache_path(key=key))
+
+    def _evict(self) -> None:
+        candidates = self._journal.eviction_candidates(max_bytes=self._settings.storage_cache_max_bytes)
+        if not candidates:
+            return
+
+        self._local.delete_files(file_keys=candidates)
+        self._journal.remove(keys=candidates)
+        logger.debug(f"🧹 Evicted {len(candidates)} files from storage cache")
@@ -1,9 +1,11 @@
 from chronos.core.settings import Settings
+from chronos.infrastructure.nats_client import NatsClient
 
 
 class EnqueuesWithNats:
-    def __init__(self, settings: Settings) -> None:
+    def __init__(self, settings: Settings, nats_client: NatsClient) -> None:
         self._settings = settings
+        self._nats_client = nats_client
 
     def get_nats_url(self) -> str:
         assert self._settings.nats_url is not None, "NATS URL is not configured"
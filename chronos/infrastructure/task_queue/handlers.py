@@ -0,0 +1,106 @@
+import fnmatch
+import inspect
+from dataclasses import dataclass
+from typing import Annotated, Any, Dict, List, Tuple, Type
+
+from fastapi.dependencies.utils import get_typed_signature
+from loguru import logger
+from pydantic import BaseModel, BeforeValidator, ConfigDict, Field, TypeAdapter, create_model
+
+from chronos.infrastructure.exceptions import ApplicationError
+from chronos.schemas.services.run_service import service_path
+from chronos.utils.constants import HANDLER_NOT_ALLOWED, HANDLER_NOT_SUPPORTED
+from chronos.utils.module_loading import import_string
+
+
+@dataclass(frozen=True)
+class CompiledHandler:
+    service_class: Type[Any]
+    func_name: str
+    params_model: Type[BaseModel]
+    fields: Tuple[Tuple[str, str], ...]  # (model field, handler parameter)
+
+    def validate(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        validated = self.params_model.model_validate(params)
+        return {param_name: getattr(validated, field_name) for field_name, param_name in self.fields}
+
+
+class HandlerRegistry:
+    """Resolves `service.func` handlers once and validates their params with one precompiled model."""
+
+    def __init__(self, allowlist: List[str]) -> None:
+        self._patterns = [_normalize_pattern(pattern=pattern) for pattern in allowlist]
+        self._handlers: Dict[Tuple[str, str], CompiledHandler] = {}
+
+    def is_allowed(self, service: str, func: str) -> bool:
+        if func.startswith("_"):
+            return False
+
+        target = f"{service_path(service=service)}.{func}"
+        return any(fnmatch.fnmatchcase(target, pattern) for pattern in self._patterns)
+
+    def get(self, service: str, func: str) -> CompiledHandler:
+        handler = self._handlers.get((service, func))
+        if handler:
+            return handler
+
+        if not self.is_allowed(service=service, func=func):
+            raise ApplicationError(detail=f"Handler `{service}.{func}` is not allowed", error_code=HANDLER_NOT_ALLOWED)
+
+        handler = self._handlers[(service, func)] = _compile(service=service, func_name=func)
+        return handler
+
+
+def _normalize_pattern(pattern: str) -> str:
+    if pattern == "*":
+        return pattern
+
+    service, func = pattern.rsplit(".", 1)
+    return f"{service_path(service=service)}.{func}"
+
+
+def _compile(service: str, func_name: str) -> CompiledHandler:
+    service_class = import_string(dotted_path=service_path(service=service))
+    func = getattr(service_class, func_name, None)
+    if not callable(func):
+        msg = f"`{service_class.__name__}` has no callable `{func_name}`"
+        raise ApplicationError(detail=msg, error_code=HANDLER_NOT_SUPPORTED)
+
+    fields: Dict[str, Any] = {}
+    names: List[Tuple[str, str]] = []
+    for index, (param_name, param) in enumerate(get_typed_signature(func).parameters.items()):
+        if index == 0 and param_name == "self":
+            continue
+
+        if param.kind in (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD):
+            msg = f"Variadic arguments are not supported in {func.__qualname__}"
+            raise ApplicationError(detail=msg, error_code=HANDLER_NOT_SUPPORTED)
+
+        annotation = param.annotation
+        if annotation is inspect.Signature.empty:
+            logger.error(f"Parameter {param_name} needs to be annotated with type in {func.__qualname__}")
+            annotation = Any
+        elif isinstance(annotation, TypeAdapter):
+            annotation = Annotated[Any, BeforeValidator(annotation.validate_python)]
+
+        # Parameters that would clash with BaseModel attributes or be treated as private get a safe field name
+        field_name = param_name
+        if param_name.startswith("_") or hasattr(BaseModel, param_name):
+            field_name = f"param_{param_name.lstrip('_')}"
+
+        default = ... if param.default is inspect.Parameter.empty else param.default
+        fields[field_name] = (annotation, Field(default, alias=param_name))
+        names.append((field_name, param_name))
+
+    params_model = create_model(
+        f"{service_class.__name__}_{func_name}_params",
+        __config__=ConfigDict(extra="ignore", arbitrary_types_allowed=True),
+        **fields,
+    )
+    logger.debug(f"🧩 Compiled handler `{service}.{func_name}`")
+    return CompiledHandler(
+        service_class=service_class,
+        func_name=func_name,
+        params_model=params_model,
+        fields=tuple(names),
+    )
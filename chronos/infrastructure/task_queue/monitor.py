@@ -0,0 +1,108 @@
+import asyncio
+import math
+import os
+import socket
+import time
+from typing import List, Optional
+
+from loguru import logger
+from redis.asyncio import ConnectionPool, Redis
+
+from chronos.core.settings import Settings
+from chronos.infrastructure.nats_client import NatsClient
+from chronos.infrastructure.task_queue.scheduler import WeightedScheduler
+from chronos.schemas.services.queue_stats import QueueStatsSchema, WorkerHeartbeatSchema
+
+
+class WorkerHeartbeat:
+    """Periodically publishes this worker's capacity and load to Redis, expiring if the worker dies."""
+
+    def __init__(self, settings: Settings, redis_pool: ConnectionPool, scheduler: WeightedScheduler) -> None:
+        self._settings = settings
+        self._redis = Redis(connection_pool=redis_pool)
+        self._scheduler = scheduler
+        self._worker_id = f"{socket.gethostname()}-{os.getpid()}"
+        self._key = f"{self._settings.worker_heartbeat_prefix}:{self._worker_id}"
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._beat_forever())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+        await self._redis.delete(self._key)
+
+    async def beat(self) -> None:
+        heartbeat = WorkerHeartbeatSchema(
+            worker_id=self._worker_id,
+            capacity=self._scheduler.capacity,
+            running=self._scheduler.running,
+            waiting=sum(self._scheduler.waiting().values()),
+            timestamp=time.time(),
+        )
+        await self._redis.set(self._key, heartbeat.model_dump_json(), ex=self._settings.worker_heartbeat_ttl)
+
+    async def _beat_forever(self) -> None:
+        while True:
+            try:
+                await self.beat()
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to publish worker heartbeat: {e}")
+            await asyncio.sleep(self._settings.worker_heartbeat_interval)
+
+
+class QueueMonitor:
+    """Reads backlog depth (JetStream consumers or worker heartbeats) and live worker capacity."""
+
+    def __init__(self, settings: Settings, nats_client: NatsClient, redis_pool: ConnectionPool) -> None:
+        self._settings = settings
+        self._nats_client = nats_client
+        self._redis = Redis(connection_pool=redis_pool)
+        self._cached: Optional[QueueStatsSchema] = None
+        self._cached_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def stats(self) -> QueueStatsSchema:
+        async with self._lock:
+            # Admission checks run on every enqueue, so the numbers are reused for a short while
+            if self._cached and time.monotonic() - self._cached_at < self._settings.admission_stats_ttl:
+                return self._cached
+
+            self._cached = await self._collect()
+            self._cached_at = time.monotonic()
+            return self._cached
+
+    async def heartbeats(self) -> List[WorkerHeartbeatSchema]:
+        keys = [key async for key in self._redis.scan_iter(match=f"{self._settings.worker_heartbeat_prefix}:*")]
+        if not keys:
+            return []
+
+        return [WorkerHeartbeatSchema.model_validate_json(value) for value in await self._redis.mget(keys) if value]
+
+    async def _collect(self) -> QueueStatsSchema:
+        heartbeats = await self.heartbeats()
+        capacity = sum(heartbeat.capacity for heartbeat in heartbeats)
+        stats = QueueStatsSchema(
+            depth=sum(heartbeat.waiting for heartbeat in heartbeats),
+            in_flight=sum(heartbeat.running for heartbeat in heartbeats),
+            workers=len(heartbeats),
+            capacity=capacity,
+            source="heartbeats",
+            # Without live workers nothing is refused here, `admission_require_workers` decides instead
+            limit=max(1, math.ceil(capacity * self._settings.admission_max_load)),
+        )
+
+        if self._settings.jetstream_enabled:
+            consumers = [
+                consumer
+                for consumer in await self._nats_client.consumers_info(stream=self._settings.jetstream_stream)
+                if consumer.name.startswith(self._settings.jetstream_durable)
+            ]
+            # Every lane has its own consumer on a distinct subject, so no message is counted twice
+            stats.depth = sum((consumer.num_pending or 0) for consumer in consumers)
+            stats.in_flight = sum((consumer.num_ack_pending or 0) for consumer in consumers)
+            stats.source = "jetstream"
+            stats.limit = self._settings.admission_max_depth
+
+        return stats
@@ -1,16 +1,42 @@
-from typing import Any, Dict
-
-from faststream.nats import NatsBroker
+import asyncio
+from typing import Any, Dict, List, Optional
 
 from chronos.core.settings import Settings
+from chronos.infrastructure.nats_client import NatsClient
 from chronos.infrastructure.task_queue.base import EnqueuesWithNats
+from chronos.schemas.services.run_service import RunServicePayload
 
 
 class EnqueueRunServiceWithNats(EnqueuesWithNats):
-    def __init__(self, settings: Settings) -> None:
-        super().__init__(settings=settings)
-        self._subject = "run_service"
+    def __init__(self, settings: Settings, nats_client: NatsClient) -> None:
+        super().__init__(settings=settings, nats_client=nats_client)
 
     async def __call__(self, *, payload: Dict[str, Any]) -> None:
-        async with NatsBroker(self.get_nats_url()) as br:
-            await br.publish(message=payload, subject=self._subject)
+        publish = self._nats_client.publish_durable if self._settings.jetstream_enabled else self._nats_client.publish
+        # The validated payload carries a fixed task_id, so every delivery of the message refers to the same job
+        run_service_payload = RunServicePayload.model_validate(payload)
+        await publish(
+            subject=run_service_payload.subject_,
+            message=run_service_payload.model_dump(mode="json"),
+            headers={"content-type": "application/json"},
+        )
+
+    async def enqueue_many(self, *, payloads: List[Dict[str, Any]]) -> List[Optional[str]]:
+        if not self._settings.jetstream_enabled:
+            # Core publishes only fill the client's buffer, a single flush pushes the whole batch out
+            errors: List[Optional[str]] = []
+            for payload in payloads:
+                try:
+                    await self(payload=payload)
+                    errors.append(None)
+                except Exception as e:
+                    errors.append(str(e))
+            await self._nats_client.flush()
+            return errors
+
+        # JetStream acks are awaited concurrently instead of one round trip per message
+        results = await asyncio.gather(
+            *(self(payload=payload) for payload in payloads),
+            return_exceptions=True,
+        )
+        return [str(result) if isinstance(result, Exception) else None for result in results]
@@ -0,0 +1,82 @@
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, Optional
+
+
+class WeightedScheduler:
+    """Shares a fixed number of execution slots between lanes using smooth weighted round-robin."""
+
+    def __init__(self, capacity: int, weights: Dict[str, int]) -> None:
+        self._capacity = capacity
+        self._weights = {lane: max(weight, 1) for lane, weight in weights.items()}
+        self._current: Dict[str, int] = dict.fromkeys(self._weights, 0)
+        self._waiters: Dict[str, Deque[asyncio.Future]] = {lane: deque() for lane in self._weights}
+        self._running = 0
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def running(self) -> int:
+        return self._running
+
+    def waiting(self) -> Dict[str, int]:
+        return {lane: len(waiters) for lane, waiters in self._waiters.items()}
+
+    @asynccontextmanager
+    async def slot(self, lane: str) -> AsyncIterator[None]:
+        await self.acquire(lane=lane)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self, lane: str) -> None:
+        """Wait for a slot in `lane`, the caller hands it back with `release`."""
+        if lane not in self._weights:
+            msg = f"Unknown scheduler lane {lane}"
+            raise ValueError(msg)
+
+        if self._running < self._capacity and not any(self._waiters.values()):
+            self._running += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters[lane].append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future in self._waiters[lane]:
+                self._waiters[lane].remove(future)
+            elif future.done() and not future.cancelled():
+                # The slot was handed over right before the cancellation landed
+                self.release()
+            raise
+
+    def release(self) -> None:
+        self._running -= 1
+        while self._running < self._capacity:
+            lane = self._next_lane()
+            if lane is None:
+                break
+
+            future = self._waiters[lane].popleft()
+            if future.done():
+                continue
+
+            self._running += 1
+            future.set_result(None)
+
+    def _next_lane(self) -> Optional[str]:
+        lanes = [lane for lane, waiters in self._waiters.items() if waiters]
+        if not lanes:
+            return None
+
+        for lane in lanes:
+            self._current[lane] += self._weights[lane]
+
+        selected = max(lanes, key=lambda lane: self._current[lane])
+        self._current[selected] -= sum(self._weights[lane] for lane in lanes)
+        return selected
@@ -6,6 +6,8 @@ from chronos.core.settings import settings
 from chronos.main.api.app import run_api
 from chronos.main.workers.app import run_worker
 from chronos.presentation.cli.crawlers import crawler_commands
+from chronos.presentation.cli.exports import export_commands
+from chronos.presentation.cli.retention import retention_commands
 
 
 class CLIFactory:
@@ -54,3 +56,5 @@ class CLIFactory:
 
     def add_app_commands(self, app: AsyncTyper) -> None:
         app.add_typer(crawler_commands, name="crawler")
+        app.add_typer(export_commands, name="export")
+        app.add_typer(retention_commands, name="retention")
@@ -4,16 +4,20 @@ from dishka import AsyncContainer
 from dishka.integrations.faststream import setup_dishka
 from faststream import FastStream
 from faststream.nats import NatsBroker
+from redis.asyncio import ConnectionPool
 
 from chronos.core.logging import init_logger
 from chronos.core.settings import Settings, get_settings
+from chronos.infrastructure.task_queue.monitor import WorkerHeartbeat
 from chronos.presentation.workers.router import router
+from chronos.presentation.workers.run_service import scheduler, stop_running_tasks
 
 
 class WorkerFactory:
     def __init__(self, container: AsyncContainer, settings: Optional[Settings] = None) -> None:
         self._settings = settings if settings else get_settings()
         self._container = container
+        self._heartbeat: Optional[WorkerHeartbeat] = None
 
     def get_nats_url(self) -> str:
         assert self._settings.nats_url is not None, "NATS URL is not configured"
@@ -23,8 +27,21 @@ class WorkerFactory:
         broker = NatsBroker(servers=self.get_nats_url())
         broker.include_router(router=router)
         app = FastStream(broker=broker)
+        app.after_startup(self._start_heartbeat)
+        app.on_shutdown(self._stop_heartbeat)
+        # Runs before the broker stops, so interrupted durable tasks can still be handed back to the stream
+        app.on_shutdown(stop_running_tasks)
 
         setup_dishka(container=self._container, app=app)
         init_logger(debug=self._settings.debug)
 
         return app
+
+    async def _start_heartbeat(self) -> None:
+        redis_pool = await self._container.get(ConnectionPool)
+        self._heartbeat = WorkerHeartbeat(settings=self._settings, redis_pool=redis_pool, scheduler=scheduler)
+        self._heartbeat.start()
+
+    async def _stop_heartbeat(self) -> None:
+        if self._heartbeat:
+            await self._heartbeat.stop()
@@ -40,7 +40,7 @@ def _http_error_handler(_: Request, exc: Union[HTTPException, Exception]) -> JSO
     content = _get_error_response(exc=exc)
 
     status_code = getattr(exc, "status_code", 500)
-    return JSONResponse(content=content, status_code=status_code)
+    return JSONResponse(content=content, status_code=status_code, headers=getattr(exc, "headers", None))
 
 
 def _http422_error_handler(_: Request, exc: Union[RequestValidationError, ValidationError, Exception]) -> JSONResponse:
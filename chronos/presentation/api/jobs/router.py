@@ -0,0 +1,22 @@
+from dishka.integrations.fastapi import DishkaRoute
+from fastapi import APIRouter
+
+from chronos.presentation.api.jobs.services import get_job, stream_job_events
+
+jobs_router = APIRouter(
+    prefix="/jobs",
+    tags=["jobs"],
+    route_class=DishkaRoute,
+)
+
+jobs_router.add_api_route(
+    path="/{job_id}",
+    endpoint=get_job,
+    methods=["GET"],
+)
+
+jobs_router.add_api_route(
+    path="/{job_id}/events",
+    endpoint=stream_job_events,
+    methods=["GET"],
+)
@@ -0,0 +1,46 @@
+from typing import Annotated, AsyncIterator
+
+from dishka.integrations.faststream import FromDishka
+from fastapi import HTTPException, status
+from fastapi.responses import StreamingResponse
+
+from chronos.infrastructure.jobs import JobTracker
+from chronos.presentation.api.base_response import ResponseBase
+from chronos.schemas.jobs import JobSchema
+
+
+async def get_job(
+    *,
+    job_tracker: Annotated[JobTracker, FromDishka()],
+    job_id: str,
+) -> ResponseBase[JobSchema]:
+    job = await job_tracker.get(job_id=job_id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Job `{job_id}` not found")
+
+    return ResponseBase(data=job)
+
+
+async def stream_job_events(
+    *,
+    job_tracker: Annotated[JobTracker, FromDishka()],
+    job_id: str,
+) -> StreamingResponse:
+    if not await job_tracker.get(job_id=job_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Job `{job_id}` not found")
+
+    return StreamingResponse(
+        content=_job_events(job_tracker=job_tracker, job_id=job_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _job_events(job_tracker: JobTracker, job_id: str) -> AsyncIterator[str]:
+    async for job in job_tracker.follow(job_id=job_id):
+        if job is None:
+            # SSE comment, keeps proxies from closing an idle stream
+            yield ": keepalive\n\n"
+            continue
+
+        yield f"event: {'done' if job.is_final else 'progress'}\ndata: {job.model_dump_json()}\n\n"
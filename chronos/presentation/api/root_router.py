@@ -1,6 +1,7 @@
 from dishka.integrations.fastapi import DishkaRoute
 from fastapi import APIRouter
 
+from chronos.presentation.api.jobs.router import jobs_router
 from chronos.presentation.api.services.router import services_router
 
 root_router = APIRouter(
@@ -9,3 +10,4 @@ root_router = APIRouter(
 )
 
 root_router.include_router(router=services_router)
+root_router.include_router(router=jobs_router)
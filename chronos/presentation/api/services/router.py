@@ -1,7 +1,11 @@
 from dishka.integrations.fastapi import DishkaRoute
 from fastapi import APIRouter
 
-from chronos.presentation.api.services.services import enqueue_run_service
+from chronos.presentation.api.services.services import (
+    bulk_enqueue_run_service,
+    enqueue_run_service,
+    get_queue_stats,
+)
 
 services_router = APIRouter(
     prefix="/services",
@@ -14,3 +18,15 @@ services_router.add_api_route(
     endpoint=enqueue_run_service,
     methods=["POST"],
 )
+
+services_router.add_api_route(
+    path="/bulk",
+    endpoint=bulk_enqueue_run_service,
+    methods=["POST"],
+)
+
+services_router.add_api_route(
+    path="/stats",
+    endpoint=get_queue_stats,
+    methods=["GET"],
+)
@@ -1,17 +1,222 @@
-from typing import Annotated
+from typing import Annotated, Any, Dict, List, Optional, Tuple
 
 from dishka.integrations.faststream import FromDishka
-from fastapi import Response, status
+from fastapi import HTTPException, Request, status
+from fastapi.responses import JSONResponse
+from loguru import logger
+from pydantic import ValidationError
 
 from chronos.application.task_queue.run_service import EnqueueRunService
-from chronos.schemas.services.run_service import RunServicePayload
+from chronos.core.settings import Settings
+from chronos.infrastructure.exceptions import ApplicationError
+from chronos.infrastructure.jobs import JobTracker
+from chronos.infrastructure.task_queue.handlers import HandlerRegistry
+from chronos.infrastructure.task_queue.monitor import QueueMonitor
+from chronos.presentation.api.base_response import ResponseBase
+from chronos.schemas.enums.tasks import JobStatus
+from chronos.schemas.services.queue_stats import QueueStatsSchema
+from chronos.schemas.services.run_service import (
+    BulkEnqueueItemResult,
+    BulkEnqueueResult,
+    RunServicePayload,
+)
+from chronos.utils.constants import DUPLICATE_ENTRY_ERROR, HANDLER_NOT_ALLOWED
+from chronos.utils.json_stream import JsonStreamError, iter_json_items
 
 
 async def enqueue_run_service(
     *,
     enqueue_run_service: Annotated[EnqueueRunService, FromDishka()],
+    handler_registry: Annotated[HandlerRegistry, FromDishka()],
+    queue_monitor: Annotated[QueueMonitor, FromDishka()],
+    job_tracker: Annotated[JobTracker, FromDishka()],
+    settings: Annotated[Settings, FromDishka()],
     body: RunServicePayload,
-) -> Response:
-    await enqueue_run_service(payload=body.model_dump())
+) -> JSONResponse:
+    if not handler_registry.is_allowed(service=body.service, func=body.func):
+        msg = f"Handler `{body.service}.{body.func}` is not allowed"
+        raise ApplicationError(detail=msg, error_code=HANDLER_NOT_ALLOWED)
 
-    return Response(status_code=status.HTTP_202_ACCEPTED)
+    if settings.admission_enabled:
+        await check_admission(queue_monitor=queue_monitor, settings=settings)
+
+    # The task id doubles as the job id, so the job exists before any worker can pick it up
+    if not all(await job_tracker.create(jobs=[(body.task_id, body.service, body.func)])):
+        raise ApplicationError(detail=f"Job `{body.task_id}` already exists", error_code=DUPLICATE_ENTRY_ERROR)
+    try:
+        await enqueue_run_service(payload=body.model_dump())
+    except Exception as e:
+        await job_tracker.finish(job_id=body.task_id, status=JobStatus.FAILED, error=str(e))
+        raise
+
+    return JSONResponse(
+        content=ResponseBase(data={"job_id": body.task_id}).model_dump(),
+        status_code=status.HTTP_202_ACCEPTED,
+    )
+
+
+async def bulk_enqueue_run_service(
+    *,
+    request: Request,
+    enqueue_run_service: Annotated[EnqueueRunService, FromDishka()],
+    handler_registry: Annotated[HandlerRegistry, FromDishka()],
+    queue_monitor: Annotated[QueueMonitor, FromDishka()],
+    job_tracker: Annotated[JobTracker, FromDishka()],
+    settings: Annotated[Settings, FromDishka()],
+) -> ResponseBase[BulkEnqueueResult]:
+    """Accepts NDJSON or a JSON array of run_service payloads, read and published as the body streams in."""
+    if settings.admission_enabled:
+        await check_admission(queue_monitor=queue_monitor, settings=settings)
+
+    result = BulkEnqueueResult()
+    batch: List[Dict[str, Any]] = []
+    batch_results: List[BulkEnqueueItemResult] = []
+    admission_error: Optional[str] = None
+
+    async def publish_batch() -> None:
+        nonlocal admission_error
+        # The backlog grows while the body streams in, so every batch is admitted on its own
+        if not admission_error:
+            admission_error = await _check_batch_admission(queue_monitor=queue_monitor, settings=settings)
+        await _publish_batch(
+            enqueue_run_service=enqueue_run_service,
+            job_tracker=job_tracker,
+            payloads=batch,
+            item_results=batch_results,
+            admission_error=admission_error,
+        )
+        result.results.extend(batch_results)
+        batch.clear()
+        batch_results.clear()
+
+    index = 0
+    try:
+        async for item, error in iter_json_items(chunks=request.stream()):
+            if index >= settings.bulk_enqueue_max_items:
+                result.error = f"Only the first {settings.bulk_enqueue_max_items} items are accepted"
+                break
+
+            item_result, payload = _admit_item(index=index, item=item, error=error, handler_registry=handler_registry)
+            index += 1
+            if payload is None:
+                result.results.append(item_result)
+                continue
+
+            batch.append(payload)
+            batch_results.append(item_result)
+            if len(batch) >= settings.bulk_enqueue_batch_size:
+                await publish_batch()
+    except JsonStreamError as e:
+        result.error = str(e)
+
+    if batch:
+        await publish_batch()
+
+    # Items after the batch that tripped admission are still listed, each rejected with the reason
+    result.error = f"Stopped publishing: {admission_error}" if admission_error else result.error
+    result.results.sort(key=lambda item_result: item_result.index)
+    result.accepted = sum(item_result.accepted for item_result in result.results)
+    result.rejected = len(result.results) - result.accepted
+    return ResponseBase(data=result)
+
+
+async def _check_batch_admission(queue_monitor: QueueMonitor, settings: Settings) -> Optional[str]:
+    if not settings.admission_enabled:
+        return None
+
+    try:
+        await check_admission(queue_monitor=queue_monitor, settings=settings)
+    except HTTPException as e:
+        return str(e.detail)
+    return None
+
+
+async def _publish_batch(
+    enqueue_run_service: EnqueueRunService,
+    job_tracker: JobTracker,
+    payloads: List[Dict[str, Any]],
+    item_results: List[BulkEnqueueItemResult],
+    admission_error: Optional[str] = None,
+) -> None:
+    if admission_error:
+        for item_result in item_results:
+            item_result.error = admission_error
+        return
+
+    created = await job_tracker.create(
+        jobs=[(payload["task_id"], payload["service"], payload["func"]) for payload in payloads]
+    )
+    fresh = []
+    for payload, item_result, is_new in zip(payloads, item_results, created, strict=True):
+        if is_new:
+            fresh.append((payload, item_result))
+        else:
+            item_result.error = f"Job `{payload['task_id']}` already exists"
+
+    errors = await enqueue_run_service.enqueue_many(payloads=[payload for payload, _ in fresh])
+    for (payload, item_result), error in zip(fresh, errors, strict=True):
+        item_result.accepted, item_result.error = error is None, error
+        if error:
+            await job_tracker.finish(job_id=payload["task_id"], status=JobStatus.FAILED, error=error)
+
+
+def _admit_item(
+    index: int,
+    item: Any,
+    error: Optional[str],
+    handler_registry: HandlerRegistry,
+) -> Tuple[BulkEnqueueItemResult, Optional[Dict[str, Any]]]:
+    item_result = BulkEnqueueItemResult(index=index, accepted=False, error=error)
+    if error is not None:
+        return item_result, None
+
+    try:
+        payload = RunServicePayload.model_validate(item)
+    except ValidationError as e:
+        item_result.error = str(e)
+        return item_result, None
+
+    item_result.task_id = payload.task_id
+    if not handler_registry.is_allowed(service=payload.service, func=payload.func):
+        item_result.error = f"Handler `{payload.service}.{payload.func}` is not allowed"
+        return item_result, None
+
+    return item_result, payload.model_dump()
+
+
+async def get_queue_stats(
+    *,
+    queue_monitor: Annotated[QueueMonitor, FromDishka()],
+) -> ResponseBase[QueueStatsSchema]:
+    return ResponseBase(data=await queue_monitor.stats())
+
+
+async def check_admission(queue_monitor: QueueMonitor, settings: Settings) -> None:
+    headers = {"Retry-After": str(settings.admission_retry_after)}
+    try:
+        stats = await queue_monitor.stats()
+    except Exception as e:
+        if settings.admission_fail_open:
+            logger.warning(f"⚠️ Failed to read queue stats, admitting task: {e}")
+            return
+
+        logger.error(f"🛑 Failed to read queue stats, refusing task: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Queue stats are unavailable",
+            headers=headers,
+        ) from e
+
+    if settings.admission_require_workers and stats.workers == 0:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="No live workers to run the task",
+            headers=headers,
+        )
+
+    if stats.load >= stats.limit:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"Queue is full ({stats.load}/{stats.limit} tasks queued)",
+            headers=headers,
+        )
@@ -1,10 +1,19 @@
+import json
 from typing import Optional
 
 import typer
 from dishka import AsyncContainer
 
 from chronos.core.async_typer import AsyncTyper
+from chronos.core.settings import Settings
+from chronos.infrastructure.clients.courier import CourierClient
+from chronos.infrastructure.creator_queue import RedisCreatorQueue
+from chronos.infrastructure.recrawl_scheduler import RecrawlScheduler
+from chronos.infrastructure.retry_queue import CreatorRetryQueue
+from chronos.infrastructure.storage.local import LocalStorageManager
+from chronos.schemas.creators.creators import CreatorSchema
 from chronos.services.browser_use import BrowserUseService
+from chronos.utils.sharding import parse_shard
 
 crawler_commands = AsyncTyper(
     name="crawler",
@@ -12,6 +21,17 @@ crawler_commands = AsyncTyper(
 )
 
 
+def _validate_shard(value: Optional[str]) -> Optional[str]:
+    if value is None:
+        return None
+
+    try:
+        parse_shard(value=value)
+    except ValueError as e:
+        raise typer.BadParameter(str(e)) from e
+    return value
+
+
 @crawler_commands.command()
 async def run_crawler(
     ctx: typer.Context,
@@ -58,6 +78,17 @@ async def run_crawler(
         "--reopen-browser",
         help="Reopen the browser for each run. If set to true, the browser will be closed and reopened for each run.",  # noqa: E501
     ),
+    shard: Optional[str] = typer.Option(
+        None,
+        "--shard",
+        callback=_validate_shard,
+        help="Only process this instance's share of the input file, as INDEX/COUNT (e.g. 0/4).",
+    ),
+    seed: Optional[int] = typer.Option(
+        None,
+        "--seed",
+        help="Seed for shuffling the input file, so every run processes it in the same order.",
+    ),
 ) -> None:
     """[green]Run[/green] crawler task."""
     ctx_container: AsyncContainer = ctx.obj.get("container")
@@ -71,4 +102,79 @@ async def run_crawler(
         headless=headless,
         browser_path=browser_path,
         reopen_browser=reopen_browser,
+        shard=shard,
+        seed=seed,
     )
+
+
+@crawler_commands.command()
+async def push_creators(
+    ctx: typer.Context,
+    limit: Optional[int] = typer.Option(
+        None,
+        "--limit",
+        "-l",
+        help="Maximum number of creators to push. If not provided, all creators will be pushed.",
+    ),
+    input_file: Optional[str] = typer.Option(
+        None,
+        "--input-file",
+        help="Path to a JSON file in storage/ containing usernames. If not provided, creators are read from Courier.",
+    ),
+    recrawl: bool = typer.Option(
+        False,
+        "--recrawl",
+        help="Register creators with the recrawl scheduler instead of the one-off work queue.",
+    ),
+) -> None:
+    """[green]Push[/green] creators to the shared Redis work queue or recrawl schedule."""
+    ctx_container: AsyncContainer = ctx.obj.get("container")
+    settings: Settings = await ctx_container.get(Settings)
+    if recrawl:
+        recrawl_scheduler: RecrawlScheduler = await ctx_container.get(RecrawlScheduler)
+        push = recrawl_scheduler.schedule
+    else:
+        creator_queue: RedisCreatorQueue = await ctx_container.get(RedisCreatorQueue)
+        push = creator_queue.push
+
+    if input_file:
+        usernames = await LocalStorageManager(settings=settings).aread_file(file_key=input_file, file_type="json")
+        await push([CreatorSchema(unique_id=username) for username in usernames[:limit]])
+        return
+
+    courier_client: CourierClient = await ctx_container.get(CourierClient)
+    batch = []
+    async for creator in courier_client.iter_clairvoy_creators(limit=limit):
+        batch.append(creator)
+        if len(batch) >= settings.courier_page_size:
+            await push(batch)
+            batch = []
+
+    if batch:
+        await push(batch)
+
+
+@crawler_commands.command()
+async def dead_letters(
+    ctx: typer.Context,
+    limit: int = typer.Option(
+        100,
+        "--limit",
+        "-l",
+        help="Maximum number of dead-lettered creators to show or requeue.",
+    ),
+    requeue: bool = typer.Option(
+        False,
+        "--requeue",
+        help="Move dead-lettered creators back to the retry queue with fresh attempt counts.",
+    ),
+) -> None:
+    """[green]Inspect[/green] creators that exhausted their retries."""
+    ctx_container: AsyncContainer = ctx.obj.get("container")
+    retry_queue: CreatorRetryQueue = await ctx_container.get(CreatorRetryQueue)
+    if requeue:
+        await retry_queue.requeue_dead_letters(limit=limit)
+        return
+
+    for record in await retry_queue.dead_letters(limit=limit):
+        typer.echo(json.dumps(record, ensure_ascii=False))
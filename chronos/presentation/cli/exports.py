@@ -0,0 +1,41 @@
+from datetime import datetime
+from typing import Optional
+
+import typer
+from dishka import AsyncContainer
+
+from chronos.core.async_typer import AsyncTyper
+from chronos.services.exports import ExportService
+
+export_commands = AsyncTyper(
+    name="export",
+    help="[yellow]Export[/yellow] crawled data",
+)
+
+
+@export_commands.command()
+async def parquet(
+    ctx: typer.Context,
+    platform: str = typer.Option(
+        ...,
+        "--platform",
+        "-p",
+        help="Platform whose extracted profiles should be exported (e.g., tiktok).",
+    ),
+    action: str = typer.Option(
+        ...,
+        "--action",
+        "-a",
+        help="Action whose extracted profiles should be exported (e.g., affiliate).",
+    ),
+    since: Optional[datetime] = typer.Option(
+        None,
+        "--since",
+        formats=["%Y-%m-%d", "%Y-%m-%dT%H:%M:%S"],
+        help="Only export snapshots stored at or after this time (UTC).",
+    ),
+) -> None:
+    """[green]Export[/green] extracted profiles to partitioned parquet files."""
+    ctx_container: AsyncContainer = ctx.obj.get("container")
+    export_service: ExportService = await ctx_container.get(ExportService)
+    await export_service.export_parquet(platform=platform, action=action, since=since)
@@ -0,0 +1,49 @@
+from typing import Optional
+
+import typer
+from dishka import AsyncContainer
+
+from chronos.application.task_queue.run_service import EnqueueRunService
+from chronos.core.async_typer import AsyncTyper
+from chronos.services.retention import RetentionService
+
+retention_commands = AsyncTyper(
+    name="retention",
+    help="[yellow]Compact[/yellow] and clean up stored data",
+)
+
+
+@retention_commands.command()
+async def apply(
+    ctx: typer.Context,
+    prefix: Optional[str] = typer.Option(
+        None,
+        "--prefix",
+        help="Only apply the configured policies whose prefix starts with this value (e.g., traces/).",
+    ),
+    dry_run: bool = typer.Option(
+        False,
+        "--dry-run",
+        help="Report what would be archived or deleted without touching storage.",
+    ),
+    enqueue: bool = typer.Option(
+        False,
+        "--enqueue",
+        help="Send the job to the worker queue instead of running it in this process.",
+    ),
+) -> None:
+    """[green]Apply[/green] retention and compaction policies to the storage tree."""
+    ctx_container: AsyncContainer = ctx.obj.get("container")
+    if enqueue:
+        enqueue_service: EnqueueRunService = await ctx_container.get(EnqueueRunService)
+        await enqueue_service(
+            payload={
+                "service": "retention.Retention",
+                "func": "apply",
+                "params": {"prefix": prefix, "dry_run": dry_run},
+            }
+        )
+        return
+
+    retention_service: RetentionService = await ctx_container.get(RetentionService)
+    await retention_service.apply(prefix=prefix, dry_run=dry_run)
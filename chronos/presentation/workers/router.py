@@ -1,14 +1,70 @@
-from faststream.nats import NatsRoute, NatsRouter
+from typing import List
 
-from chronos.presentation.workers.run_service import run_service
+from faststream.nats import JStream, NatsRoute, NatsRouter, PullSub
+from nats.js.api import ConsumerConfig
+
+from chronos.core.settings import settings
+from chronos.presentation.workers.run_service import cancel_service, run_service, run_service_durable
+from chronos.schemas.enums.tasks import TaskPriority
+from chronos.schemas.services.run_service import RUN_SERVICE_SUBJECT, run_service_subject, served_routing_keys
+
+
+def make_run_service_routes() -> List[NatsRoute]:
+    # Each key gets an exact subject and its own consumer, so no message matches two subscriptions.
+    # Tasks published without a routing key land on `default`.
+    routing_keys = served_routing_keys()
+    lanes = [(priority, key) for priority in TaskPriority for key in routing_keys]
+
+    # The bare subject keeps messages from older publishers flowing, handled by the default workers
+    legacy = [(TaskPriority.NORMAL, None)] if "default" in routing_keys else []
+
+    routes = []
+    for priority, key in [*lanes, *legacy]:
+        subject = run_service_subject(priority=priority, routing_key=key) if key else RUN_SERVICE_SUBJECT
+        if not settings.jetstream_enabled:
+            # Every lane may take up to the full capacity, the scheduler's slots decide which lane runs next
+            routes.append(
+                NatsRoute(
+                    call=run_service,
+                    subject=subject,
+                    queue="chronos_queue",
+                    max_workers=settings.worker_max_concurrency,
+                )
+            )
+            continue
+
+        routes.append(
+            NatsRoute(
+                call=run_service_durable,
+                subject=subject,
+                stream=stream,
+                durable=f"{settings.jetstream_durable}_{subject.replace('.', '_')}",
+                config=ConsumerConfig(
+                    ack_wait=settings.jetstream_ack_wait,
+                    max_deliver=settings.jetstream_max_deliver,
+                ),
+                # A single-message pull loop: the handler holds it until a scheduler slot is free and then
+                # hands the message to a background job, so only messages this worker can start are fetched
+                pull_sub=PullSub(batch_size=1),
+                no_ack=True,  # acked by the job once the service finished
+            )
+        )
+
+    return routes
+
+
+stream = JStream(
+    name=settings.jetstream_stream,
+    subjects=[RUN_SERVICE_SUBJECT, f"{RUN_SERVICE_SUBJECT}.>", settings.jetstream_dlq_subject],
+)
 
 router = NatsRouter(
     handlers=[
+        *make_run_service_routes(),
+        # No queue group: every worker receives the cancel and only the one running the task acts on it
         NatsRoute(
-            call=run_service,
-            subject="run_service",
-            queue="chronos_queue",
-            max_workers=1,
+            call=cancel_service,
+            subject="cancel_service",
         ),
     ],
 )
@@ -1,85 +1,209 @@
-import inspect
+import asyncio
 from inspect import isawaitable
-from typing import Annotated, Any, Awaitable, Callable, Dict, TypeVar, Union
+from typing import Annotated, Awaitable, Dict, Optional, Set, TypeVar, Union
 
 from dishka import AsyncContainer, FromDishka
 from dishka.integrations.faststream import inject
-from fastapi.dependencies.utils import get_typed_signature
+from faststream.nats.annotations import NatsMessage
 from loguru import logger
-from pydantic import BaseModel, TypeAdapter
+from pydantic import ValidationError
 
-from chronos.schemas.services.run_service import RunServicePayload
-from chronos.utils.module_loading import import_string
+from chronos.core.settings import Settings, settings
+from chronos.infrastructure.jobs import JobTracker
+from chronos.infrastructure.nats_client import NatsClient
+from chronos.infrastructure.task_queue.handlers import HandlerRegistry
+from chronos.infrastructure.task_queue.scheduler import WeightedScheduler
+from chronos.schemas.enums.tasks import JobStatus
+from chronos.schemas.services.run_service import CancelServicePayload, RunServicePayload
+from chronos.utils.constants import HANDLER_NOT_ALLOWED, HANDLER_NOT_SUPPORTED
 
 T = TypeVar("T")
 
+HANDLER_ERRORS = (HANDLER_NOT_ALLOWED, HANDLER_NOT_SUPPORTED)
+
+# In-flight tasks of this worker process, so a broadcast cancel can find its target
+running_tasks: Dict[str, asyncio.Task] = {}
+
+# Tasks stopped through `cancel_service`, any other cancellation means this worker is shutting down
+cancel_requested: Set[str] = set()
+
+WORKER_SHUTDOWN = "Worker shut down while the task was running"
+
+# Bounds tasks running in this process across all priority lanes
+scheduler = WeightedScheduler(capacity=settings.worker_max_concurrency, weights=settings.worker_priority_weights)
+
 
 @inject
 async def run_service(
     container: Annotated[AsyncContainer, FromDishka()],
+    job_tracker: Annotated[JobTracker, FromDishka()],
     payload: RunServicePayload,
 ) -> None:
-    async with container() as request_container:
-        service_class = import_string(dotted_path=payload.service_)
-        service_instance = await request_container.get(service_class)
-
-        service_func = getattr(service_instance, payload.func)
-        validated_kwargs = await get_handler_params(service_func, **payload.params)
-
-        await maybe_awaitable(func=service_func(**validated_kwargs))
-
-
-async def get_handler_params(func: Callable[..., Any], **kwargs: Dict[str, Any]) -> Dict[str, Any]:
-    func_signature = get_typed_signature(func)
-    signature_params = func_signature.parameters
-    validated_kwargs = {}
-
-    for param_name, param in signature_params.items():
-        if param.kind == inspect.Parameter.VAR_POSITIONAL:
-            msg = f"Positional arguments are not supported in {func.__name__}"
-            raise Exception(msg)
-
-        adapter = analyze_param(func=func, param_name=param_name, annotation=param.annotation)
-        if param_name in kwargs:
-            value = kwargs[param_name]
-        elif param.default != inspect.Signature.empty:
-            value = param.default
-        else:
-            msg = f"No value provided for {param_name}"
-            raise Exception(msg)
-
-        if adapter:
-            if hasattr(adapter, "model_validate"):
-                validated_value = adapter.model_validate(value)
-            elif hasattr(adapter, "validate_python"):
-                validated_value = adapter.validate_python(value)
+    _track(task_id=payload.task_id, task=asyncio.current_task())
+    try:
+        async with scheduler.slot(lane=payload.priority):
+            await execute_service(container=container, payload=payload)
+    except asyncio.CancelledError:
+        if await _cancelled_on_request(job_tracker=job_tracker, task_id=payload.task_id):
+            return
+        # Core subscriptions never redeliver, so a task interrupted by a shutdown is lost
+        await job_tracker.finish(job_id=payload.task_id, status=JobStatus.FAILED, error=WORKER_SHUTDOWN)
+        raise
+    except Exception as e:
+        # Core subscriptions never redeliver, so the first failure is final
+        await job_tracker.finish(job_id=payload.task_id, status=JobStatus.FAILED, error=str(e))
+        raise
+    finally:
+        _forget(task_id=payload.task_id)
+
+
+@inject
+async def run_service_durable(
+    container: Annotated[AsyncContainer, FromDishka()],
+    job_tracker: Annotated[JobTracker, FromDishka()],
+    settings: Annotated[Settings, FromDishka()],
+    payload: RunServicePayload,
+    message: NatsMessage,
+) -> None:
+    # Started on receipt, so the message isn't redelivered to a peer while it waits for a slot
+    heartbeat = asyncio.create_task(_keep_in_progress(message=message, interval=settings.jetstream_heartbeat_interval))
+    _track(task_id=payload.task_id, task=asyncio.current_task())
+    try:
+        # The lane's pull loop waits on this handler, so nothing more is fetched until a slot is free
+        await scheduler.acquire(lane=payload.priority)
+    except asyncio.CancelledError:
+        heartbeat.cancel()
+        _forget(task_id=payload.task_id)
+        if not await _settle_cancelled(job_tracker=job_tracker, payload=payload, message=message):
+            raise
+        return
+
+    # The handler's request scope closes once it returns, so the job resolves from the app container
+    job = asyncio.create_task(
+        _run_durable(
+            container=container.parent_container or container,
+            payload=payload,
+            message=message,
+            heartbeat=heartbeat,
+        )
+    )
+    _track(task_id=payload.task_id, task=job)
+
+
+async def _run_durable(
+    container: AsyncContainer,
+    payload: RunServicePayload,
+    message: NatsMessage,
+    heartbeat: asyncio.Task,
+) -> None:
+    """Runs a fetched message in the slot its handler acquired and settles it with the stream."""
+    deliveries = message.raw_message.metadata.num_delivered
+    try:
+        settings = await container.get(Settings)
+        job_tracker = await container.get(JobTracker)
+        nats_client = await container.get(NatsClient)
+        try:
+            await execute_service(container=container, payload=payload)
+            await message.ack()
+        except asyncio.CancelledError:
+            if not await _settle_cancelled(job_tracker=job_tracker, payload=payload, message=message):
+                raise
+        except Exception as e:
+            # Unknown handlers and invalid params fail the same way on every delivery
+            permanent = isinstance(e, ValidationError) or getattr(e, "error_code", None) in HANDLER_ERRORS
+            if permanent or deliveries >= settings.jetstream_max_deliver:
+                logger.error(
+                    f"🛑 Task `{payload.task_id}` failed {deliveries} times, moving it to the dead letter subject"
+                )
+                await nats_client.publish_durable(
+                    subject=settings.jetstream_dlq_subject,
+                    message={"payload": payload.model_dump(), "error": str(e), "deliveries": deliveries},
+                    headers={"content-type": "application/json"},
+                )
+                await job_tracker.finish(job_id=payload.task_id, status=JobStatus.FAILED, error=str(e))
+                await message.reject()
             else:
-                msg = f"Not supported for {adapter.__class__.__name__}"
-                raise Exception(msg)
+                await job_tracker.retry(job_id=payload.task_id, error=str(e))
+                delay = settings.jetstream_retry_delay * 2 ** (deliveries - 1)
+                logger.warning(f"⚠️ Task `{payload.task_id}` failed ({e}), redelivering in {delay}s")
+                await message.nack(delay=delay)
+    finally:
+        scheduler.release()
+        heartbeat.cancel()
+        _forget(task_id=payload.task_id)
+
+
+async def execute_service(container: AsyncContainer, payload: RunServicePayload) -> None:
+    """Runs the payload's handler, the caller holds a scheduler slot and settles cancellations."""
+    job_tracker = await container.get(JobTracker)
+    # The registry is app-scoped, so each handler is compiled once and reused for every later message
+    handlers = await container.get(HandlerRegistry)
+    async with container() as request_container:
+        await job_tracker.start(job_id=payload.task_id)
+        handler = handlers.get(service=payload.service, func=payload.func)
+        # Handlers that accept `task_id` get the one assigned to the message
+        validated_kwargs = handler.validate(params={**payload.params, "task_id": payload.task_id})
 
-            validated_kwargs[param_name] = validated_value
-        elif param_name in kwargs:
-            validated_kwargs[param_name] = value
+        service_instance = await request_container.get(handler.service_class)
+        await maybe_awaitable(func=getattr(service_instance, handler.func_name)(**validated_kwargs))
 
-    return validated_kwargs
+    await job_tracker.finish(job_id=payload.task_id, status=JobStatus.SUCCEEDED)
 
 
-def analyze_param(func: Callable[..., Any], param_name: str, annotation: Any) -> Any:
-    if annotation is inspect.Signature.empty:
-        logger.error(f"Parameter {param_name} needs to be annotated with type in {func.__name__}")
+async def stop_running_tasks() -> None:
+    """Interrupt every task of this worker on shutdown, durable ones go back to the stream for its peers."""
+    tasks = list(running_tasks.values())
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def cancel_service(payload: CancelServicePayload) -> None:
+    task = running_tasks.get(payload.task_id)
+    if task:
+        logger.info(f"🛑 Cancelling task `{payload.task_id}`")
+        cancel_requested.add(payload.task_id)
+        task.cancel()
+
+
+async def _cancelled_on_request(job_tracker: JobTracker, task_id: str) -> bool:
+    """Record a cancellation that came through `cancel_service`, anything else is a shutdown."""
+    if task_id not in cancel_requested:
+        return False
+
+    logger.warning(f"⚠️ Task `{task_id}` was cancelled")
+    await job_tracker.finish(job_id=task_id, status=JobStatus.CANCELLED)
+    return True
+
+
+async def _settle_cancelled(job_tracker: JobTracker, payload: RunServicePayload, message: NatsMessage) -> bool:
+    """Terminate a message cancelled on request, or hand it back to the stream when the worker shuts down."""
+    if await _cancelled_on_request(job_tracker=job_tracker, task_id=payload.task_id):
+        # A cancelled task was stopped on purpose and must not be redelivered
+        await message.reject()
+        return True
+
+    logger.warning(f"⚠️ Task `{payload.task_id}` was interrupted by a shutdown, returning it to the stream")
+    await job_tracker.retry(job_id=payload.task_id, error=WORKER_SHUTDOWN)
+    await message.nack()
+    return False
+
+
+def _track(task_id: str, task: Optional[asyncio.Task]) -> None:
+    if task:
+        running_tasks[task_id] = task
+
+
+def _forget(task_id: str) -> None:
+    running_tasks.pop(task_id, None)
+    cancel_requested.discard(task_id)
 
-    if isinstance(annotation, TypeAdapter):
-        adapter = annotation
-    elif inspect.isclass(annotation) and issubclass(annotation, BaseModel):
-        adapter = annotation  # type: ignore
-    else:
-        try:
-            adapter = TypeAdapter(annotation)
-        except Exception as err:
-            logger.error(f"Not supported for {annotation}")
-            raise err
 
-    return adapter
+async def _keep_in_progress(message: NatsMessage, interval: float) -> None:
+    # Resets the consumer's ack timer so long crawls aren't redelivered to another worker
+    while True:
+        await asyncio.sleep(interval)
+        await message.in_progress()
 
 
 async def maybe_awaitable(func: Union[T, Awaitable[T]]) -> T:
@@ -9,3 +9,4 @@ class LLMProvider(StrEnum):
 class StorageProvider(StrEnum):
     AWS_S3 = "AWS_S3"
     LOCAL = "LOCAL"
+    TIERED = "TIERED"
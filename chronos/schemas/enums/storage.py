@@ -0,0 +1,7 @@
+from enum import StrEnum
+
+
+class SnapshotLayout(StrEnum):
+    FILES = "FILES"
+    SEGMENTS = "SEGMENTS"
+    DELTAS = "DELTAS"
@@ -0,0 +1,28 @@
+from enum import StrEnum
+
+
+class TaskPriority(StrEnum):
+    HIGH = "HIGH"
+    NORMAL = "NORMAL"
+    LOW = "LOW"
+
+
+class CreatorSource(StrEnum):
+    COURIER = "COURIER"
+    REDIS = "REDIS"
+    SCHEDULE = "SCHEDULE"
+
+
+class RetryReason(StrEnum):
+    TIMEOUT = "TIMEOUT"
+    CAPTCHA = "CAPTCHA"
+    ERROR = "ERROR"
+
+
+class JobStatus(StrEnum):
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    RETRYING = "RETRYING"
+    SUCCEEDED = "SUCCEEDED"
+    FAILED = "FAILED"
+    CANCELLED = "CANCELLED"
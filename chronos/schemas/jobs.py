@@ -0,0 +1,38 @@
+import time
+from typing import Optional
+
+from pydantic import BaseModel, computed_field
+
+from chronos.schemas.enums.tasks import JobStatus
+
+JOB_FINAL_STATUSES = (JobStatus.SUCCEEDED, JobStatus.FAILED, JobStatus.CANCELLED)
+
+
+class JobSchema(BaseModel):
+    job_id: str
+    status: Optional[JobStatus] = None
+    service: Optional[str] = None
+    func: Optional[str] = None
+    error: Optional[str] = None
+    created_at: Optional[float] = None
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    # Progress counters, written by crawlers while the job runs
+    processed: int = 0
+    skipped: int = 0
+    failed: int = 0
+    captchas: int = 0
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def creators_per_minute(self) -> float:
+        if not self.started_at:
+            return 0.0
+
+        minutes = ((self.finished_at or time.time()) - self.started_at) / 60
+        return round(self.processed / minutes, 2) if minutes > 0 else 0.0
+
+    @property
+    def is_final(self) -> bool:
+        return self.status in JOB_FINAL_STATUSES
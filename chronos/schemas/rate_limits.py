@@ -0,0 +1,6 @@
+from pydantic import BaseModel, Field
+
+
+class RateBudget(BaseModel):
+    rate_per_minute: float = Field(gt=0)
+    burst: int = Field(default=1, ge=1)  # bucket capacity, requests allowed back to back after idling
@@ -0,0 +1,13 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class RetentionPolicy(BaseModel):
+    prefix: str
+    pattern: Optional[str] = None  # fnmatch pattern applied to the full key
+    max_age_days: Optional[float] = None
+    max_count: Optional[int] = None  # per directory, newest files are kept
+    max_bytes: Optional[int] = None  # whole prefix, oldest files go first
+    archive_after_days: Optional[float] = None
+    local: bool = False  # files written straight under `local_storage_dir`, cleaned there whatever the provider
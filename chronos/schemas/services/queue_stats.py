@@ -0,0 +1,24 @@
+from pydantic import BaseModel, computed_field
+
+
+class WorkerHeartbeatSchema(BaseModel):
+    worker_id: str
+    capacity: int
+    running: int
+    waiting: int
+    timestamp: float
+
+
+class QueueStatsSchema(BaseModel):
+    depth: int  # tasks accepted but not started yet
+    in_flight: int  # tasks currently running
+    workers: int  # live workers, from heartbeats
+    capacity: int  # total task slots across live workers
+    source: str  # where `depth` comes from: "jetstream" or "heartbeats"
+    limit: int  # `load` at which new tasks are refused
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def load(self) -> int:
+        # Core NATS keeps no backlog beyond what workers hold, so their busy slots count against the limit too
+        return self.depth if self.source == "jetstream" else self.depth + self.in_flight
@@ -1,20 +1,72 @@
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
+from uuid import uuid4
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, field_validator
+
+from chronos.core.settings import settings
+from chronos.schemas.enums.tasks import TaskPriority
+
+RUN_SERVICE_SUBJECT = "run_service"
 
 
 class RunServicePayload(BaseModel):
+    task_id: str = Field(default_factory=lambda: uuid4().hex)
     service: str
     func: str
     params: Dict[str, Any] = {}
+    priority: TaskPriority = TaskPriority.NORMAL
+    routing_key: Optional[str] = Field(default=None, pattern=r"^[\w-]+(\.[\w-]+)*$")  # e.g. tiktok.affiliate
+
+    @field_validator("routing_key")
+    @classmethod
+    def _served_routing_key(cls, routing_key: Optional[str]) -> Optional[str]:
+        # Nothing consumes a key outside the configured ones, so the task would never run
+        if routing_key is not None and routing_key.lower() not in served_routing_keys():
+            msg = f"Unknown routing key {routing_key}, expected one of {', '.join(served_routing_keys())}"
+            raise ValueError(msg)
+        return routing_key
+
+    @property
+    def subject_(self) -> str:
+        return run_service_subject(priority=self.priority, routing_key=self.routing_key)
 
     @property
     def service_(self) -> str:
-        formatted_service = self.service
-        if not formatted_service.endswith("Service"):
-            formatted_service += "Service"
+        return service_path(service=self.service)
+
+
+class CancelServicePayload(BaseModel):
+    task_id: str
+
+
+class BulkEnqueueItemResult(BaseModel):
+    index: int
+    task_id: Optional[str] = None
+    accepted: bool
+    error: Optional[str] = None
+
+
+class BulkEnqueueResult(BaseModel):
+    accepted: int = 0
+    rejected: int = 0
+    results: List[BulkEnqueueItemResult] = []
+    error: Optional[str] = None  # set when the body could not be read to the end
+
+
+def served_routing_keys() -> List[str]:
+    return [key.lower() for key in settings.worker_routing_keys] or ["default"]
+
+
+def run_service_subject(priority: TaskPriority, routing_key: Optional[str] = None) -> str:
+    return f"{RUN_SERVICE_SUBJECT}.{priority.lower()}.{(routing_key or 'default').lower()}"
+
+
+def service_path(service: str) -> str:
+    formatted_service = service
+    if not formatted_service.endswith("Service"):
+        formatted_service += "Service"
 
-        if not formatted_service.startswith("chronos.services."):
-            formatted_service = f"chronos.services.{formatted_service}"
+    if not formatted_service.startswith("chronos.services."):
+        formatted_service = f"chronos.services.{formatted_service}"
 
-        return formatted_service
+    return formatted_service
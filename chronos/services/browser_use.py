@@ -1,4 +1,5 @@
 from typing import Dict, List, Optional
+from uuid import uuid4
 
 from browser_use import BrowserConfig, BrowserContextConfig
 from langchain_core.language_models import BaseLanguageModel
@@ -6,6 +7,7 @@ from redis.asyncio import ConnectionPool
 
 from chronos.application.task_queue.run_service import EnqueueRunService
 from chronos.core.settings import Settings
+from chronos.infrastructure.browser_pool import BrowserPool
 from chronos.infrastructure.browser_use import BrowserClient
 from chronos.infrastructure.clients.captcha import CaptchaClient
 from chronos.infrastructure.clients.courier import CourierClient
@@ -23,6 +25,7 @@ class BrowserUseService:
         courier_client: CourierClient,
         captcha_client: CaptchaClient,
         storage_manager: StorageManager,
+        browser_pool: BrowserPool,
         llm_providers: Dict[LLMProvider, BaseLanguageModel],
     ) -> None:
         self._settings = settings
@@ -31,6 +34,7 @@ class BrowserUseService:
         self._courier_client = courier_client
         self._captcha_client = captcha_client
         self._storage_manager = storage_manager
+        self._browser_pool = browser_pool
         self._llm_providers = llm_providers
 
         self._trace_path = self._settings.trace_path
@@ -92,7 +96,13 @@ class BrowserUseService:
         headless: bool = False,
         browser_path: Optional[str] = None,
         reopen_browser: bool = False,
+        shard: Optional[str] = None,
+        seed: Optional[int] = None,
+        task_id: Optional[str] = None,
     ) -> None:
+        # Only tasks that came through the queue have a job to report progress to
+        job_id = task_id
+        task_id = task_id or uuid4().hex
         platform_class = Platform.from_str(key=f"{platform.upper()}_{action.upper()}")
 
         # Get the appropriate LLM based on settings
@@ -111,17 +121,28 @@ class BrowserUseService:
         )
 
         context_config = BrowserContextConfig(trace_path=self._trace_path, cookies_file=self._cookies_file)
-        while True:
-            browser = self._new_browser(headless=headless, browser_path=browser_path)
-            browser_context = await browser.new_context(config=context_config)
-            async with browser_context as context:
-                await crawler.execute(
-                    configs=platform_class.configs,
-                    context=context,
-                    limit=limit,
-                    input_file=input_file,
-                    save_results=save_results,
-                )
+        async with self._browser_pool.lease(task_id=task_id):
+            while True:
+                browser = self._new_browser(headless=headless, browser_path=browser_path)
+                try:
+                    browser_context = await browser.new_context(config=context_config)
+                    async with browser_context as context:
+                        await crawler.execute(
+                            configs=platform_class.configs,
+                            context=context,
+                            limit=limit,
+                            input_file=input_file,
+                            save_results=save_results,
+                            shard=shard,
+                            seed=seed,
+                            job_id=job_id,
+                        )
+                except Exception:
+                    # The crawler already logged the failure, a reopening run carries on in a new browser
+                    if not reopen_browser:
+                        raise
+                finally:
+                    await browser.close()
 
-            if not reopen_browser:
-                break
+                if not reopen_browser:
+                    break
@@ -28,6 +28,7 @@ class BaseCaptchaSolver(ABC):
         self._page = page
         self._mouse_step_size = mouse_step_size
         self._mouse_step_delay_ms = mouse_step_delay_ms
+        self._encountered = False
 
         self._local_storage = LocalStorageManager(settings=self._settings)
 
@@ -35,6 +36,8 @@ class BaseCaptchaSolver(ABC):
         if not await self.captcha_is_present(timeout=timeout):
             return True
 
+        self._encountered = True
+
         match await self.identify_captcha():
             case CaptchaType.PUZZLE_V1:
                 return await self.solve_puzzle_v1(retries=retries)
@@ -55,6 +58,10 @@ class BaseCaptchaSolver(ABC):
 
         return False
 
+    @property
+    def encountered(self) -> bool:
+        return self._encountered
+
     async def _any_selector_visible(self, selectors: List[str]) -> bool:
         for selector in selectors:
             elements = await self._page.locator(selector=selector).all()
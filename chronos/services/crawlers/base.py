@@ -13,6 +13,7 @@ from chronos.infrastructure.clients.captcha import CaptchaClient
 from chronos.infrastructure.clients.courier import CourierClient
 from chronos.infrastructure.storage.base import StorageManager
 from chronos.infrastructure.storage.local import LocalStorageManager
+from chronos.utils.constants import SNAPSHOT_TIMESTAMP_FORMAT
 
 
 class BaseCrawler(ABC):
@@ -54,7 +55,7 @@ class BaseCrawler(ABC):
         is_raw: Optional[bool] = False,
     ) -> str:
         current_time = datetime.now()
-        timestamp_str = current_time.strftime("%y%m%d_%H%M%S")
+        timestamp_str = current_time.strftime(SNAPSHOT_TIMESTAMP_FORMAT)
         raw_part = "raw_" if is_raw else ""
         filename = f"insight_{raw_part}{timestamp_str}"
 
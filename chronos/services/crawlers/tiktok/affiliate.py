@@ -2,10 +2,10 @@ import asyncio
 import json
 import random
 import re
-import tempfile
 import time
 import traceback
-from typing import TYPE_CHECKING, Any, Dict, List, Optional
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional
 from urllib.parse import urlencode, urlparse
 
 import aiohttp
@@ -15,8 +15,19 @@ from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 from playwright_stealth.stealth import StealthConfig, stealth_async
 
 from chronos.infrastructure.browser_use import PatchedBrowserContext
-from chronos.infrastructure.exceptions import ApplicationError
+from chronos.infrastructure.creator_queue import RedisCreatorQueue
+from chronos.infrastructure.exceptions import ApplicationError, ExternalClientError
+from chronos.infrastructure.jobs import JobTracker
+from chronos.infrastructure.rate_limiter import RedisRateLimiter
+from chronos.infrastructure.recrawl_scheduler import RecrawlScheduler
+from chronos.infrastructure.retry_queue import CreatorRetryQueue
+from chronos.infrastructure.storage.blobs import BlobStore
+from chronos.infrastructure.storage.deltas import DeltaSnapshotStore
+from chronos.infrastructure.storage.parquet import ParquetSink
+from chronos.infrastructure.storage.segments import SegmentStore
 from chronos.schemas.creators.creators import CreatorSchema
+from chronos.schemas.enums.storage import SnapshotLayout
+from chronos.schemas.enums.tasks import CreatorSource, RetryReason
 from chronos.services.captchas.tiktok.solver import TiktokCaptchaSolver
 from chronos.services.crawlers.base import BaseCrawler
 from chronos.services.crawlers.stealth import AsyncStealth
@@ -26,7 +37,8 @@ from chronos.utils.constants import (
     CAPTCHA_NOT_SOLVED,
     TIKTOK_OEMBED_URL,
 )
-from chronos.utils.helpers import cleanup_temp_file, deep_flatten, deep_merge, deep_omit
+from chronos.utils.helpers import deep_flatten, deep_merge, deep_omit
+from chronos.utils.sharding import parse_shard, select_shard
 
 if TYPE_CHECKING:
     from chronos.schemas.enums.platforms import PlatformConfig
@@ -36,12 +48,29 @@ class TiktokAffiliateCrawler(BaseCrawler):
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         super().__init__(*args, **kwargs)
         self._stealth = AsyncStealth()
+        self._creator_storage = self._storage_manager if self._settings.creator_storage_remote else self._local_storage
+        self._segment_store = SegmentStore(
+            settings=self._settings,
+            storage_manager=self._creator_storage,
+            prefix="tiktok/affiliate/creators",
+        )
+        self._blob_store = BlobStore(settings=self._settings, storage_manager=self._creator_storage)
+        self._delta_store = DeltaSnapshotStore(settings=self._settings, storage_manager=self._creator_storage)
+        self._parquet_sink = ParquetSink(settings=self._settings, storage_manager=self._storage_manager)
+        self._creator_queue = RedisCreatorQueue(settings=self._settings, redis_pool=self._redis_pool)
+        self._rate_limiter = RedisRateLimiter(settings=self._settings, redis_pool=self._redis_pool)
+        self._recrawl_scheduler = RecrawlScheduler(settings=self._settings, redis_pool=self._redis_pool)
+        self._retry_queue = CreatorRetryQueue(settings=self._settings, redis_pool=self._redis_pool)
+        self._job_tracker = JobTracker(settings=self._settings, redis_pool=self._redis_pool)
 
         self._otp_wait = 5
         self._list_sleep = 20
         self._creator_sleep = 10
 
+        self._job_id: Optional[str] = None
         self._creators_list: List[CreatorSchema] = []
+        self._claimed_entries: Dict[str, str] = {}  # uniqueId -> stream entry id
+        self._current_account: str = "default"  # login email, keys the per-account rate budgets
         self._current_creator: Dict[str, Any] = {}
         self._current_handle: str = ""  # uniqueId
         self._current_cid: str = ""  # creatorId
@@ -66,27 +95,48 @@ class TiktokAffiliateCrawler(BaseCrawler):
         limit: Optional[int] = None,
         input_file: Optional[str] = None,
         save_results: bool = False,
+        shard: Optional[str] = None,
+        seed: Optional[int] = None,
+        job_id: Optional[str] = None,
         **kwargs: Any,
     ) -> None:
         _, page = kwargs, None
+        self._job_id = job_id
         try:
             page = await self._execute_login_flow(context=context, configs=configs)
             await page.wait_for_load_state(state="load", timeout=0)
             await page.context.route(url=self._intercept_pattern, handler=self._intercept_request)
 
-            self._handle_input_files(input_file=input_file, limit=limit)
+            await self._handle_input_files(input_file=input_file, limit=limit, shard=shard, seed=seed)
 
             while True:
                 logger.info("🔄 Starting a new iteration over creators list")
 
-                creators = self._creators_list or await self._courier_client.get_clairvoy_creators(limit=limit)
-                for index, creator in enumerate(creators):
-                    logger.info(f"🟢 Processing `{creator.unique_id}` - ({index + 1}/{len(creators)})")
+                total = len(self._creators_list) or "?"
+                index = 0
+                async for creator in self._iter_creators(limit=limit):
+                    index += 1
+                    logger.info(f"🟢 Processing `{creator.unique_id}` - ({index}/{total})")
                     start_time = time.time()
                     self._current_handle = creator.unique_id
 
                     try:
-                        if not await self._creator_exists(creator_id=creator.unique_id):
+                        exists = await self._creator_exists(creator_id=creator.unique_id)
+                        if exists is None:
+                            # The check failed, so the creator goes to the retry queue instead of being completed
+                            await self._retry_creator(
+                                creator=creator,
+                                reason=RetryReason.ERROR,
+                                error="Creator existence check failed",
+                            )
+                            continue
+
+                        if not exists:
+                            await self._complete_creator(unique_id=creator.unique_id)
+                            await self._track_progress(counter="skipped")
+                            # Only a definite not-found drops the creator and its learned schedule
+                            if self._settings.creator_source == CreatorSource.SCHEDULE:
+                                await self._recrawl_scheduler.forget(unique_id=creator.unique_id)
                             continue
 
                         await self._solve_captcha_if_present(page=page)
@@ -98,12 +148,15 @@ class TiktokAffiliateCrawler(BaseCrawler):
                             save_results=save_results,
                         )
                         logger.success(f"✅ Processed `{creator.unique_id}` in {time.time() - start_time:.2f}s")
+                        await self._complete_creator(unique_id=creator.unique_id)
+                        await self._track_progress(counter="processed")
 
                         page = await context.get_current_page()
                         await self._stealth.simulate_human_reading(page, self._creator_sleep, context_type="search")
 
-                    except PlaywrightTimeoutError:
+                    except PlaywrightTimeoutError as timeout_error:
                         logger.warning(f"⚠️ Timeout occurred while processing creator `{creator.unique_id}`")
+                        file_key = None
                         try:
                             file_key = f"{self._settings.local_storage_dir}/{self._generate_file_key(
                               platform="tiktok",
@@ -117,18 +170,39 @@ class TiktokAffiliateCrawler(BaseCrawler):
                         except Exception as e:
                             logger.debug(f"🛑 Failed to save screenshot for `{creator.unique_id}`: {e}")
 
+                        await self._retry_creator(
+                            creator=creator,
+                            reason=RetryReason.TIMEOUT,
+                            error=str(timeout_error),
+                            artifacts=[file_key] if file_key else None,
+                        )
+
+                    except ApplicationError as e:
+                        reason = RetryReason.CAPTCHA if e.error_code == CAPTCHA_NOT_SOLVED else RetryReason.ERROR
+                        await self._retry_creator(creator=creator, reason=reason, error=str(e))
+                        raise
+
+                    except Exception as e:
+                        await self._retry_creator(creator=creator, reason=RetryReason.ERROR, error=repr(e))
+                        raise
+
                     logger.info("-" * 30)
 
                 await self._stealth.simulate_human_reading(page=page, duration=self._list_sleep, context_type="search")
 
+        # Re-raised so the job is recorded as failed, a reopening run restarts in a fresh browser
         except ApplicationError as e:
             logger.error(f"🛑 {e.detail}")
+            raise
 
         except Exception:
             logger.error(f"🛑 {traceback.format_exc()}")
             logger.error("🛑 Unexpected error occurred during affiliate handling")
+            raise
 
         finally:
+            await self._segment_store.close()
+            await self._parquet_sink.close()
             try:
                 await page.unroute(url=self._intercept_pattern) if page else None
                 await context.reset_context()
@@ -138,6 +212,11 @@ class TiktokAffiliateCrawler(BaseCrawler):
 
     async def _execute_login_flow(self, context: PatchedBrowserContext, configs: "PlatformConfig") -> Page:
         logger.info("🔐 Starting the login process into the system")
+        # The account keys the rate budgets on every path, including a session that is already logged in
+        credentials = await self._courier_client.get_google_credentials()
+        if credentials:
+            self._current_account = credentials.username
+
         try:
             await context.create_new_tab(url=configs.login_url.format(redirect_url=configs.search_url))
             page = await context.get_current_page()
@@ -155,7 +234,6 @@ class TiktokAffiliateCrawler(BaseCrawler):
             # TODO: Move mouse to the email panel to simulate human behavior
             await page.locator(configs.email_panel_selector).click()
 
-            credentials = await self._courier_client.get_google_credentials()
             if not credentials:
                 msg = "Missing credentials"
                 raise ValueError(msg)
@@ -215,6 +293,7 @@ class TiktokAffiliateCrawler(BaseCrawler):
         await self._stealth.simulate_typing(page=page, selector=configs.search_input_selector, text=creator.unique_id)
         await self._stealth.random_sleep(1.0, 2.0)
 
+        await self._rate_limiter.acquire(budget="affiliate_search", key=self._current_account)
         await page.locator(configs.search_input_selector).press("Enter")
         await self._stealth.random_sleep(10, 20)
 
@@ -235,6 +314,7 @@ class TiktokAffiliateCrawler(BaseCrawler):
         self._detail_query_params["query"] = self._current_handle
         params = urlencode(self._detail_query_params)
 
+        await self._rate_limiter.acquire(budget="affiliate_detail", key=self._current_account)
         await page.goto(
             url=f"{configs.creator_detail_url.format(params=params)}",
             timeout=0,
@@ -253,6 +333,9 @@ class TiktokAffiliateCrawler(BaseCrawler):
         if not creator_data:
             return await context.get_current_page()
 
+        if self._settings.creator_source == CreatorSource.SCHEDULE:
+            await self._recrawl_scheduler.record(unique_id=creator.unique_id, document=creator_data)
+
         await self._courier_client.send_crawl_result(
             payload={
                 "endpoint": "crawler/results",
@@ -263,6 +346,8 @@ class TiktokAffiliateCrawler(BaseCrawler):
             }
         )
         await self._save_creator(creator=creator, creator_data=creator_data) if save_results else None
+        if self._settings.parquet_export_enabled:
+            await self._parquet_sink.add(platform="tiktok", action="affiliate", record=creator_data)
 
         self._current_creator = {}
         self._current_handle = ""
@@ -282,18 +367,25 @@ class TiktokAffiliateCrawler(BaseCrawler):
             mouse_step_delay_ms=10,
         )
 
-        if not await captcha_solver.solve_if_present(timeout=15, retries=3):
+        solved = await captcha_solver.solve_if_present(timeout=15, retries=3)
+        if captcha_solver.encountered:
+            await self._track_progress(counter="captchas")
+
+        if not solved:
             raise ApplicationError(
                 detail="Failed to solve captcha. Restarting the browser...",
                 error_code=CAPTCHA_NOT_SOLVED,
             )
 
-    async def _creator_exists(self, creator_id: str) -> bool:
+    async def _creator_exists(self, creator_id: str) -> Optional[bool]:
+        # `None` means the check itself failed, which proves nothing about the creator
         logger.info(f"🟠 Start checking existence of creator `{creator_id}` via oembed API")
         try:
+            await self._rate_limiter.acquire(budget="oembed", key=urlparse(TIKTOK_OEMBED_URL).netloc)
             async with aiohttp.ClientSession() as session:
                 async with session.get(url=TIKTOK_OEMBED_URL.format(unique_id=creator_id)) as resp:
-                    if resp.status != 200:
+                    # oembed answers unknown handles with a client error, anything else may be transient
+                    if resp.status in (400, 404):
                         logger.warning(f"⚠️ Creator `{creator_id}` does not exist (checked via oembed API)")
                         await self._courier_client.send_crawl_result(
                             payload={
@@ -311,12 +403,16 @@ class TiktokAffiliateCrawler(BaseCrawler):
                         )
                         return False
 
+                    if resp.status != 200:
+                        logger.warning(f"⚠️ Unexpected oembed status {resp.status} for creator `{creator_id}`")
+                        return None
+
                     logger.info(f"✅ Creator `{creator_id}` exists (checked via oembed API)")
                     return True
 
         except Exception as e:
             logger.error(f"🛑 Failed to check existence of creator {creator_id}: {e}")
-            return False
+            return None
 
     async def _extract_profiles(self, creator: CreatorSchema) -> Optional[Dict[str, Any]]:
         logger.info(f"🟣 Start extracting profiles for creator `{creator.unique_id}`")
@@ -346,12 +442,7 @@ class TiktokAffiliateCrawler(BaseCrawler):
     ) -> None:
         logger.info(f"💾 Start saving creator data for `{creator.unique_id}`")
 
-        temp_file_path = ""
         try:
-            with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".json", encoding="utf-8") as temp:
-                json.dump(obj=creator_data, fp=temp, ensure_ascii=False, indent=4)
-                temp_file_path = temp.name
-
             file_key = self._generate_file_key(
                 platform="tiktok",
                 action="affiliate",
@@ -360,7 +451,25 @@ class TiktokAffiliateCrawler(BaseCrawler):
                 file_type="json",
                 is_raw=is_raw,
             )
-            self._local_storage.upload_file(file_path=temp_file_path, file_key=file_key)
+
+            if is_raw and self._settings.raw_blob_dedup:
+                await self._blob_store.save(file_key=file_key, document=creator_data)
+            elif self._settings.snapshot_layout == SnapshotLayout.SEGMENTS:
+                await self._segment_store.append(
+                    record_key=file_key,
+                    record={
+                        "key": file_key,
+                        "unique_id": creator.unique_id,
+                        "is_raw": bool(is_raw),
+                        "saved_at": datetime.now().isoformat(),
+                        "data": creator_data,
+                    },
+                )
+            elif self._settings.snapshot_layout == SnapshotLayout.DELTAS:
+                await self._delta_store.save(file_key=file_key, document=creator_data)
+            else:
+                data = json.dumps(obj=creator_data, ensure_ascii=False, indent=4).encode("utf-8")
+                await self._creator_storage.aupload_bytes(data=data, file_key=file_key, content_type="application/json")
 
             logger.info(
                 f"📂 Successfully saved{' raw' if is_raw else ' extracted'} data of creator: `{creator.unique_id}`"
@@ -369,9 +478,6 @@ class TiktokAffiliateCrawler(BaseCrawler):
         except Exception as e:
             logger.error(f"🛑 Failed to save creator data: {e}")
 
-        finally:
-            await cleanup_temp_file(file_path=temp_file_path)
-
     async def _intercept_request(self, route: Route) -> None:
         logger.debug(f"🟤 Intercepting request: `{urlparse(route.request.url).path}`")
         try:
@@ -409,16 +515,133 @@ class TiktokAffiliateCrawler(BaseCrawler):
             logger.error(f"{e}")
             await route.continue_()
 
-    def _handle_input_files(self, input_file: Optional[str] = None, limit: Optional[int] = None) -> None:
+    async def _iter_creators(self, limit: Optional[int] = None) -> AsyncIterator[CreatorSchema]:
+        # Due retries go ahead of fresh creators, and are drained once more when the source runs out
+        async for creator in self._iter_source_creators(limit=limit):
+            async for retry in self._iter_due_retries():
+                yield retry
+            yield creator
+
+        async for retry in self._iter_due_retries():
+            yield retry
+
+    async def _iter_due_retries(self) -> AsyncIterator[CreatorSchema]:
+        # Claim one retry at a time so its lease starts when the crawl does
+        while batch := await self._retry_queue.claim_due(count=1):
+            yield batch[0]
+
+    async def _iter_source_creators(self, limit: Optional[int] = None) -> AsyncIterator[CreatorSchema]:
+        if self._creators_list:
+            for creator in self._creators_list:
+                yield creator
+            return
+
+        if self._settings.creator_source == CreatorSource.REDIS:
+            async for creator in self._iter_queued_creators(limit=limit):
+                yield creator
+            return
+
+        if self._settings.creator_source == CreatorSource.SCHEDULE:
+            async for creator in self._iter_scheduled_creators(limit=limit):
+                yield creator
+            return
+
+        try:
+            async for creator in self._courier_client.iter_clairvoy_creators(limit=limit):
+                yield creator
+        except ExternalClientError as e:
+            # A courier outage only ends this pass, the crawl loop sleeps and streams the list again
+            logger.error(f"🛑 {e.detail}, retrying on the next pass")
+
+    async def _iter_queued_creators(self, limit: Optional[int] = None) -> AsyncIterator[CreatorSchema]:
+        yielded = 0
+        while not limit or yielded < limit:
+            # An entry still claimed here was never acked, it is redelivered once its visibility timeout lapses
+            self._claimed_entries.clear()
+
+            # Claim one creator at a time so its visibility timeout starts when the crawl does
+            batch = await self._creator_queue.claim(count=1)
+            if not batch:
+                logger.info("📭 Creator queue is drained")
+                return
+
+            entry_id, creator = batch[0]
+            self._claimed_entries[creator.unique_id] = entry_id
+            yielded += 1
+            yield creator
+
+    async def _iter_scheduled_creators(self, limit: Optional[int] = None) -> AsyncIterator[CreatorSchema]:
+        min_gap = 60 / self._settings.recrawl_rate_per_minute
+        yielded, last_claim = 0, 0.0
+        while not limit or yielded < limit:
+            # Claim one creator at a time so its lease starts when the crawl does
+            await asyncio.sleep(max(0.0, last_claim + min_gap - time.monotonic()))
+            batch = await self._recrawl_scheduler.claim_due(count=1)
+            if not batch:
+                next_due_in = await self._recrawl_scheduler.next_due_in()
+                poll_interval = self._settings.recrawl_poll_interval
+                await asyncio.sleep(poll_interval if next_due_in is None else min(next_due_in, poll_interval))
+                continue
+
+            last_claim = time.monotonic()
+            yielded += 1
+            yield batch[0]
+
+    async def _ack_creator(self, unique_id: str) -> None:
+        # Unacked entries (crashes) are handed to another crawler after the visibility timeout
+        entry_id = self._claimed_entries.pop(unique_id, None)
+        if entry_id:
+            await self._creator_queue.ack(entry_id=entry_id)
+
+    async def _complete_creator(self, unique_id: str) -> None:
+        await self._ack_creator(unique_id=unique_id)
+        await self._retry_queue.succeed(unique_id=unique_id)
+
+    async def _retry_creator(
+        self,
+        creator: CreatorSchema,
+        reason: RetryReason,
+        error: str,
+        artifacts: Optional[List[str]] = None,
+    ) -> None:
+        await self._track_progress(counter="failed")
+        try:
+            await self._retry_queue.fail(unique_id=creator.unique_id, reason=reason, error=error, artifacts=artifacts)
+            # The retry queue owns the creator from here, so the work queue must not hand it out again
+            await self._ack_creator(unique_id=creator.unique_id)
+        except Exception as e:
+            logger.error(f"🛑 Failed to schedule retry for `{creator.unique_id}`: {e}")
+
+    async def _track_progress(self, counter: str) -> None:
+        if self._job_id:
+            await self._job_tracker.incr(job_id=self._job_id, counter=counter)
+
+    async def _handle_input_files(
+        self,
+        input_file: Optional[str] = None,
+        limit: Optional[int] = None,
+        shard: Optional[str] = None,
+        seed: Optional[int] = None,
+    ) -> None:
         if input_file:
             logger.debug(f"📂 Read input file: `{input_file}`")
 
-            usernames = self._local_storage.read_file(file_key=input_file, file_type="json")
+            usernames = await self._local_storage.aread_file(file_key=input_file, file_type="json")
             if not isinstance(usernames, list):
                 logger.warning("⚠️ Input JSON must be an array of usernames.")
                 return
 
-            random.shuffle(usernames)
+            if shard:
+                index, count = parse_shard(value=shard)
+                usernames = select_shard(keys=usernames, index=index, count=count)
+                logger.debug(f"🧩 Shard {index}/{count} owns {len(usernames)} usernames")
+
+            if seed is not None:
+                # Sort first so a given seed yields the same order regardless of the file order
+                usernames = sorted(usernames)
+                random.Random(seed).shuffle(usernames)
+            else:
+                random.shuffle(usernames)
             usernames = usernames[:limit] if limit and limit > 1 else usernames
 
             self._creators_list = [CreatorSchema(unique_id=username) for username in usernames]
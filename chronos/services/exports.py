@@ -0,0 +1,90 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from loguru import logger
+
+from chronos.core.settings import Settings
+from chronos.infrastructure.storage.base import StorageManager
+from chronos.infrastructure.storage.compression import ZSTD_EXTENSION
+from chronos.infrastructure.storage.deltas import DELTA_FILE_TYPE, DeltaSnapshotStore
+from chronos.infrastructure.storage.local import LocalStorageManager
+from chronos.infrastructure.storage.parquet import ParquetSink
+from chronos.infrastructure.storage.segments import INDEX_EXTENSION, SEGMENT_EXTENSION, SegmentStore
+from chronos.utils.constants import SNAPSHOT_KEY_PATTERN, SNAPSHOT_TIMESTAMP_FORMAT
+
+
+class ExportService:
+    def __init__(self, settings: Settings, storage_manager: StorageManager) -> None:
+        self._settings = settings
+        self._storage_manager = storage_manager
+
+        # Creators are read from wherever the crawler saves them, parquet files go to the injected storage
+        self._creator_storage = (
+            storage_manager if settings.creator_storage_remote else LocalStorageManager(settings=settings)
+        )
+
+    async def export_parquet(
+        self,
+        platform: str,
+        action: str,
+        since: Optional[datetime] = None,
+        subdir: str = "creators",
+    ) -> int:
+        prefix = f"{platform.lower()}/{action.lower()}/{subdir.lower()}"
+        if since and since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+
+        logger.info(f"📤 Exporting extracted profiles under `{prefix}` to parquet")
+
+        sink = ParquetSink(settings=self._settings, storage_manager=self._storage_manager)
+        segment_store = SegmentStore(settings=self._settings, storage_manager=self._creator_storage, prefix=prefix)
+        delta_store = DeltaSnapshotStore(settings=self._settings, storage_manager=self._creator_storage)
+        exported = 0
+
+        try:
+            async for stored_file in self._creator_storage.alist_files(prefix=f"{prefix}/"):
+                if since and stored_file.last_modified < since:
+                    continue
+
+                if stored_file.key.endswith(SEGMENT_EXTENSION) and not stored_file.key.endswith(INDEX_EXTENSION):
+                    async for record in segment_store.iter_segment(segment_key=stored_file.key):
+                        if record.get("is_raw"):
+                            continue
+
+                        crawled_at = datetime.fromisoformat(record["saved_at"])
+                        await self._add(sink, platform, action, record=record["data"], crawled_at=crawled_at)
+                        exported += 1
+                    continue
+
+                match = SNAPSHOT_KEY_PATTERN.match(stored_file.key)
+                if (
+                    not match
+                    or match["raw"]
+                    or match["file_type"].removesuffix(ZSTD_EXTENSION) not in ("json", DELTA_FILE_TYPE)
+                ):
+                    continue
+
+                record = await delta_store.read(file_key=stored_file.key)
+                crawled_at = datetime.strptime(match["timestamp"], SNAPSHOT_TIMESTAMP_FORMAT)
+                await self._add(sink, platform, action, record=record, crawled_at=crawled_at)
+                exported += 1
+
+        finally:
+            await sink.close()
+
+        await sink.unify_schema(platform=platform, action=action)
+        logger.success(f"✅ Exported {exported} profiles under `{prefix}`")
+        return exported
+
+    @staticmethod
+    async def _add(
+        sink: ParquetSink,
+        platform: str,
+        action: str,
+        record: Dict[str, Any],
+        crawled_at: datetime,
+    ) -> None:
+        if not record or not isinstance(record, dict):
+            return
+
+        await sink.add(platform=platform, action=action, record=record, crawled_at=crawled_at)
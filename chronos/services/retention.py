@@ -0,0 +1,277 @@
+import asyncio
+import fnmatch
+import posixpath
+import tarfile
+import tempfile
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import IO, Dict, List, Optional, Set, Tuple
+
+from loguru import logger
+
+from chronos.core.settings import Settings
+from chronos.infrastructure.storage.base import StorageManager, StoredFile
+from chronos.infrastructure.storage.blobs import BLOB_PREFIX, blob_digest, is_ref_key
+from chronos.infrastructure.storage.compression import ZSTD_EXTENSION, compress_writer
+from chronos.infrastructure.storage.deltas import DELTA_FILE_TYPE, is_delta_key
+from chronos.infrastructure.storage.local import LocalStorageManager
+from chronos.infrastructure.storage.manifest import ManifestIndex
+from chronos.schemas.retention import RetentionPolicy
+from chronos.utils.constants import SNAPSHOT_KEY_PATTERN, SNAPSHOT_TIMESTAMP_FORMAT
+
+ARCHIVE_EXTENSION = ".tar.zst"
+
+
+@dataclass
+class RetentionResult:
+    deleted: int = 0
+    archived: int = 0
+    freed_bytes: int = 0
+
+
+class RetentionService:
+    def __init__(
+        self,
+        settings: Settings,
+        storage_manager: StorageManager,
+        manifest: Optional[ManifestIndex] = None,
+    ) -> None:
+        self._settings = settings
+        self._storage_manager = storage_manager
+        self._manifest = manifest
+
+        # Traces and screenshots never leave the local disk, even when snapshots go to S3
+        self._local_storage = LocalStorageManager(settings=self._settings)
+
+    async def apply(self, prefix: Optional[str] = None, dry_run: bool = False) -> Dict[str, int]:
+        result = RetentionResult()
+        for policy in self._settings.retention_policies:
+            if prefix and not policy.prefix.startswith(prefix):
+                continue
+
+            policy_result = await self.apply_policy(policy=policy, dry_run=dry_run)
+            result.deleted += policy_result.deleted
+            result.archived += policy_result.archived
+            result.freed_bytes += policy_result.freed_bytes
+
+        # Refs anywhere in the bucket can point at a blob, so only full runs may sweep them
+        if self._settings.raw_blob_gc_enabled and not prefix:
+            gc_result = await self.collect_blobs(dry_run=dry_run)
+            result.deleted += gc_result.deleted
+            result.freed_bytes += gc_result.freed_bytes
+
+        logger.success(
+            f"✅ Retention {'(dry run) ' if dry_run else ''}done: deleted {result.deleted} files, "
+            f"archived {result.archived} files, freed {result.freed_bytes} bytes"
+        )
+        return {"deleted": result.deleted, "archived": result.archived, "freed_bytes": result.freed_bytes}
+
+    async def apply_policy(self, policy: RetentionPolicy, dry_run: bool = False) -> RetentionResult:
+        logger.info(f"🧹 Applying retention policy for `{policy.prefix}`{' (local)' if policy.local else ''}")
+
+        storage_manager = self._local_storage if policy.local else self._storage_manager
+        files = [
+            stored_file
+            async for stored_file in storage_manager.alist_files(prefix=policy.prefix)
+            # Blobs are shared by refs of any age, so they are never expired on their own
+            if not stored_file.key.startswith(BLOB_PREFIX)
+            and (not policy.pattern or fnmatch.fnmatch(stored_file.key, policy.pattern))
+        ]
+        expired = self._select_expired(policy=policy, files=files)
+
+        result = RetentionResult()
+        if policy.archive_after_days is not None:
+            threshold = datetime.now(tz=timezone.utc) - timedelta(days=policy.archive_after_days)
+            candidates = [stored_file for stored_file in files if stored_file.key not in expired]
+            for directory, group in self._group_archivable(candidates=candidates, threshold=threshold).items():
+                if not dry_run:
+                    await self._archive(storage_manager=storage_manager, directory=directory, files=group)
+                expired.update(stored_file.key for stored_file in group)
+                result.archived += len(group)
+
+        expired_files = [stored_file for stored_file in files if stored_file.key in expired]
+        result.deleted = len(expired_files)
+        result.freed_bytes = sum(stored_file.size for stored_file in expired_files)
+
+        if not dry_run:
+            await self._delete(
+                storage_manager=storage_manager,
+                file_keys=[stored_file.key for stored_file in expired_files],
+                forget=not policy.local,
+            )
+
+        return result
+
+    async def collect_blobs(self, dry_run: bool = False) -> RetentionResult:
+        logger.info("🧹 Collecting unreferenced blobs")
+
+        # Blobs are listed before refs are marked, so a ref written meanwhile is either seen or its blob is fresh
+        threshold = datetime.now(tz=timezone.utc) - timedelta(seconds=self._settings.raw_blob_gc_grace)
+        candidates = [
+            stored_file
+            async for stored_file in self._storage_manager.alist_files(prefix=f"{BLOB_PREFIX}/")
+            if stored_file.last_modified < threshold
+        ]
+        if not candidates:
+            return RetentionResult()
+
+        referenced = await self._referenced_digests()
+        garbage = [stored_file for stored_file in candidates if blob_digest(stored_file.key) not in referenced]
+
+        result = RetentionResult(deleted=len(garbage), freed_bytes=sum(stored_file.size for stored_file in garbage))
+        if not dry_run:
+            await self._delete(
+                storage_manager=self._storage_manager,
+                file_keys=[stored_file.key for stored_file in garbage],
+                forget=False,
+            )
+
+        logger.info(f"🗑️ {len(garbage)} of {len(candidates)} blobs past the grace period are unreferenced")
+        return result
+
+    async def _referenced_digests(self) -> Set[str]:
+        ref_keys = [
+            stored_file.key
+            async for stored_file in self._storage_manager.alist_files()
+            if is_ref_key(stored_file.key) and not stored_file.key.startswith(BLOB_PREFIX)
+        ]
+
+        # An unreadable ref raises, which aborts the sweep rather than freeing a blob that's still in use
+        digests: Set[str] = set()
+        batch_size = self._settings.retention_delete_batch_size
+        for index in range(0, len(ref_keys), batch_size):
+            refs = await asyncio.gather(
+                *(
+                    self._storage_manager.aread_file(file_key=ref_key, file_type="json")
+                    for ref_key in ref_keys[index : index + batch_size]
+                )
+            )
+            digests.update(ref["sha256"] for ref in refs)
+
+        return digests
+
+    @staticmethod
+    def _select_expired(policy: RetentionPolicy, files: List[StoredFile]) -> Set[str]:
+        expired: Set[str] = set()
+        chains = _delta_chains(files=files)
+
+        if policy.max_age_days is not None:
+            threshold = datetime.now(tz=timezone.utc) - timedelta(days=policy.max_age_days)
+            expired.update(stored_file.key for stored_file in files if stored_file.last_modified < threshold)
+
+        if policy.max_count is not None:
+            by_directory: Dict[str, List[StoredFile]] = defaultdict(list)
+            for stored_file in files:
+                by_directory[posixpath.dirname(stored_file.key)].append(stored_file)
+
+            for group in by_directory.values():
+                group.sort(key=lambda stored_file: stored_file.last_modified, reverse=True)
+                expired.update(stored_file.key for stored_file in group[policy.max_count :])
+
+        # A delta is only readable through every earlier version of its chain, so those are kept with it
+        for chain in chains:
+            kept = [index for index, stored_file in enumerate(chain) if stored_file.key not in expired]
+            if kept:
+                expired.difference_update(stored_file.key for stored_file in chain[: kept[-1]])
+
+        if policy.max_bytes is not None:
+            # Whole chains go at once, oldest first, so no surviving delta loses its base
+            survivors = [[stored_file for stored_file in chain if stored_file.key not in expired] for chain in chains]
+            survivors = sorted((chain for chain in survivors if chain), key=lambda chain: chain[-1].last_modified)
+            total = sum(stored_file.size for chain in survivors for stored_file in chain)
+            for chain in survivors:
+                if total <= policy.max_bytes:
+                    break
+                expired.update(stored_file.key for stored_file in chain)
+                total -= sum(stored_file.size for stored_file in chain)
+
+        return expired
+
+    @staticmethod
+    def _group_archivable(candidates: List[StoredFile], threshold: datetime) -> Dict[str, List[StoredFile]]:
+        groups: Dict[str, List[StoredFile]] = defaultdict(list)
+        skipped: Set[str] = set()
+        for stored_file in candidates:
+            directory = posixpath.dirname(stored_file.key)
+            # Delta chains are only readable in place, so their directories are never rolled up
+            if is_delta_key(stored_file.key):
+                skipped.add(directory)
+            if stored_file.key.endswith(ARCHIVE_EXTENSION) or stored_file.last_modified >= threshold:
+                continue
+            groups[directory].append(stored_file)
+
+        return {directory: group for directory, group in groups.items() if directory not in skipped and len(group) > 1}
+
+    async def _archive(self, storage_manager: StorageManager, directory: str, files: List[StoredFile]) -> str:
+        timestamp_str = datetime.now().strftime(SNAPSHOT_TIMESTAMP_FORMAT)
+        archive_key = f"{directory}/archive_{timestamp_str}{ARCHIVE_EXTENSION}"
+
+        with tempfile.SpooledTemporaryFile(max_size=self._settings.storage_spool_max_size) as buffer:
+            # Reading the members, tar and zstd all block, so the archive is built off the event loop
+            await asyncio.to_thread(self._write_archive, storage_manager=storage_manager, files=files, dest=buffer)
+
+            buffer.seek(0)
+            archive_key = await storage_manager.aupload_bytes(
+                data=buffer,  # type: ignore
+                file_key=archive_key,
+                content_type="application/zstd",
+                compress=False,
+            )
+
+        logger.info(f"📦 Archived {len(files)} files into `{archive_key}`")
+        return archive_key
+
+    def _write_archive(self, storage_manager: StorageManager, files: List[StoredFile], dest: IO[bytes]) -> None:
+        writer = compress_writer(dest=dest, level=self._settings.storage_compression_level)
+        with tarfile.open(fileobj=writer, mode="w|") as archive:
+            for stored_file in files:
+                with tempfile.SpooledTemporaryFile(max_size=self._settings.storage_spool_max_size) as member:
+                    for chunk in storage_manager.iter_file(file_key=stored_file.key):
+                        member.write(chunk)
+
+                    info = tarfile.TarInfo(name=posixpath.basename(stored_file.key).removesuffix(ZSTD_EXTENSION))
+                    info.size = member.tell()
+                    info.mtime = int(stored_file.last_modified.timestamp())
+                    member.seek(0)
+                    archive.addfile(info, member)  # type: ignore
+        writer.close()
+
+    async def _delete(self, storage_manager: StorageManager, file_keys: List[str], forget: bool = True) -> None:
+        batch_size = self._settings.retention_delete_batch_size
+        for index in range(0, len(file_keys), batch_size):
+            batch = file_keys[index : index + batch_size]
+            await storage_manager.adelete_files(file_keys=batch)
+            if self._manifest and forget:
+                await asyncio.to_thread(self._manifest.forget, keys=batch)
+
+
+def _delta_chains(files: List[StoredFile]) -> List[List[StoredFile]]:
+    """Split files into delta chains, each a full snapshot and the deltas written on top of it."""
+    # Every delta of a series (creator directory + raw flag) builds on the version written right before it
+    series: Dict[Tuple[str, bool], List[Tuple[str, bool, StoredFile]]] = defaultdict(list)
+    chains: List[List[StoredFile]] = []
+    for stored_file in files:
+        match = SNAPSHOT_KEY_PATTERN.match(stored_file.key)
+        file_type = match["file_type"].removesuffix(ZSTD_EXTENSION) if match else None
+        if not match or file_type not in ("json", DELTA_FILE_TYPE):
+            chains.append([stored_file])
+            continue
+
+        is_delta = file_type == DELTA_FILE_TYPE
+        series[(posixpath.dirname(stored_file.key), bool(match["raw"]))].append(
+            (match["timestamp"], is_delta, stored_file)
+        )
+
+    for versions in series.values():
+        # A delta written in the same second as its base sorts after it
+        versions.sort(key=lambda version: (version[0], version[1]))
+        chain: List[StoredFile] = []
+        for _, is_delta, stored_file in versions:
+            if chain and not is_delta:
+                chains.append(chain)
+                chain = []
+            chain.append(stored_file)
+        chains.append(chain)
+
+    return chains
@@ -1,5 +1,14 @@
+import re
+
 TIKTOK_OEMBED_URL = "https://www.tiktok.com/oembed?url=https://www.tiktok.com/@{unique_id}"
 
+# Snapshot constants
+SNAPSHOT_TIMESTAMP_FORMAT = "%y%m%d_%H%M%S"
+SNAPSHOT_KEY_PATTERN = re.compile(
+    r"^(?P<platform>[^/]+)/(?P<action>[^/]+)/(?P<subdir>[^/]+)/(?P<identifier>[^/]+)/"
+    r"insight_(?P<raw>raw_)?(?P<timestamp>\d{6}_\d{6})\.(?P<file_type>[\w.]+)$"
+)
+
 # Affiliate constants
 AFFILIATE_PROFILE_TYPE = [1, 2, 3, 4, 5]
 AFFILIATE_KEYS_TO_OMIT = ["code", "message", "is_authorized", "status"]
@@ -11,3 +20,5 @@ CONSTRAINT_VIOLATION_ERROR = "constraint_violation_error"
 
 AFFILIATE_CREATOR_NOT_FOUND = "affiliate.creator_not_found"
 CAPTCHA_NOT_SOLVED = "captcha.not_solved"
+HANDLER_NOT_ALLOWED = "handler.not_allowed"
+HANDLER_NOT_SUPPORTED = "handler.not_supported"
@@ -77,3 +77,15 @@ def deep_flatten(obj: Union[Dict[str, Any], List[Any]]) -> Union[Dict[str, Any],
         return o
 
     return flatten(obj)
+
+
+def flatten_keys(obj: Mapping[str, Any], sep: str = ".", parent_key: str = "") -> Dict[str, Any]:
+    items: Dict[str, Any] = {}
+    for key, value in obj.items():
+        new_key = f"{parent_key}{sep}{key}" if parent_key else str(key)
+        if isinstance(value, Mapping) and value:
+            items.update(flatten_keys(obj=value, sep=sep, parent_key=new_key))
+        else:
+            items[new_key] = value
+
+    return items
@@ -0,0 +1,81 @@
+import codecs
+import json
+from typing import Any, AsyncIterator, List, Optional, Tuple
+
+JsonItem = Tuple[Any, Optional[str]]
+
+_decoder = json.JSONDecoder()
+
+
+class JsonStreamError(ValueError):
+    pass
+
+
+async def iter_json_items(chunks: AsyncIterator[bytes], max_item_size: int = 1024 * 1024) -> AsyncIterator[JsonItem]:
+    """
+    Yield `(item, error)` pairs from an NDJSON or JSON array body as its chunks arrive.
+    A malformed NDJSON line only fails that line; a malformed array element ends the stream.
+    """
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer, is_array, started, closed = "", False, False, False
+
+    async for chunk in chunks:
+        buffer += text_decoder.decode(chunk)
+        if not started:
+            buffer = buffer.lstrip()
+            if not buffer:
+                continue
+            is_array, started = buffer.startswith("["), True
+            buffer = buffer.removeprefix("[")
+
+        if is_array:
+            items, buffer, closed = _drain_array(buffer=buffer)
+        else:
+            items, buffer = _drain_lines(buffer=buffer)
+
+        for item in items:
+            yield item
+        if closed:
+            return
+
+        if len(buffer) > max_item_size:
+            msg = "JSON item is malformed or too large"
+            raise JsonStreamError(msg)
+
+    if is_array:
+        msg = "JSON array is malformed or not terminated"
+        raise JsonStreamError(msg)
+
+    buffer += text_decoder.decode(b"", final=True)
+    if buffer.strip():
+        yield _parse_line(line=buffer)
+
+
+def _drain_lines(buffer: str) -> Tuple[List[JsonItem], str]:
+    *lines, rest = buffer.split("\n")
+    return [_parse_line(line=line) for line in lines if line.strip()], rest
+
+
+def _drain_array(buffer: str) -> Tuple[List[JsonItem], str, bool]:
+    items: List[JsonItem] = []
+    while buffer := buffer.lstrip().removeprefix(",").lstrip():
+        if buffer.startswith("]"):
+            return items, "", True
+
+        try:
+            item, end = _decoder.raw_decode(buffer)
+        except json.JSONDecodeError:
+            # Most likely the element continues in the next chunk
+            break
+
+        items.append((item, None))
+        buffer = buffer[end:]
+
+    return items, buffer, False
+
+
+def _parse_line(line: str) -> JsonItem:
+    try:
+        return json.loads(line), None
+    except json.JSONDecodeError as e:
+        return None, f"Invalid JSON: {e.msg}"
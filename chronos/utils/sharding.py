@@ -0,0 +1,29 @@
+import hashlib
+from typing import Iterable, List, Tuple
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    try:
+        index, count = (int(part) for part in value.split("/", 1))
+    except ValueError:
+        msg = f"Invalid shard `{value}`, expected INDEX/COUNT (e.g. 0/4)"
+        raise ValueError(msg) from None
+
+    if count < 1 or not 0 <= index < count:
+        msg = f"Invalid shard `{value}`, INDEX must be in [0, COUNT)"
+        raise ValueError(msg)
+
+    return index, count
+
+
+def shard_of(key: str, count: int) -> int:
+    # Rendezvous hashing: changing COUNT only moves the keys won by the added/removed shard
+    return max(range(count), key=lambda shard: _score(key=key, shard=shard))
+
+
+def select_shard(keys: Iterable[str], index: int, count: int) -> List[str]:
+    return [key for key in keys if shard_of(key=key, count=count) == index]
+
+
+def _score(key: str, shard: int) -> int:
+    return int.from_bytes(hashlib.blake2b(f"{shard}:{key}".encode("utf-8"), digest_size=8).digest(), "big")